@@ -0,0 +1,143 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Generic, NamedTuple, Type, TypeVar
+
+from dateutil import parser
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, ModelField
+
+from app.base.constants import DatetimeFormats, DynamoDBColumnTypes
+
+CodecModel = TypeVar("CodecModel", bound=BaseModel)
+# column type, encoder and decoder of scalar value
+ScalarCodec = tuple[str, Callable, Callable]
+
+
+def format_datetime(datetime_value: datetime) -> str:
+    return datetime_value.strftime(DatetimeFormats.utc_string_format)
+
+
+def parse_datetime(datetime_value: str) -> datetime:
+    """Rows are written in the fixed format, generic (and slow) parsing is only a fallback for other formats"""
+    try:
+        parsed_datetime = datetime.strptime(datetime_value, DatetimeFormats.utc_string_format)
+    except ValueError:
+        return parser.parse(datetime_value)
+
+    return parsed_datetime.replace(tzinfo=timezone.utc)
+
+
+class AttributeCodec(NamedTuple):
+    encode: Callable[[Any], dict]
+    decode: Callable[[dict], Any]
+
+
+class FieldCodec(NamedTuple):
+    field_name: str
+    column_name: str
+    is_required: bool
+    attribute_codec: AttributeCodec
+
+
+class ItemCodec(Generic[CodecModel]):
+    """
+    Encoder and decoder of DynamoDB items, which are derived once from field declarations of the model.
+    Column of the field can be customized by extras of pydantic Field: `db_column` (name of the column),
+    `db_type` (e.g. "B" to store string as bytes) and `db_separator` (list of strings is stored as one string).
+    None values aren't stored. Row without required column is decoded to None.
+    Rows are trusted, so models are constructed without validation.
+    """
+
+    scalar_codecs: dict[type, ScalarCodec] = {
+        str: (DynamoDBColumnTypes.string.value, str, str),
+        int: (DynamoDBColumnTypes.number.value, str, int),
+        bool: (DynamoDBColumnTypes.boolean.value, bool, bool),
+        datetime: (DynamoDBColumnTypes.string.value, format_datetime, parse_datetime),
+        uuid.UUID: (DynamoDBColumnTypes.string.value, str, uuid.UUID),
+    }
+
+    def __init__(self, model_class: Type[CodecModel]):
+        self.model_class = model_class
+        self._field_codecs = [
+            FieldCodec(
+                field_name=model_field.name,
+                column_name=model_field.field_info.extra.get("db_column", model_field.name),
+                is_required=model_field.required is True,
+                attribute_codec=self._build_field_codec(model_field),
+            )
+            for model_field in model_class.__fields__.values()
+        ]
+
+    def encode(self, model: CodecModel) -> dict[str, dict]:
+        record = {}
+        for field_codec in self._field_codecs:
+            field_value = getattr(model, field_codec.field_name)
+            if field_value is not None:
+                record[field_codec.column_name] = field_codec.attribute_codec.encode(field_value)
+
+        return record
+
+    def decode(self, record: dict) -> CodecModel | None:
+        field_values = {}
+        for field_codec in self._field_codecs:
+            attribute_value = record.get(field_codec.column_name)
+            if attribute_value:
+                field_values[field_codec.field_name] = field_codec.attribute_codec.decode(attribute_value)
+            elif field_codec.is_required:
+                return None
+
+        return self.model_class.construct(**field_values)
+
+    @classmethod
+    def _build_field_codec(cls, model_field: ModelField) -> AttributeCodec:
+        field_extra = model_field.field_info.extra
+        element_codec = cls._build_value_codec(model_field.type_, field_extra.get("db_type"))
+        if model_field.shape != SHAPE_LIST:
+            return element_codec
+
+        separator: str = field_extra.get("db_separator", "")
+        string_type = DynamoDBColumnTypes.string.value
+        list_type = DynamoDBColumnTypes.list.value
+        if separator:
+            return AttributeCodec(
+                encode=lambda field_values: {string_type: separator.join(field_values)},
+                decode=lambda attribute_value: attribute_value[string_type].split(separator),
+            )
+
+        return AttributeCodec(
+            encode=lambda field_values: {list_type: [element_codec.encode(element) for element in field_values]},
+            decode=lambda attribute_value: [element_codec.decode(element) for element in attribute_value[list_type]],
+        )
+
+    @classmethod
+    def _build_value_codec(cls, value_type: type, column_type: str | None) -> AttributeCodec:
+        if isinstance(value_type, type) and issubclass(value_type, BaseModel):
+            model_codec = get_item_codec(value_type)
+            map_type = DynamoDBColumnTypes.map.value
+            return AttributeCodec(
+                encode=lambda field_value: {map_type: model_codec.encode(field_value)},
+                decode=lambda attribute_value: model_codec.decode(attribute_value[map_type]),
+            )
+
+        if column_type == DynamoDBColumnTypes.byte.value:
+            return AttributeCodec(
+                encode=lambda field_value: {column_type: field_value.encode("utf-8")},
+                decode=lambda attribute_value: bytes(attribute_value[column_type]).decode("utf-8"),
+            )
+
+        scalar_type, encode_value, decode_value = cls.scalar_codecs[value_type]
+        return AttributeCodec(
+            encode=lambda field_value: {scalar_type: encode_value(field_value)},
+            decode=lambda attribute_value: decode_value(attribute_value[scalar_type]),
+        )
+
+
+_item_codecs: dict[type, ItemCodec] = {}
+
+
+def get_item_codec(model_class: Type[CodecModel]) -> ItemCodec[CodecModel]:
+    """Codec is built once per model class"""
+    if model_class not in _item_codecs:
+        _item_codecs[model_class] = ItemCodec(model_class)
+
+    return _item_codecs[model_class]
@@ -2,7 +2,7 @@ from itertools import groupby
 from operator import attrgetter
 from typing import Any
 
-from fastapi import HTTPException
+from fastapi import HTTPException, status
 
 from app.base.schema import HTTPBaseError
 
@@ -78,6 +78,16 @@ class BaseHTTPException(HTTPException):
         }
 
 
+class BatchItemsNotProcessedException(BaseHTTPException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    message = "Database didn't process batch of items, try again later"
+
+    is_expected = False
+
+    def __init__(self, table_name: str, items_count: int) -> None:
+        super().__init__(addition_message=f"Table: {table_name}, unprocessed items: {items_count}")
+
+
 def merge_exception_descriptions(*exceptions: type[BaseHTTPException]) -> dict:
     response_description: dict[int, dict] = {}
 
@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Generic, TypeVar
+
+from app.base.models import SearchItemBaseModel
+
+LoadedItem = TypeVar("LoadedItem")
+PendingLoad = tuple[SearchItemBaseModel, asyncio.Future]
+
+
+class ItemLoader(Generic[LoadedItem]):
+    """
+    DataLoader-like micro-batching of lookups. Keys, which are requested by concurrent coroutines
+    within `batch_window_in_seconds`, are loaded by one `batch_load` call and results are fanned back out.
+    Batch is dispatched earlier when it reaches `max_batch_size`.
+    Also identical concurrent fetches (e.g. scans by the same request hash) are coalesced in one (single flight).
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[Sequence[SearchItemBaseModel]], Awaitable[list]],
+        batch_window_in_seconds: float,
+        max_batch_size: int,
+    ):
+        self.batch_load = batch_load
+        self.batch_window_in_seconds = batch_window_in_seconds
+        self.max_batch_size = max_batch_size
+
+        self._pending_loads: list[PendingLoad] = []
+        self._dispatch_handle: asyncio.TimerHandle | None = None
+        self._running_tasks: set[asyncio.Task] = set()
+        self._flights: dict[str, asyncio.Task] = {}
+
+    async def load(self, search_item_model: SearchItemBaseModel) -> LoadedItem | None:
+        loop = asyncio.get_running_loop()
+        load_future: asyncio.Future = loop.create_future()
+        self._pending_loads.append((search_item_model, load_future))
+
+        if len(self._pending_loads) >= self.max_batch_size:
+            self._dispatch()
+        elif self._dispatch_handle is None:
+            self._dispatch_handle = loop.call_later(self.batch_window_in_seconds, self._dispatch)
+
+        return await load_future
+
+    async def coalesce(
+        self,
+        flight_key: str,
+        fetch: Callable[[], Awaitable[LoadedItem | None]],
+    ) -> LoadedItem | None:
+        flight_task = self._flights.get(flight_key)
+        if flight_task is None:
+            flight_task = asyncio.ensure_future(fetch())
+            self._flights[flight_key] = flight_task
+            flight_task.add_done_callback(lambda _: self._flights.pop(flight_key, None))
+
+        # cancellation of one waiter mustn't cancel the fetch of others
+        return await asyncio.shield(flight_task)
+
+    def _dispatch(self) -> None:
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+
+        pending_loads = self._pending_loads
+        self._pending_loads = []
+        batch_task = asyncio.create_task(self._load_batch(pending_loads))
+        # event loop keeps only weak references to tasks
+        self._running_tasks.add(batch_task)
+        batch_task.add_done_callback(self._running_tasks.discard)
+
+    async def _load_batch(self, pending_loads: list[PendingLoad]) -> None:
+        try:
+            loaded_items = await self.batch_load([search_item_model for search_item_model, _ in pending_loads])
+        except Exception as exc:
+            for _, failed_future in pending_loads:
+                if not failed_future.done():
+                    failed_future.set_exception(exc)
+            return
+
+        for (_, load_future), loaded_item in zip(pending_loads, loaded_items):
+            # waiter could be cancelled in the meantime
+            if not load_future.done():
+                load_future.set_result(loaded_item)
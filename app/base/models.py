@@ -11,6 +11,8 @@ from types_aiobotocore_dynamodb.type_defs import (
     UpdateItemInputRequestTypeDef,
 )
 
+from app.base.codec import get_item_codec
+
 ItemBaseModelType = TypeVar("ItemBaseModelType", bound="ItemBaseModel")
 
 
@@ -19,11 +21,18 @@ class DBBaseModel(BaseModel):
         alias_generator = camelize
         allow_population_by_field_name = True
 
+    def to_record(self) -> dict[str, dict]:
+        """Encode model to DynamoDB attributes by the codec, which is derived from field declarations"""
+        return get_item_codec(type(self)).encode(self)
+
 
 class PutItemBaseModel(DBBaseModel, ABC):
-    @abstractmethod
     def to_put_item_object(self, table_name: str) -> PutItemInputRequestTypeDef:
-        """Should implement method which will return prepared item for saving item in table"""
+        """Return prepared item for saving item in table"""
+        return {
+            "TableName": table_name,
+            "Item": self.to_record(),  # type: ignore
+        }
 
 
 class SearchItemBaseModel(DBBaseModel, ABC):
@@ -51,6 +60,6 @@ class UpdateItemBaseModel(DBBaseModel, ABC):
 
 class ItemBaseModel(DBBaseModel, ABC):
     @classmethod
-    @abstractmethod
     def from_record(cls: Type[ItemBaseModelType], object_item: dict) -> ItemBaseModelType | None:
-        """Should implement method which will return parse object from DynamoDB"""
+        """Parse object from DynamoDB, None is returned when required column is missing"""
+        return get_item_codec(cls).decode(object_item)
@@ -1,9 +1,14 @@
+import asyncio
+import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Generic, Type, TypeVar
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from typing import Any, AsyncIterator, Generic, Type, TypeVar
 
 from types_aiobotocore_dynamodb import DynamoDBClient
 
+from app.base.exception import BatchItemsNotProcessedException
+from app.base.loader import ItemLoader
 from app.base.models import (
     DeleteItemBaseModel,
     ItemBaseModel,
@@ -29,11 +34,33 @@ class DynamoDBBaseRepository(
     ],
     ABC
 ):
-    def __init__(self, dynamodb_client: DynamoDBClient, table_name: str):
+    # limits of BatchWriteItem and BatchGetItem requests
+    batch_write_max_items = 25
+    batch_get_max_items = 100
+
+    batch_max_attempts = 5
+    batch_retry_base_delay = 0.05
+    batch_max_concurrency = 4
+
+    def __init__(
+        self,
+        dynamodb_client: DynamoDBClient,
+        table_name: str,
+        item_loader_enabled: bool = False,
+        item_loader_batch_window_in_seconds: float = 0,
+        item_loader_max_batch_size: int = batch_get_max_items,
+    ):
         self._dynamodb_client = dynamodb_client
         self._table_name = table_name
         self._logger = logging.getLogger(self.__class__.__name__)
 
+        # lookups of concurrent requests are batched by BatchGetItem and identical scans are coalesced
+        self._item_loader: ItemLoader[GenericItemBaseModel] | None = (
+            ItemLoader(self.batch_get_items, item_loader_batch_window_in_seconds, item_loader_max_batch_size)
+            if item_loader_enabled
+            else None
+        )
+
     @property
     @abstractmethod
     def base_model(self) -> Type[GenericItemBaseModel]:
@@ -62,36 +89,121 @@ class DynamoDBBaseRepository(
     async def put_item(self, put_item_model: PutItemBaseModel) -> None:
         await self._dynamodb_client.put_item(**put_item_model.to_put_item_object(self._table_name))
 
+    async def batch_put_items(self, put_item_models: Sequence[PutItemBaseModel]) -> None:
+        """
+        Put items by BatchWriteItem requests of `batch_write_max_items` items, which are sent concurrently.
+        Unprocessed (e.g. throttled) items are retried with exponential backoff.
+        """
+        write_requests = [
+            {"PutRequest": {"Item": put_item_model.to_put_item_object(self._table_name)["Item"]}}
+            for put_item_model in put_item_models
+        ]
+        await self._send_batches(
+            self._dynamodb_client.batch_write_item,
+            [{self._table_name: chunk} for chunk in _split_into_chunks(write_requests, self.batch_write_max_items)],
+            "UnprocessedItems",
+        )
+
+    async def batch_get_items(
+        self,
+        search_item_models: Sequence[SearchItemBaseModel],
+    ) -> list[GenericItemBaseModel | None]:
+        """
+        Get items by primary/sort keys with BatchGetItem requests of `batch_get_max_items` keys.
+        Items are returned in the order of `search_item_models`, None is returned for missing item.
+        """
+        keys = [
+            search_item_model.to_get_item_object(self._table_name)["Key"]
+            for search_item_model in search_item_models
+        ]
+        if not keys:
+            return []
+
+        # the same key can't be requested twice in one batch
+        unique_keys = list({_serialize_key(key): key for key in keys}.values())
+        batch_results = await self._send_batches(
+            self._dynamodb_client.batch_get_item,
+            [
+                {self._table_name: {"Keys": keys_chunk}}
+                for keys_chunk in _split_into_chunks(unique_keys, self.batch_get_max_items)
+            ],
+            "UnprocessedKeys",
+        )
+
+        key_names = list(keys[0].keys())
+        found_records = {
+            _serialize_key({key_name: record[key_name] for key_name in key_names}): record
+            for batch_result in batch_results
+            for record in batch_result.get("Responses", {}).get(self._table_name, [])
+        }
+
+        found_items = []
+        for key in keys:
+            found_record = found_records.get(_serialize_key(key))
+            found_items.append(None if found_record is None else self.base_model.from_record(found_record))
+
+        return found_items
+
     async def search_item(self, search_item_model: SearchItemBaseModel) -> GenericItemBaseModel | None:
         """
         This method client can use for retrieving one element from the database and
         when the client has to find a record based on simple fields without primary/sort keys.
         Also, the scan method has a limit of fetched data (1 Mb), so we should retrieve data in a loop.
         """
-        start_key = None
-        done = False
         scan_kwargs = search_item_model.to_scan_object(self._table_name)
-        elements: list[dict] = []
+        flight_key = _serialize_key(scan_kwargs)
 
-        while not done:
-            if start_key:
-                scan_kwargs["ExclusiveStartKey"] = start_key
+        async def scan_item() -> GenericItemBaseModel | None:
+            start_key = None
+            done = False
+            elements: list[dict] = []
 
-            scan_result = await self._dynamodb_client.scan(**scan_kwargs)
-            elements.extend(scan_result.get("Items", []))
-            start_key = scan_result.get("LastEvaluatedKey", None)
-            done = start_key is None
+            while not done:
+                if start_key:
+                    scan_kwargs["ExclusiveStartKey"] = start_key
 
-        if not elements:
-            return None
+                scan_result = await self._dynamodb_client.scan(**scan_kwargs)
+                elements.extend(scan_result.get("Items", []))
+                start_key = scan_result.get("LastEvaluatedKey", None)
+                done = start_key is None
+
+            if not elements:
+                return None
+
+            return self.base_model.from_record(elements[0])
 
-        return self.base_model.from_record(elements[0])
+        if self._item_loader is None:
+            return await scan_item()
+
+        return await self._item_loader.coalesce(flight_key, scan_item)
+
+    async def iterate_item_pages(
+        self,
+        projected_fields: list[str] | None = None,
+    ) -> AsyncIterator[list[GenericItemBaseModel]]:
+        """
+        Iterate over all items of the table by scan pages, so the whole table isn't loaded in memory.
+        Only `projected_fields` are fetched if they're passed.
+        """
+        scan_kwargs: dict = {"TableName": self._table_name}
+        if projected_fields:
+            field_names = {f"#n_{field_name}": field_name for field_name in projected_fields}
+            scan_kwargs["ProjectionExpression"] = ", ".join(field_names.keys())
+            scan_kwargs["ExpressionAttributeNames"] = field_names
+
+        paginator = self._dynamodb_client.get_paginator("scan")
+        async for scan_page in paginator.paginate(**scan_kwargs):
+            item_models = [self.base_model.from_record(element) for element in scan_page.get("Items", [])]
+            yield [item_model for item_model in item_models if item_model is not None]
 
     async def get_item(self, search_item_model: SearchItemBaseModel) -> GenericItemBaseModel | None:
         """
         This method client can use for fethching one element from database
         and when client has primary/sort keys for searching element
         """
+        if self._item_loader is not None:
+            return await self._item_loader.load(search_item_model)
+
         get_item_result = await self._dynamodb_client.get_item(**search_item_model.to_get_item_object(self._table_name))
         if "Item" not in get_item_result:
             return None
@@ -103,3 +215,52 @@ class DynamoDBBaseRepository(
 
     async def update_item(self, update_item_model: UpdateItemBaseModel) -> None:
         await self._dynamodb_client.update_item(**update_item_model.to_update_object(self._table_name))
+
+    async def _send_batches(
+        self,
+        batch_request: Callable[..., Awaitable[Any]],
+        request_items_chunks: list[dict],
+        unprocessed_field: str,
+    ) -> list[dict]:
+        semaphore = asyncio.Semaphore(self.batch_max_concurrency)
+        chunks_results = await asyncio.gather(*[
+            self._send_batch(batch_request, request_items, unprocessed_field, semaphore)
+            for request_items in request_items_chunks
+        ])
+
+        return [batch_result for chunk_results in chunks_results for batch_result in chunk_results]
+
+    async def _send_batch(
+        self,
+        batch_request: Callable[..., Awaitable[Any]],
+        request_items: dict,
+        unprocessed_field: str,
+        semaphore: asyncio.Semaphore,
+    ) -> list[dict]:
+        batch_results = []
+        async with semaphore:
+            for attempt_number in range(self.batch_max_attempts):
+                if attempt_number:
+                    await asyncio.sleep(self.batch_retry_base_delay * 2 ** (attempt_number - 1))
+
+                batch_result = await batch_request(RequestItems=request_items)
+                batch_results.append(batch_result)
+                request_items = batch_result.get(unprocessed_field) or {}
+                if not request_items:
+                    return batch_results
+
+        # unprocessed keys of BatchGetItem are wrapped in "Keys", unprocessed write requests aren't
+        unprocessed_items = request_items[self._table_name]
+        if isinstance(unprocessed_items, dict):
+            unprocessed_items = unprocessed_items["Keys"]
+
+        raise BatchItemsNotProcessedException(self._table_name, len(unprocessed_items))
+
+
+def _split_into_chunks(requests: list, chunk_size: int) -> list[list]:
+    chunk_starts = range(0, len(requests), chunk_size)
+    return [requests[chunk_start:chunk_start + chunk_size] for chunk_start in chunk_starts]
+
+
+def _serialize_key(key: Mapping[str, Any]) -> str:
+    return json.dumps(key, sort_keys=True, default=str)
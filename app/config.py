@@ -2,6 +2,7 @@ import base64
 import json
 import os
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, BaseSettings, PrivateAttr, validator
 
@@ -26,10 +27,77 @@ class GotenbergSettings(BaseModel):
     max_attempt: int = 5
 
 
+class LibreOfficeSettings(BaseModel):
+    pool_size: int = 2
+    max_conversions_per_process: int = 100
+    unoserver_path: str = "unoserver"
+    unoconvert_path: str = "unoconvert"
+    start_timeout: float = 30.0
+    conversion_timeout: float = 30.0
+
+
 class DocGenSettings(BaseModel):
     use_pypdftk: bool = True
     tmp_dir_path: Path = Path("doc_gen_tmp")
 
+    # every request gets its own workspace in tmp dir (or in tmpfs, e.g. /dev/shm), which is removed after request,
+    # quota is shared by all workers of the pod
+    workspace_tmpfs_path: Path | None = None
+    workspace_quota_in_bytes: int = 2147483648  # 2 GiB
+    workspace_quota_wait_timeout_in_seconds: float = 30
+    workspace_orphan_max_age_in_seconds: int = 3600
+    workspace_janitor_interval_in_seconds: float = 600
+
+    # remote - Gotenberg only, local - docx is converted by local LibreOffice pool,
+    # hybrid - docx is converted by local LibreOffice pool and spilled to Gotenberg when the pool is busy
+    conversion_backend: Literal["remote", "local", "hybrid"] = "remote"
+    libreoffice: LibreOfficeSettings = LibreOfficeSettings()
+
+    # converted documents are cached in memory and in the main bucket under `conversion_cache_key_prefix`,
+    # converter version is a part of the key, so it should be changed when Gotenberg/LibreOffice is upgraded
+    conversion_cache_enabled: bool = False
+    conversion_cache_key_prefix: str = "conversion-cache"
+    conversion_cache_max_local_size_in_bytes: int = 67108864  # 64 MiB
+    conversion_cache_ttl_in_seconds: int = 86400  # 1 day
+    conversion_cache_converter_version: str = "gotenberg-7.7.0"
+
+    # large html documents are split at `html_chunk_marker` and chunks are converted concurrently
+    html_chunking_enabled: bool = False
+    html_chunk_marker: str = "<!-- doc-gen:chunk-break -->"
+    html_max_concurrent_chunks: int = 4
+
+    # max number of documents which are processed by every stage of generation pipeline at the same time
+    pipeline_render_concurrency: int = 4
+    pipeline_convert_concurrency: int = 8
+    pipeline_post_process_concurrency: int = 4
+    pipeline_upload_concurrency: int = 16
+
+    # render is run in a pool of worker processes instead of threads, by default pool is sized by number of CPUs
+    render_in_process_pool: bool = False
+    render_process_pool_size: int | None = None
+
+    # per-worker memory budget of intermediate documents, documents beyond it or bigger than threshold are spilled
+    memory_budget_in_bytes: int = 268435456  # 256 MiB
+    spill_threshold_in_bytes: int = 8388608  # 8 MiB
+
+    # documents are also searched by hash of previous format, it can be disabled when all old documents are expired
+    legacy_request_hash_lookup_enabled: bool = True
+
+    # generated documents are stored by hash of their content, so identical documents are uploaded once
+    content_addressed_storage_enabled: bool = False
+
+    # Documents index is trusted without checking objects, which are downloaded anyway (e.g. for /multiple),
+    # when stale rows are evicted by background reconciler; it's run in every worker,
+    # but only the holder of the lease item in Documents table reconciles per interval
+    trust_document_index: bool = False
+    document_index_reconciler_enabled: bool = False
+    document_index_reconcile_interval_in_seconds: float = 3600
+
+    # Documents index rows are written in background after response (write-behind)
+    document_index_write_behind_enabled: bool = False
+    document_index_write_batch_size: int = 25
+    document_index_write_queue_size: int = 1000
+
 
 class AwsSettings(BaseModel):
     access_key_id: str | None = None
@@ -39,6 +107,11 @@ class AwsSettings(BaseModel):
 class StorageSettings(BaseModel):
     endpoint_url: str | None = None
     main_bucket_name: str = "dev-doc-mgmt.coverwhale.com"
+    multipart_threshold_in_bytes: int = 8388608  # 8 MiB
+    multipart_chunk_size_in_bytes: int = 8388608  # 8 MiB, S3 requires at least 5 MiB
+    multipart_max_concurrency: int = 4
+    download_part_size_in_bytes: int = 8388608  # 8 MiB
+    download_max_concurrency: int = 4
 
 
 class DynamoStorageSettings(BaseModel):
@@ -48,6 +121,11 @@ class DynamoStorageSettings(BaseModel):
     envelopes_table_name: str = "Envelopes"
     envelope_callbacks_table_name: str = "EnvelopeCallbacks"
 
+    # micro-batching of concurrent lookups
+    item_loader_enabled: bool = False
+    item_loader_batch_window_in_seconds: float = 0.002
+    item_loader_max_batch_size: int = 100
+
 
 class DocuSignSettings(BaseSettings):
     client_id: str | None
@@ -58,6 +136,11 @@ class DocuSignSettings(BaseSettings):
     webhook_url: str | None = None
     connect_secret_key: str | None = "None"
     pool_max_size: int | None = 4
+    # SDK calls are run by dedicated pool of `pool_max_size` threads, extra calls are rejected
+    executor_max_queue_size: int = 100
+    # "native" sends envelope requests by async HTTP client, "sdk" runs synchronous SDK in threads,
+    # "native" is opt-in until it's proven in production
+    client_backend: Literal["native", "sdk"] = "sdk"
     min_wait: float = 3.0
     max_wait: float = 5.0
     max_timeout: float = 30.0
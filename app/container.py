@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 from typing import Literal
 
 from aioboto3 import Session
@@ -7,10 +8,30 @@ from types_aiobotocore_s3 import S3Client
 
 from app.api_client.gotenberg_api_client import GotenbergApiClient
 from app.config import Settings
+from app.doc_generation.backends import (
+    CachedConversionBackend,
+    ConversionCache,
+    GotenbergConversionBackend,
+    HybridConversionBackend,
+    LibreOfficeConversionBackend,
+    LibreOfficeProcessPool,
+)
+from app.doc_generation.index_writer import DocumentIndexWriter
+from app.doc_generation.processors import (
+    GenerationPipeline,
+    MemoryBudget,
+    create_render_process_pool,
+)
 from app.doc_generation.repository import DocumentRepository
-from app.doc_generation.services import FileConvertorService, FileRegistryService
+from app.doc_generation.services import (
+    DocumentIndexReconciler,
+    FileConvertorService,
+    FileRegistryService,
+    WorkspaceManager,
+)
 from app.esign.auth import Auth0Authentication, NoAuthentication
 from app.esign.client import DocuSignClient
+from app.esign.native_client import NativeDocuSignClient, init_docusign_http_client
 from app.esign.repositories import EnvelopeCallbackRepository, EnvelopeRepository
 from app.esign.services import ESignEnvelopeService, ESignWebhookService
 from app.esign.services.envelope_create import ESignEnvelopeCreateService
@@ -36,6 +57,69 @@ async def init_gotenberg_api_client(base_url: str, headers: dict):
     await gotenberg_api_client.close()
 
 
+async def init_libreoffice_process_pool(libreoffice_settings: dict, conversion_backend: str):
+    process_pool = LibreOfficeProcessPool(**libreoffice_settings)
+    # warm up soffice processes before the first request, hybrid backend spills documents to Gotenberg
+    # while the pool can't be started, so its failure doesn't stop the app
+    if conversion_backend == "local":
+        await process_pool.start()
+    elif conversion_backend == "hybrid":
+        await process_pool.warm_up()
+
+    yield process_pool
+
+    await process_pool.close()
+
+
+async def init_render_process_pool(is_enabled: bool, pool_size: int | None):
+    if not is_enabled:
+        yield None
+        return
+
+    process_pool = create_render_process_pool(pool_size)
+
+    yield process_pool
+
+    process_pool.shutdown(cancel_futures=True)
+
+
+async def init_workspace_manager(**workspace_settings):
+    workspace_manager = WorkspaceManager(**workspace_settings)
+    workspace_manager.start()
+
+    yield workspace_manager
+
+    await workspace_manager.close()
+
+
+async def init_conversion_cache(**cache_settings):
+    conversion_cache = ConversionCache(**cache_settings)
+
+    yield conversion_cache
+
+    await conversion_cache.close()
+
+
+async def init_document_index_writer(dynamodb_client: DynamoDBClient, **writer_settings):
+    # client is a dependency of resource, so queue is flushed before the client is closed
+    index_writer = DocumentIndexWriter(**writer_settings)
+    index_writer.start()
+
+    yield index_writer
+
+    await index_writer.close()
+
+
+async def init_document_index_reconciler(is_enabled: bool, **reconciler_settings):
+    reconciler = DocumentIndexReconciler(**reconciler_settings)
+    if is_enabled:
+        reconciler.start()
+
+    yield reconciler
+
+    await reconciler.close()
+
+
 def get_way_of_authentication(api_audience: str | None, domain: str | None) -> str:
     return "auth0_authentication" if api_audience and domain else "no_authentication"
 
@@ -55,6 +139,36 @@ class Container(containers.DeclarativeContainer):
         headers={}
     )
 
+    libreoffice_process_pool: providers.Resource[LibreOfficeProcessPool] = providers.Resource(
+        init_libreoffice_process_pool,
+        libreoffice_settings=config.doc_gen.libreoffice,
+        conversion_backend=config.doc_gen.conversion_backend,
+    )
+    remote_conversion_backend: providers.Singleton[GotenbergConversionBackend] = providers.Singleton(
+        GotenbergConversionBackend,
+        api_client=gotenberg_api_client,
+    )
+    local_conversion_backend: providers.Singleton[LibreOfficeConversionBackend] = providers.Singleton(
+        LibreOfficeConversionBackend,
+        process_pool=libreoffice_process_pool,
+    )
+    selected_conversion_backend: providers.Selector = providers.Selector(
+        config.doc_gen.conversion_backend,
+        remote=remote_conversion_backend,
+        local=providers.Singleton(
+            HybridConversionBackend,
+            local_backend=local_conversion_backend,
+            remote_backend=remote_conversion_backend,
+            spill_to_remote=False,
+        ),
+        hybrid=providers.Singleton(
+            HybridConversionBackend,
+            local_backend=local_conversion_backend,
+            remote_backend=remote_conversion_backend,
+            spill_to_remote=True,
+        ),
+    )
+
     s3_client: providers.Resource[S3Client] = providers.Resource(
         init_client,
         session=boto3_session,
@@ -64,6 +178,28 @@ class Container(containers.DeclarativeContainer):
     storage_service: providers.Singleton[FileStorageService] = providers.Singleton(
         FileStorageService,
         s3_client=s3_client,
+        multipart_threshold_in_bytes=config.storage.multipart_threshold_in_bytes,
+        multipart_chunk_size_in_bytes=config.storage.multipart_chunk_size_in_bytes,
+        multipart_max_concurrency=config.storage.multipart_max_concurrency,
+        download_part_size_in_bytes=config.storage.download_part_size_in_bytes,
+        download_max_concurrency=config.storage.download_max_concurrency,
+    )
+
+    conversion_cache: providers.Resource[ConversionCache] = providers.Resource(
+        init_conversion_cache,
+        file_storage=storage_service,
+        bucket_name=config.storage.main_bucket_name,
+        is_enabled=config.doc_gen.conversion_cache_enabled,
+        key_prefix=config.doc_gen.conversion_cache_key_prefix,
+        max_local_size_in_bytes=config.doc_gen.conversion_cache_max_local_size_in_bytes,
+        ttl_in_seconds=config.doc_gen.conversion_cache_ttl_in_seconds,
+        conversion_backend=config.doc_gen.conversion_backend,
+        converter_version=config.doc_gen.conversion_cache_converter_version,
+    )
+    conversion_backend: providers.Singleton[CachedConversionBackend] = providers.Singleton(
+        CachedConversionBackend,
+        backend=selected_conversion_backend,
+        conversion_cache=conversion_cache,
     )
     registry_service: providers.Singleton[FileRegistryService] = providers.Singleton(
         FileRegistryService,
@@ -79,33 +215,92 @@ class Container(containers.DeclarativeContainer):
     document_repository: providers.Singleton[DocumentRepository] = providers.Singleton(
         DocumentRepository,
         dynamodb_client=dynamodb_client,
-        table_name=config.dynamo_storage.documents_table_name
+        table_name=config.dynamo_storage.documents_table_name,
+        item_loader_enabled=config.dynamo_storage.item_loader_enabled,
+        item_loader_batch_window_in_seconds=config.dynamo_storage.item_loader_batch_window_in_seconds,
+        item_loader_max_batch_size=config.dynamo_storage.item_loader_max_batch_size,
     )
     envelope_repository: providers.Singleton[EnvelopeRepository] = providers.Singleton(
         EnvelopeRepository,
         dynamodb_client=dynamodb_client,
-        table_name=config.dynamo_storage.envelopes_table_name
+        table_name=config.dynamo_storage.envelopes_table_name,
+        item_loader_enabled=config.dynamo_storage.item_loader_enabled,
+        item_loader_batch_window_in_seconds=config.dynamo_storage.item_loader_batch_window_in_seconds,
+        item_loader_max_batch_size=config.dynamo_storage.item_loader_max_batch_size,
     )
     envelope_callback_repository: providers.Singleton[EnvelopeCallbackRepository] = providers.Singleton(
         EnvelopeCallbackRepository,
         dynamodb_client=dynamodb_client,
-        table_name=config.dynamo_storage.envelope_callbacks_table_name
+        table_name=config.dynamo_storage.envelope_callbacks_table_name,
+        item_loader_enabled=config.dynamo_storage.item_loader_enabled,
+        item_loader_batch_window_in_seconds=config.dynamo_storage.item_loader_batch_window_in_seconds,
+        item_loader_max_batch_size=config.dynamo_storage.item_loader_max_batch_size,
     )
 
+    document_index_writer: providers.Resource[DocumentIndexWriter] = providers.Resource(
+        init_document_index_writer,
+        dynamodb_client=dynamodb_client,
+        document_repository=document_repository,
+        is_enabled=config.doc_gen.document_index_write_behind_enabled,
+        batch_size=config.doc_gen.document_index_write_batch_size,
+        max_queue_size=config.doc_gen.document_index_write_queue_size,
+    )
+    render_process_pool: providers.Resource[ProcessPoolExecutor | None] = providers.Resource(
+        init_render_process_pool,
+        is_enabled=config.doc_gen.render_in_process_pool,
+        pool_size=config.doc_gen.render_process_pool_size,
+    )
+    generation_pipeline: providers.Singleton[GenerationPipeline] = providers.Singleton(
+        GenerationPipeline,
+        conversion_backend=conversion_backend,
+        index_writer=document_index_writer,
+        memory_budget=providers.Singleton(
+            MemoryBudget,
+            max_size_in_bytes=config.doc_gen.memory_budget_in_bytes,
+            spill_threshold_in_bytes=config.doc_gen.spill_threshold_in_bytes,
+        ),
+        render_concurrency=config.doc_gen.pipeline_render_concurrency,
+        convert_concurrency=config.doc_gen.pipeline_convert_concurrency,
+        post_process_concurrency=config.doc_gen.pipeline_post_process_concurrency,
+        upload_concurrency=config.doc_gen.pipeline_upload_concurrency,
+        render_executor=render_process_pool,
+    )
+
+    document_index_reconciler: providers.Resource[DocumentIndexReconciler] = providers.Resource(
+        init_document_index_reconciler,
+        is_enabled=config.doc_gen.document_index_reconciler_enabled,
+        document_repository=document_repository,
+        file_storage=storage_service,
+        bucket_name=config.storage.main_bucket_name,
+        documents_prefix=FileConvertorService.documents_path.as_posix(),
+        interval_in_seconds=config.doc_gen.document_index_reconcile_interval_in_seconds,
+    )
+    workspace_manager: providers.Resource[WorkspaceManager] = providers.Resource(
+        init_workspace_manager,
+        root_path=config.doc_gen.tmp_dir_path,
+        tmpfs_path=config.doc_gen.workspace_tmpfs_path,
+        quota_in_bytes=config.doc_gen.workspace_quota_in_bytes,
+        quota_wait_timeout=config.doc_gen.workspace_quota_wait_timeout_in_seconds,
+        orphan_max_age_in_seconds=config.doc_gen.workspace_orphan_max_age_in_seconds,
+        janitor_interval_in_seconds=config.doc_gen.workspace_janitor_interval_in_seconds,
+    )
     doc_gen_service: providers.Singleton[FileConvertorService] = providers.Singleton(
         FileConvertorService,
-        api_client=gotenberg_api_client,
+        pipeline=generation_pipeline,
         file_storage=storage_service,
         file_registry=registry_service,
         document_repository=document_repository,
         main_bucket_name=config.storage.main_bucket_name,
         app_version=config.app_version,
         expiration_date_in_seconds=config.dynamo_storage.expiration_date_in_seconds,
-        tmp_dir_path=config.doc_gen.tmp_dir_path,
+        workspace_manager=workspace_manager,
     )
 
-    docusign_client: providers.Singleton[DocuSignClient] = providers.Singleton(
-        DocuSignClient,
+    docusign_http_client: providers.Resource = providers.Resource(init_docusign_http_client)
+    docusign_client: providers.Selector = providers.Selector(
+        config.docu_sign.client_backend,
+        native=providers.Singleton(NativeDocuSignClient, http_client=docusign_http_client),
+        sdk=providers.Singleton(DocuSignClient),
     )
     esign_envelope_service: providers.Singleton[ESignEnvelopeService] = providers.Singleton(
         ESignEnvelopeService,
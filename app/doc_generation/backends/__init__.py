@@ -0,0 +1,9 @@
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
+from app.doc_generation.backends.cached_backend import CachedConversionBackend
+from app.doc_generation.backends.conversion_cache import ConversionCache
+from app.doc_generation.backends.gotenberg_backend import GotenbergConversionBackend
+from app.doc_generation.backends.hybrid_backend import HybridConversionBackend
+from app.doc_generation.backends.libreoffice_backend import (
+    LibreOfficeConversionBackend,
+    LibreOfficeProcessPool,
+)
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractConversionBackend(ABC):
+    """Documents are passed as immutable bytes, so backends don't need to copy or rewind them"""
+
+    @abstractmethod
+    async def convert_docx_to_pdf(self, file_to_convert: bytes, template_path: str) -> bytes:
+        """Convert rendered docx document to pdf"""
+
+    @abstractmethod
+    async def convert_html_to_pdf(
+        self,
+        file_to_convert: bytes,
+        header_file: bytes | None = None,
+        footer_file: bytes | None = None,
+    ) -> bytes:
+        """Convert rendered html document (with optional header and footer) to pdf"""
@@ -0,0 +1,51 @@
+import asyncio
+
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
+from app.doc_generation.backends.conversion_cache import ConversionCache
+
+
+class CachedConversionBackend(AbstractConversionBackend):
+    """
+    Different template variables often render to byte-identical documents.
+    Converted documents are looked up in the conversion cache by rendered content before they are sent to backend.
+    """
+
+    def __init__(self, backend: AbstractConversionBackend, conversion_cache: ConversionCache):
+        self.backend = backend
+        self.conversion_cache = conversion_cache
+
+    async def convert_docx_to_pdf(self, file_to_convert: bytes, template_path: str) -> bytes:
+        if not self.conversion_cache.is_enabled:
+            return await self.backend.convert_docx_to_pdf(file_to_convert, template_path)
+
+        # docx archive is decompressed to build the key, so it's done in thread
+        cache_key = await asyncio.to_thread(self.conversion_cache.build_docx_key, file_to_convert)
+
+        cached_document = await self.conversion_cache.get(cache_key)
+        if cached_document is not None:
+            return cached_document
+
+        converted_document = await self.backend.convert_docx_to_pdf(file_to_convert, template_path)
+        await self.conversion_cache.set(cache_key, converted_document)
+
+        return converted_document
+
+    async def convert_html_to_pdf(
+        self,
+        file_to_convert: bytes,
+        header_file: bytes | None = None,
+        footer_file: bytes | None = None,
+    ) -> bytes:
+        if not self.conversion_cache.is_enabled:
+            return await self.backend.convert_html_to_pdf(file_to_convert, header_file, footer_file)
+
+        cache_key = self.conversion_cache.build_key("html", file_to_convert, header_file, footer_file)
+
+        cached_document = await self.conversion_cache.get(cache_key)
+        if cached_document is not None:
+            return cached_document
+
+        converted_document = await self.backend.convert_html_to_pdf(file_to_convert, header_file, footer_file)
+        await self.conversion_cache.set(cache_key, converted_document)
+
+        return converted_document
@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import logging
+import time
+import zipfile
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+from app.base.exception import BaseHTTPException
+from app.file_storage.service import FileStorageService
+
+
+class ConversionCache:
+    """
+    Cache of converted pdf documents, keyed by hash of rendered document (docx/html)
+    and content of files which take part in conversion (header/footer).
+    Converted documents are stored in two tiers: bounded in-memory LRU and S3 (shared between instances).
+    Documents are kept in generations of `ttl_in_seconds`, previous generations are purged from S3 in background.
+    """
+
+    digest_size = 32
+
+    def __init__(
+        self,
+        file_storage: FileStorageService,
+        bucket_name: str,
+        is_enabled: bool,
+        key_prefix: str,
+        max_local_size_in_bytes: int,
+        ttl_in_seconds: int,
+        conversion_backend: str,
+        converter_version: str,
+    ):
+        self.file_storage = file_storage
+        self.bucket_name = bucket_name
+        self.is_enabled = is_enabled
+        self.key_prefix = Path(key_prefix)
+        self.max_local_size_in_bytes = max_local_size_in_bytes
+        self.ttl_in_seconds = ttl_in_seconds
+        # documents converted by another backend or version of converter may differ
+        self.key_namespace = f"{conversion_backend}:{converter_version}"
+
+        self._local_documents: OrderedDict[str, bytes] = OrderedDict()
+        self._local_size_in_bytes = 0
+        self._purged_generation: int | None = None
+        self._purge_task: asyncio.Task | None = None
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def build_key(self, document_kind: str, rendered_document: bytes, *addition_files: bytes | None) -> str:
+        hasher = hashlib.blake2b(digest_size=self.digest_size)
+        hasher.update(f"{self.key_namespace}:{document_kind}".encode())
+        for addition_file in addition_files:
+            _update_with_part(hasher, addition_file)
+
+        hasher.update(b"\x00")
+        hasher.update(rendered_document)
+
+        return hasher.hexdigest()
+
+    def build_docx_key(self, rendered_document: bytes) -> str:
+        """
+        Rendered docx is a zip archive with timestamps of its files, so the same document differs byte by byte
+        on every render. Key is built by names and content of the files instead.
+        """
+        try:
+            docx_file = zipfile.ZipFile(BytesIO(rendered_document))
+        except zipfile.BadZipFile:
+            return self.build_key("docx", rendered_document)
+
+        hasher = hashlib.blake2b(digest_size=self.digest_size)
+        hasher.update(f"{self.key_namespace}:docx".encode())
+        with docx_file:
+            for docx_part in docx_file.infolist():
+                _update_with_part(hasher, docx_part.filename.encode())
+                _update_with_part(hasher, docx_file.read(docx_part))
+
+        return hasher.hexdigest()
+
+    async def get(self, key: str) -> bytes | None:
+        if not self.is_enabled:
+            return None
+
+        storage_key = self._build_storage_key(key)
+        local_document = self._local_documents.get(storage_key)
+        if local_document is not None:
+            self._local_documents.move_to_end(storage_key)
+            return local_document
+
+        try:
+            remote_document = await self.file_storage.download_file(self.bucket_name, storage_key)
+        except BaseHTTPException as exc:
+            self._logger.warning(f"Can't get converted document {key} from storage: {exc.message}")
+            return None
+
+        if remote_document is None:
+            return None
+
+        document_content = remote_document.getvalue()
+        self._set_local(storage_key, document_content)
+        return document_content
+
+    async def set(self, key: str, converted_document: bytes) -> None:
+        if not self.is_enabled:
+            return
+
+        storage_key = self._build_storage_key(key)
+        self._set_local(storage_key, converted_document)
+        self._start_purge()
+
+        try:
+            await self.file_storage.upload_file(self.bucket_name, storage_key, BytesIO(converted_document))
+        except BaseHTTPException as exc:
+            self._logger.warning(f"Can't put converted document {key} to storage: {exc.message}")
+
+    async def close(self) -> None:
+        if self._purge_task is not None:
+            await self._purge_task
+
+    def _set_local(self, storage_key: str, document_content: bytes) -> None:
+        document_size = len(document_content)
+        if document_size > self.max_local_size_in_bytes:
+            return
+
+        previous_document = self._local_documents.pop(storage_key, None)
+        if previous_document is not None:
+            self._local_size_in_bytes -= len(previous_document)
+
+        while self._local_documents and self._local_size_in_bytes + document_size > self.max_local_size_in_bytes:
+            _, evicted_document = self._local_documents.popitem(last=False)
+            self._local_size_in_bytes -= len(evicted_document)
+
+        self._local_documents[storage_key] = document_content
+        self._local_size_in_bytes += document_size
+
+    def _start_purge(self) -> None:
+        generation = self._get_generation()
+        if generation == self._purged_generation:
+            return
+
+        if self._purge_task is None or self._purge_task.done():
+            self._purged_generation = generation
+            self._purge_task = asyncio.create_task(self._purge_expired_generations(generation))
+
+    async def _purge_expired_generations(self, generation: int) -> None:
+        """Every instance purges expired generations once per generation, deletion of deleted objects is no-op"""
+        try:
+            await self._purge_generations_except(generation)
+        except Exception as exc:
+            # purge is retried in the next generation, so failure mustn't break conversions
+            self._logger.error(f"Can't purge expired converted documents: {exc!r}")
+
+    async def _purge_generations_except(self, generation: int) -> None:
+        current_prefix = self._build_generation_prefix(generation)
+        expired_prefixes: set[str] = set()
+        async for object_key in self.file_storage.iterate_object_keys(self.bucket_name, f"{self.key_prefix}/"):
+            if not object_key.startswith(current_prefix):
+                generation_prefix, _ = object_key.rsplit("/", 1)
+                expired_prefixes.add(f"{generation_prefix}/")
+
+        for expired_prefix in expired_prefixes:
+            await self.file_storage.purge_prefix(self.bucket_name, expired_prefix)
+
+    def _get_generation(self) -> int:
+        return int(time.time() // self.ttl_in_seconds)
+
+    def _build_generation_prefix(self, generation: int) -> str:
+        generation_path = self.key_prefix / str(generation)
+        return f"{generation_path}/"
+
+    def _build_storage_key(self, key: str) -> str:
+        generation = self._get_generation()
+        return str(self.key_prefix / str(generation) / f"{key}.pdf")
+
+
+def _update_with_part(hasher: "hashlib.blake2b", key_part: bytes | None) -> None:
+    # length prefix separates absent part from empty one and keeps boundaries between parts
+    if key_part is None:
+        hasher.update(b"-:")
+        return
+
+    key_part_size = len(key_part)
+    hasher.update(f"{key_part_size}:".encode())
+    hasher.update(key_part)
@@ -0,0 +1,29 @@
+from io import BytesIO
+
+from app.api_client.gotenberg_api_client import GotenbergApiClient
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
+
+
+class GotenbergConversionBackend(AbstractConversionBackend):
+    """Remote conversion through Gotenberg (LibreOffice for docx and Chromium for html)"""
+
+    def __init__(self, api_client: GotenbergApiClient):
+        self.api_client = api_client
+
+    # BytesIO which is created from bytes shares buffer with them until it's modified, so wrapping doesn't copy
+    async def convert_docx_to_pdf(self, file_to_convert: bytes, template_path: str) -> bytes:
+        converted_document = await self.api_client.convert_docx_to_pdf(BytesIO(file_to_convert), template_path)
+        return converted_document.getvalue()
+
+    async def convert_html_to_pdf(
+        self,
+        file_to_convert: bytes,
+        header_file: bytes | None = None,
+        footer_file: bytes | None = None,
+    ) -> bytes:
+        converted_document = await self.api_client.convert_html_to_pdf(
+            BytesIO(file_to_convert),
+            BytesIO(header_file) if header_file is not None else None,
+            BytesIO(footer_file) if footer_file is not None else None,
+        )
+        return converted_document.getvalue()
@@ -0,0 +1,47 @@
+import logging
+
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
+from app.doc_generation.backends.libreoffice_backend import LibreOfficeConversionBackend
+from app.doc_generation.exception import LocalConversionException
+
+
+class HybridConversionBackend(AbstractConversionBackend):
+    """
+    Docx documents are converted by local backend. When `spill_to_remote` is enabled, docx documents are sent
+    to remote backend if all local processes are busy or local conversion has failed.
+    Html documents are always converted by remote backend, because header/footer are supported by Chromium only.
+    """
+
+    def __init__(
+        self,
+        local_backend: LibreOfficeConversionBackend,
+        remote_backend: AbstractConversionBackend,
+        spill_to_remote: bool,
+    ):
+        self.local_backend = local_backend
+        self.remote_backend = remote_backend
+        self.spill_to_remote = spill_to_remote
+
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    async def convert_docx_to_pdf(self, file_to_convert: bytes, template_path: str) -> bytes:
+        if self.spill_to_remote and not self.local_backend.has_capacity:
+            return await self.remote_backend.convert_docx_to_pdf(file_to_convert, template_path)
+
+        try:
+            return await self.local_backend.convert_docx_to_pdf(file_to_convert, template_path)
+        except LocalConversionException as exc:
+            if not self.spill_to_remote:
+                raise
+
+            self._logger.warning(f"Local conversion of {template_path} failed, spill to remote backend: {exc}")
+
+        return await self.remote_backend.convert_docx_to_pdf(file_to_convert, template_path)
+
+    async def convert_html_to_pdf(
+        self,
+        file_to_convert: bytes,
+        header_file: bytes | None = None,
+        footer_file: bytes | None = None,
+    ) -> bytes:
+        return await self.remote_backend.convert_html_to_pdf(file_to_convert, header_file, footer_file)
@@ -0,0 +1,363 @@
+import asyncio
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import time
+from contextlib import ExitStack, asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, cast
+
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
+from app.doc_generation.exception import LocalConversionException, UnsupportedConversionException
+
+LOCALHOST = "127.0.0.1"
+# state of listening socket in /proc/net/tcp
+TCP_LISTEN_STATE = "0A"
+
+
+class UnoServerProcess:
+    """
+    Warm headless soffice process, which is driven over UNO by `unoserver`.
+    Every process has its own LibreOffice profile, because soffice allows only one running instance per profile.
+    Ports are picked from free ephemeral ones on every start, so processes of several workers of the pod
+    don't clash, and process is ready only when its own unoserver listens on the port.
+    """
+
+    ready_poll_interval = 0.2
+    stop_timeout = 10.0
+
+    def __init__(
+        self,
+        profile_dir: Path,
+        unoserver_path: str,
+        unoconvert_path: str,
+        start_timeout: float,
+    ):
+        self.port = 0
+        self.uno_port = 0
+        self.profile_dir = profile_dir
+        self.unoserver_path = unoserver_path
+        self.unoconvert_path = unoconvert_path
+        self.start_timeout = start_timeout
+
+        self.conversions_count = 0
+
+        self._process: asyncio.subprocess.Process | None = None
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        server_port, uno_port = _pick_free_ports(2)
+        self.port = server_port
+        self.uno_port = uno_port
+        server_command = [
+            self.unoserver_path,
+            "--interface",
+            LOCALHOST,
+            "--port",
+            str(self.port),
+            "--uno-port",
+            str(self.uno_port),
+            "--user-installation",
+            self.profile_dir.resolve().as_uri(),
+        ]
+        self._process = await _create_subprocess(
+            server_command,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self.conversions_count = 0
+
+        await self._wait_until_ready()
+        self._logger.info(f"unoserver on port {self.port} is started")
+
+    async def stop(self) -> None:
+        if self._process is None or not self.is_running:
+            self._process = None
+            return
+
+        self._process.terminate()
+        try:
+            await asyncio.wait_for(self._process.wait(), timeout=self.stop_timeout)
+        except asyncio.TimeoutError:
+            self._process.kill()
+            await self._process.wait()
+
+        self._process = None
+
+    async def convert(self, document: bytes, timeout: float) -> bytes:
+        # "-" as input and output file means that document is passed through stdin/stdout
+        convert_command = [
+            self.unoconvert_path,
+            "--interface",
+            LOCALHOST,
+            "--port",
+            str(self.port),
+            "--convert-to",
+            "pdf",
+            "-",
+            "-",
+        ]
+        converter = await _create_subprocess(
+            convert_command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        try:
+            converted_document, error_output = await asyncio.wait_for(converter.communicate(document), timeout)
+        except asyncio.TimeoutError:
+            converter.kill()
+            await converter.wait()
+            raise LocalConversionException(f"timeout {timeout} sec. exceeded")
+
+        if converter.returncode != 0:
+            raise LocalConversionException(error_output.decode("utf-8", errors="replace"))
+
+        self.conversions_count += 1
+        return converted_document
+
+    async def _wait_until_ready(self) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.start_timeout
+
+        while loop.time() < deadline:
+            if not self.is_running:
+                raise LocalConversionException(f"unoserver on port {self.port} exited on start")
+
+            try:
+                _, writer = await asyncio.open_connection(LOCALHOST, self.port)
+            except OSError:
+                await asyncio.sleep(self.ready_poll_interval)
+                continue
+
+            writer.close()
+            await writer.wait_closed()
+            await self._check_port_owner()
+            return
+
+        await self.stop()
+        raise LocalConversionException(f"unoserver on port {self.port} wasn't started in {self.start_timeout} sec.")
+
+    async def _check_port_owner(self) -> None:
+        process_id = cast(asyncio.subprocess.Process, self._process).pid
+        if await asyncio.to_thread(_is_port_listened_by, process_id, self.port):
+            return
+
+        # another process has taken the port after it was picked, so unoserver can't bind it
+        await self.stop()
+        raise LocalConversionException(f"port {self.port} is listened by another process")
+
+
+class LibreOfficeProcessPool:
+    """
+    Pool of warm soffice processes. Process is recycled (restarted) after `max_conversions_per_process`
+    conversions or after failed conversion, because long-living soffice leaks memory and can hang after errors.
+    After failed start the pool reports no idle processes for `start_retry_interval`, so hybrid backend
+    spills documents to Gotenberg at once instead of waiting for the next start.
+    """
+
+    start_retry_interval = 60.0
+
+    def __init__(
+        self,
+        pool_size: int,
+        max_conversions_per_process: int,
+        unoserver_path: str,
+        unoconvert_path: str,
+        start_timeout: float,
+        conversion_timeout: float,
+    ):
+        self.pool_size = pool_size
+        self.max_conversions_per_process = max_conversions_per_process
+        self.unoserver_path = unoserver_path
+        self.unoconvert_path = unoconvert_path
+        self.start_timeout = start_timeout
+        self.conversion_timeout = conversion_timeout
+
+        self._profiles_dir: Path | None = None
+        self._processes: list[UnoServerProcess] = []
+        self._idle_processes: asyncio.Queue[UnoServerProcess] = asyncio.Queue()
+        self._start_lock = asyncio.Lock()
+        self._is_started = False
+        self._failed_start_time: float | None = None
+
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def has_idle_process(self) -> bool:
+        if self._is_started:
+            return not self._idle_processes.empty()
+
+        return self._failed_start_time is None or (
+            time.monotonic() - self._failed_start_time >= self.start_retry_interval
+        )
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._is_started:
+                return
+
+            self._profiles_dir = Path(tempfile.mkdtemp(prefix="libreoffice_profiles_"))
+            self._processes = [
+                UnoServerProcess(
+                    profile_dir=self._profiles_dir / str(process_number),
+                    unoserver_path=self.unoserver_path,
+                    unoconvert_path=self.unoconvert_path,
+                    start_timeout=self.start_timeout,
+                )
+                for process_number in range(self.pool_size)
+            ]
+            # every start is finished before the failure is handled, so no process is spawned after the cleanup
+            start_results = await asyncio.gather(
+                *[process.start() for process in self._processes],
+                return_exceptions=True,
+            )
+            start_exceptions = [
+                start_result for start_result in start_results if isinstance(start_result, BaseException)
+            ]
+            if start_exceptions:
+                # started processes would be left without the pool, which is started again from scratch
+                await self.close()
+                self._failed_start_time = time.monotonic()
+                raise start_exceptions[0]
+
+            for process in self._processes:
+                self._idle_processes.put_nowait(process)
+
+            self._is_started = True
+
+    async def warm_up(self) -> None:
+        """Start processes before the first request, pool is started again on demand when it fails"""
+        try:
+            await self.start()
+        except LocalConversionException as exc:
+            self._logger.error(f"Can't start LibreOffice process pool: {exc}")
+
+    async def close(self) -> None:
+        await asyncio.gather(*[process.stop() for process in self._processes])
+        self._processes = []
+
+        if self._profiles_dir is not None:
+            shutil.rmtree(self._profiles_dir, ignore_errors=True)
+            self._profiles_dir = None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[UnoServerProcess]:
+        await self.start()
+
+        process = await self._get_idle_process()
+        is_failed = False
+        try:
+            yield process
+        except Exception:
+            is_failed = True
+            raise
+        finally:
+            if is_failed or process.conversions_count >= self.max_conversions_per_process:
+                await self._recycle(process)
+
+            self._idle_processes.put_nowait(process)
+
+    async def _get_idle_process(self) -> UnoServerProcess:
+        process = await self._idle_processes.get()
+        if process.is_running:
+            return process
+
+        try:
+            await process.start()
+        except LocalConversionException:
+            self._idle_processes.put_nowait(process)
+            raise
+
+        return process
+
+    async def _recycle(self, process: UnoServerProcess) -> None:
+        await process.stop()
+
+        try:
+            await process.start()
+        except LocalConversionException as exc:
+            # process will be started again on the next acquiring
+            self._logger.error(f"Can't restart unoserver on port {process.port}: {exc}")
+
+
+class LibreOfficeConversionBackend(AbstractConversionBackend):
+    """Local docx conversion through the pool of warm headless soffice processes"""
+
+    def __init__(self, process_pool: LibreOfficeProcessPool):
+        self.process_pool = process_pool
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.process_pool.has_idle_process
+
+    async def convert_docx_to_pdf(self, file_to_convert: bytes, template_path: str) -> bytes:
+        async with self.process_pool.acquire() as process:
+            return await process.convert(file_to_convert, self.process_pool.conversion_timeout)
+
+    async def convert_html_to_pdf(
+        self,
+        file_to_convert: bytes,
+        header_file: bytes | None = None,
+        footer_file: bytes | None = None,
+    ) -> bytes:
+        # header and footer templates are supported only by Chromium
+        raise UnsupportedConversionException("html")
+
+
+async def _create_subprocess(command: list[str], **subprocess_kwargs) -> asyncio.subprocess.Process:
+    try:
+        return await asyncio.create_subprocess_exec(*command, **subprocess_kwargs)
+    except OSError as exc:
+        # e.g. unoserver isn't installed, so hybrid backend spills documents to Gotenberg instead of failing
+        raise LocalConversionException(f"{command[0]} can't be started: {exc}")
+
+
+def _pick_free_ports(ports_count: int) -> list[int]:
+    """Ports are bound at the same time, so OS gives different ones"""
+    with ExitStack() as sockets_stack:
+        port_sockets = [
+            sockets_stack.enter_context(socket.socket(socket.AF_INET, socket.SOCK_STREAM))
+            for _ in range(ports_count)
+        ]
+        for port_socket in port_sockets:
+            port_socket.bind((LOCALHOST, 0))
+        free_ports = [bound_socket.getsockname()[1] for bound_socket in port_sockets]
+
+    return free_ports
+
+
+def _is_port_listened_by(process_id: int, port: int) -> bool:
+    """Listening socket of the port is looked up in /proc, check is skipped where /proc isn't available"""
+    try:
+        listening_sockets = _find_listening_sockets(port)
+    except OSError:
+        return True
+
+    process_fds = Path(f"/proc/{process_id}/fd")
+    try:
+        process_links = {os.readlink(fd_path) for fd_path in process_fds.iterdir()}
+    except OSError:
+        return True
+
+    return bool(listening_sockets & process_links)
+
+
+def _find_listening_sockets(port: int) -> set[str]:
+    # local address is "<ip>:<port>" in hex, socket is referred by its inode in /proc/<pid>/fd
+    port_suffix = f":{port:04X}"
+    with open("/proc/net/tcp") as tcp_table:
+        socket_entries = [table_row.split() for table_row in tcp_table.readlines()[1:]]
+
+    return {
+        f"socket:[{socket_entry[9]}]"
+        for socket_entry in socket_entries
+        if socket_entry[3] == TCP_LISTEN_STATE and socket_entry[1].endswith(port_suffix)
+    }
@@ -63,3 +63,33 @@ class IncorrectProcessorState(BaseHTTPException):
 
     def __init__(self, field_name: str) -> None:
         super().__init__(addition_message=f"Incorrect field: {field_name}")
+
+
+class LocalConversionException(BaseHTTPException):
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    message = "Local document converting failed."
+
+    is_expected = False
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(addition_message=reason)
+
+
+class WorkspaceQuotaExceededException(BaseHTTPException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    message = "Disk quota of temporary workspaces is exceeded, try again later"
+
+    is_expected = False
+
+    def __init__(self, quota_in_bytes: int) -> None:
+        super().__init__(addition_message=f"Quota: {quota_in_bytes} bytes")
+
+
+class UnsupportedConversionException(BaseHTTPException):
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    message = "Conversion backend doesn't support document format"
+
+    is_expected = False
+
+    def __init__(self, document_format: str) -> None:
+        super().__init__(field_value=document_format)
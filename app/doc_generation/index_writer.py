@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from contextlib import suppress
+
+from app.doc_generation.models.document import DocumentPutItem
+from app.doc_generation.repository import DocumentRepository
+from app.new_relic import record_custom_metric
+
+QUEUE_DEPTH_METRIC = "DocGen/IndexWriter/QueueDepth"
+FAILED_PUTS_METRIC = "DocGen/IndexWriter/FailedPuts"
+
+
+class DocumentIndexWriter:
+    """
+    Write-behind queue of Documents index rows. When it's enabled, response is sent right after document upload
+    and rows are written in background by batches. Rows, which weren't written, are only logged and counted,
+    because missing row means that document will be generated once again.
+    Queue is flushed on shutdown.
+    """
+
+    def __init__(
+        self,
+        document_repository: DocumentRepository,
+        is_enabled: bool,
+        batch_size: int,
+        max_queue_size: int,
+    ):
+        self.document_repository = document_repository
+        self.is_enabled = is_enabled
+        self.batch_size = batch_size
+
+        self.failed_puts_count = 0
+
+        self._queue: asyncio.Queue[DocumentPutItem] = asyncio.Queue(maxsize=max_queue_size)
+        self._writer_task: asyncio.Task | None = None
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self.is_enabled and self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._run_writer())
+
+    async def close(self) -> None:
+        if self._writer_task is None:
+            return
+
+        await self.flush()
+
+        self._writer_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._writer_task
+
+        self._writer_task = None
+
+    async def put_item(self, put_item_model: DocumentPutItem) -> None:
+        await self.put_items([put_item_model])
+
+    async def put_items(self, put_item_models: list[DocumentPutItem]) -> None:
+        if self._writer_task is None:
+            await self.document_repository.batch_put_items(put_item_models)
+            return
+
+        # full queue slows down requests instead of growing without limit
+        for put_item_model in put_item_models:
+            await self._queue.put(put_item_model)
+
+    async def flush(self) -> None:
+        await self._queue.join()
+
+    async def _run_writer(self) -> None:
+        while self.is_enabled:
+            put_item_models = [await self._queue.get()]
+            while len(put_item_models) < self.batch_size and not self._queue.empty():
+                put_item_models.append(self._queue.get_nowait())
+
+            await self._write_batch(put_item_models)
+
+    async def _write_batch(self, put_item_models: list[DocumentPutItem]) -> None:
+        failed_puts_count = 0
+        try:
+            await self.document_repository.batch_put_items(put_item_models)
+        except Exception as exc:
+            # any failure (including connection errors of botocore) mustn't stop the writer
+            failed_puts_count = len(put_item_models)
+            self._logger.error(f"{failed_puts_count} Documents index rows weren't written: {exc!r}")
+        finally:
+            # not acknowledged items would block `put_items` and `flush` forever
+            for _ in put_item_models:
+                self._queue.task_done()
+
+        self.failed_puts_count += failed_puts_count
+        record_custom_metric(QUEUE_DEPTH_METRIC, self.queue_depth)
+        record_custom_metric(FAILED_PUTS_METRIC, failed_puts_count)
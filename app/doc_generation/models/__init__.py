@@ -1,2 +1,7 @@
-from app.doc_generation.models.document import DocumentPutItem, DocumentSearchItem
+from app.doc_generation.models.document import (
+    DocumentDeleteItem,
+    DocumentItemModel,
+    DocumentPutItem,
+    DocumentSearchItem,
+)
 from app.doc_generation.models.template import TemplateModel, generate_hash_from_templates
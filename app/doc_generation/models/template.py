@@ -1,13 +1,23 @@
 import hashlib
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import cast
 
-from pydantic import PrivateAttr
+# version prefix of request hash, rows with hashes of another format are found by legacy lookup only
+REQUEST_HASH_VERSION = "v2"
+REQUEST_HASH_SIZE = 16
 
-from app.base.models import DBBaseModel
+_canonical_encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
 def _generate_hash(object_to_encode: dict) -> str:
+    encoded_object = _canonical_encoder.encode(object_to_encode).encode("utf-8")
+    hashed_object = hashlib.blake2b(encoded_object, digest_size=REQUEST_HASH_SIZE).hexdigest()
+    return f"{REQUEST_HASH_VERSION}:{hashed_object}"
+
+
+def _generate_legacy_hash(object_to_encode: dict) -> str:
     encoded_object = json.dumps(object_to_encode, sort_keys=True).encode("utf-8")
     return hashlib.md5(encoded_object, usedforsecurity=False).hexdigest()
 
@@ -17,7 +27,8 @@ def generate_hash_from_templates(
     bucket: str,
     variables: dict,
     watermark_etag: str | None = None,
-    images_etags: list[str] | None = None
+    images_etags: list[str] | None = None,
+    is_legacy: bool = False,
 ) -> str:
     object_to_encode = {
         "etags": etags,
@@ -26,22 +37,41 @@ def generate_hash_from_templates(
         "watermark_etag": watermark_etag,
         "images": images_etags
     }
-    return _generate_hash(object_to_encode)
+    return _generate_legacy_hash(object_to_encode) if is_legacy else _generate_hash(object_to_encode)
 
 
-class ImageTemplateModel(DBBaseModel):
+@dataclass(frozen=True, slots=True)
+class ImageTemplateModel:
     file_etag: str
     width: int
     height: int
     variable_name: str
 
-    @property
-    def hashed_image_model(self) -> str:
-        object_to_encode = self.dict()
-        return _generate_hash(object_to_encode)
+    hashed_image_model: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "hashed_image_model", _generate_hash(self.to_hash_object()))  # noqa: WPS609
+
+    def to_hash_object(self) -> dict:
+        return {
+            "file_etag": self.file_etag,
+            "width": self.width,
+            "height": self.height,
+            "variable_name": self.variable_name,
+        }
+
+    def generate_legacy_hash(self) -> str:
+        return _generate_legacy_hash(self.to_hash_object())
 
 
-class TemplateModel(DBBaseModel):
+@dataclass(frozen=True, slots=True)
+class TemplateModel:
+    """
+    Internal immutable model of a template of the request, derived fields are computed once.
+    Request hash is computed on the first access, because it isn't needed for merged documents.
+    Order of template in request doesn't change document, so it isn't a part of hash.
+    """
+
     file_etag: str
     variables: dict
     bucket: str
@@ -51,19 +81,36 @@ class TemplateModel(DBBaseModel):
     header_etag: str | None = None
     footer_etag: str | None = None
     watermark_etag: str | None = None
-    images: list[ImageTemplateModel] | None = None
+    images: tuple[ImageTemplateModel, ...] | None = None
 
-    _template_path_suffix: str | None = PrivateAttr(default=None)
+    template_path_suffix: str = field(init=False, repr=False, compare=False)
+    _hashed_template: str | None = field(default=None, init=False, repr=False, compare=False)
 
-    @property
-    def hashed_template(self) -> str:
-        object_to_encode = self.dict()
-        return _generate_hash(object_to_encode)
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "template_path_suffix", Path(self.template_path).suffix)  # noqa: WPS609
 
     @property
-    def template_path_suffix(self) -> str:
-        if self._template_path_suffix is not None:
-            return self._template_path_suffix
-
-        self._template_path_suffix = Path(self.template_path).suffix   # noqa: WPS601
-        return self._template_path_suffix
+    def hashed_template(self) -> str:
+        if self._hashed_template is None:
+            hash_object = self.to_hash_object()
+            hash_object.pop("order")
+            object.__setattr__(self, "_hashed_template", _generate_hash(hash_object))  # noqa: WPS609
+
+        return cast(str, self._hashed_template)
+
+    def to_hash_object(self) -> dict:
+        """Object has the same structure as pydantic model had, so hashes of stored documents are still valid"""
+        return {
+            "file_etag": self.file_etag,
+            "variables": self.variables,
+            "bucket": self.bucket,
+            "template_path": self.template_path,
+            "order": self.order,
+            "header_etag": self.header_etag,
+            "footer_etag": self.footer_etag,
+            "watermark_etag": self.watermark_etag,
+            "images": [image.to_hash_object() for image in self.images] if self.images is not None else None,
+        }
+
+    def generate_legacy_hash(self) -> str:
+        return _generate_legacy_hash(self.to_hash_object())
@@ -1,4 +1,8 @@
 from app.doc_generation.processors.abstract_template import AbstractDocumentProcessor
+from app.doc_generation.processors.document_buffer import MemoryBudget
 from app.doc_generation.processors.docx_template import DocxDocumentProcessor
 from app.doc_generation.processors.html_template import HtmlDocumentProcessor
+from app.doc_generation.processors.pdf_merger import PdfMerger
 from app.doc_generation.processors.pdf_template import PdfDocumentProcessor
+from app.doc_generation.processors.pipeline import GenerationPipeline, gather_or_cancel
+from app.doc_generation.processors.renderers import create_render_process_pool
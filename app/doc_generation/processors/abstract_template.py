@@ -1,157 +1,150 @@
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from io import BytesIO
 from pathlib import Path
 from typing import Any
 
 import pypdftk
 from typing_extensions import Self
 
-from app.api_client.gotenberg_api_client import GotenbergApiClient
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
 from app.doc_generation.exception import IncorrectProcessorState
+from app.doc_generation.processors.document_buffer import DocumentBuffer
 from app.doc_generation.processors.pdf_utils import build_tmp_full_path, write_watermark
+from app.doc_generation.processors.pipeline import GenerationPipeline
+from app.doc_generation.processors.renderers import RenderTask
 
 
 class AbstractDocumentProcessor(ABC):
     def __init__(
         self,
-        api_client: GotenbergApiClient,
+        conversion_backend: AbstractConversionBackend,
         sub_dir: Path,
-        template_file: BytesIO,
+        template_file: bytes,
         template_path: str,
         template_variables: dict[str, Any],
-        watermark_file: BytesIO | None,
+        watermark_file: bytes | None,
     ):
-        self.api_client: GotenbergApiClient = api_client
+        self.conversion_backend: AbstractConversionBackend = conversion_backend
         self.sub_dir: Path = sub_dir
 
-        self.template_file: BytesIO = template_file
+        self.template_file: bytes = template_file
         self.template_path: str = template_path
         self.template_variables: dict[str, Any] = template_variables
 
-        self.watermark_file: BytesIO | None = watermark_file
+        self.watermark_file: bytes | None = watermark_file
 
-        self._rendered_document: BytesIO | None = None
-        self._rendered_document_path: Path | None = None
-
-        self._converted_document: BytesIO | None = None
-        self._converted_document_path: Path | None = None
-
-        self._document_with_watermark: BytesIO | None = None
-        self._document_with_watermark_path: Path | None = None
+        # documents are immutable, so they are passed between stages without copying
+        self._rendered_document: DocumentBuffer | None = None
+        self._converted_document: DocumentBuffer | None = None
+        self._document_with_watermark: DocumentBuffer | None = None
 
         self._logger: logging.Logger = logging.getLogger(self.__class__.__name__)
 
     @property
-    def document_content(self) -> BytesIO:
+    def document_buffer(self) -> DocumentBuffer:
         if self._document_with_watermark is None:
             raise IncorrectProcessorState("_document_with_watermark")
 
-        document_content = BytesIO(self._document_with_watermark.read())
-        self._document_with_watermark.seek(0)
-
-        return document_content
-
-    @property
-    def document_content_path(self) -> Path | None:
-        if self._document_with_watermark_path is None:
-            return None
-
-        return self._document_with_watermark_path
+        return self._document_with_watermark
 
     @abstractmethod
     def validate(self) -> None:
         """Validate template"""
 
-    async def process_document(self) -> Self:
+    async def process_document(self, pipeline: GenerationPipeline) -> Self:
         """
         Document process is split in 3 pieces:
         1. Render - inject template's values in templates/form
         2. Convert - convert html/docx into pdf
         3. Apply watermark - if there's watermark in request - it'll be applied.
 
-        If concrete processor doesn't have logic for specific stape - it can skip it by returning False value
-        and document content and/or document local path will be copied from previous step.
+        If concrete processor doesn't have logic for specific stape - it can skip it by returning None/False value
+        and document will be taken from previous step.
+
+        Every piece waits for a free slot of its pipeline stage. Render is CPU-bound,
+        so it's run in a worker thread or in a worker process to keep the event loop responsive.
+        Rendered and converted documents are kept in memory while they fit in pipeline's memory budget,
+        otherwise they are spilled to sub dir.
         """
-        render_done = await self.render_document()
-        if not render_done:
+        async with pipeline.render:
+            rendered_document = await pipeline.run_render_task(self.build_render_task())
+        if rendered_document is None:
             self.skip_render_document()
-
-        convert_done = await self.convert_document()
-        if not convert_done:
+        else:
+            self._rendered_document = await pipeline.memory_budget.create_buffer(
+                rendered_document,
+                self.build_tmp_full_path("rendered_document"),
+            )
+
+        async with pipeline.convert:
+            converted_document = await self.convert_document()
+        if converted_document is None:
             self.skip_convert_document()
+        else:
+            self._converted_document = await pipeline.memory_budget.create_buffer(
+                converted_document,
+                self.build_tmp_full_path("converted_document"),
+            )
 
-        watermark_done = await self.apply_watermark()
+        async with pipeline.post_process:
+            watermark_done = await self.apply_watermark()
         if not watermark_done:
             self.skip_apply_watermark()
 
+        # only result document is kept, so budget of intermediate documents is given back
+        self._rendered_document = None
+        self._converted_document = None
+
         return self
 
     @abstractmethod
-    async def render_document(self) -> bool:
-        """Render document based on template"""
+    def build_render_task(self) -> RenderTask:
+        """Build pure render function of document based on template. None is returned if there's nothing to render"""
 
     def skip_render_document(self) -> None:
         """Skip document render"""
 
-        self._rendered_document_path = None
-        self._rendered_document = BytesIO(self.template_file.read())
+        # template is cached by file registry, so it's already in memory and isn't counted in memory budget
+        self._rendered_document = DocumentBuffer(file_content=self.template_file)
 
     @abstractmethod
-    async def convert_document(self) -> bool:
-        """Convert document to pdf format"""
+    async def convert_document(self) -> bytes | None:
+        """Convert document to pdf format. None is returned if there's nothing to convert"""
 
     def skip_convert_document(self) -> None:
         """Skip document render"""
 
-        self._converted_document_path = self._rendered_document_path
-
-        if self._rendered_document:
-            self._converted_document = BytesIO(self._rendered_document.read())
+        self._converted_document = self._rendered_document
 
     async def apply_watermark(self) -> bool:
         if self.watermark_file is None:
             return False
 
-        if self._converted_document_path is None:
-            self._converted_document_path = self.build_tmp_full_path("converted_document")
-            self.write_file(self._converted_document_path, self._converted_document)  # type: ignore
+        if self._converted_document is None:
+            raise IncorrectProcessorState("_converted_document")
 
-        watermark_content = self.watermark_file.read()
-        watermark_path = write_watermark(watermark_content)
+        document_path = self._converted_document.write_to(self.build_tmp_full_path("converted_document"))
+        watermark_path = write_watermark(self.watermark_file, self.sub_dir)
 
-        await self.apply_watermark_by_path(self._converted_document_path, watermark_path)
+        await self.apply_watermark_by_path(document_path, watermark_path)
 
         return True
 
     def skip_apply_watermark(self) -> None:
         """Skip watermark apply"""
 
-        self._document_with_watermark_path = self._converted_document_path
-        if self._converted_document:
-            self._document_with_watermark = BytesIO(self._converted_document.read())
-        elif self._document_with_watermark_path:
-            self._document_with_watermark = self.read_file(self._document_with_watermark_path)
-        else:
-            raise IncorrectProcessorState("_document_with_watermark/_document_with_watermark_path")
+        if self._converted_document is None:
+            raise IncorrectProcessorState("_converted_document")
+
+        self._document_with_watermark = self._converted_document
 
     async def apply_watermark_by_path(self, document_path: Path, watermark_path: Path) -> None:
         document_with_watermark_path = self.build_tmp_full_path("document_with_watermark")
-        pypdftk.stamp(document_path, watermark_path, document_with_watermark_path)
+        await asyncio.to_thread(pypdftk.stamp, document_path, watermark_path, document_with_watermark_path)
 
-        self._document_with_watermark_path = document_with_watermark_path
-        self._document_with_watermark = self.read_file(document_with_watermark_path)
+        # stamped document is already in file, so it isn't loaded in memory and is read via mmap
+        self._document_with_watermark = DocumentBuffer.from_path(document_with_watermark_path)
 
     def build_tmp_full_path(self, file_prefix: str) -> Path:
         return build_tmp_full_path(self.sub_dir, file_prefix)
-
-    @classmethod
-    def write_file(cls, file_path: Path, file_content: BytesIO) -> None:
-        with open(file_path, mode="wb") as tmp_file:
-            tmp_file.write(file_content.read())
-            file_content.seek(0)
-
-    @classmethod
-    def read_file(cls, file_path: Path) -> BytesIO:
-        with open(file_path, mode="rb") as tmp_file:
-            return BytesIO(tmp_file.read())
@@ -0,0 +1,129 @@
+import asyncio
+import mmap
+import threading
+import weakref
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import IO, Iterator, cast
+
+import aiofiles
+from typing_extensions import Self
+
+from app.file_storage.stream import ObjectStream
+
+
+class DocumentBuffer:
+    """
+    Immutable document content, which is kept either in memory or in file (spilled document).
+    Spilled document is read via mmap, so its pages are loaded by OS on demand instead of being copied in heap.
+    """
+
+    def __init__(self, file_content: bytes | None = None, file_path: Path | None = None):
+        self._file_content = file_content
+        self._file_path = file_path
+
+    @classmethod
+    def from_path(cls, file_path: Path) -> Self:
+        return cls(file_path=file_path)
+
+    @property
+    def is_spilled(self) -> bool:
+        return self._file_content is None
+
+    @property
+    def size(self) -> int:
+        if self._file_content is not None:
+            return len(self._file_content)
+
+        return cast(Path, self._file_path).stat().st_size
+
+    def read_bytes(self) -> bytes:
+        if self._file_content is not None:
+            return self._file_content
+
+        return cast(Path, self._file_path).read_bytes()
+
+    def write_to(self, file_path: Path) -> Path:
+        """Return path of the document. In-memory document is written to `file_path` once"""
+
+        if self._file_path is None:
+            file_path.write_bytes(cast(bytes, self._file_content))
+            self._file_path = file_path
+
+        return self._file_path
+
+    @contextmanager
+    def open(self) -> Iterator[IO[bytes]]:  # noqa: WPS603
+        if self._file_content is not None:
+            # BytesIO shares buffer with bytes until it's modified, so document isn't copied
+            yield BytesIO(self._file_content)
+            return
+
+        with open(cast(Path, self._file_path), mode="rb") as document_file:
+            if not self.size:
+                # empty file can't be mapped
+                yield document_file
+                return
+
+            with mmap.mmap(document_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_document:
+                yield cast(IO[bytes], mapped_document)
+
+
+class MemoryBudget:
+    """
+    Per-worker budget of memory, which is occupied by intermediate documents (renders, converted pdfs).
+    Document is spilled to tmp dir when it's bigger than `spill_threshold_in_bytes` or doesn't fit
+    in the rest of the budget. Budget is given back when in-memory document buffer is garbage collected.
+    """
+
+    def __init__(self, max_size_in_bytes: int, spill_threshold_in_bytes: int):
+        self.max_size_in_bytes = max_size_in_bytes
+        self.spill_threshold_in_bytes = spill_threshold_in_bytes
+
+        self._used_size_in_bytes = 0
+        # buffers can be finalized by garbage collector in any thread
+        self._lock = threading.Lock()
+
+    @property
+    def used_size_in_bytes(self) -> int:
+        return self._used_size_in_bytes
+
+    async def create_buffer(self, file_content: bytes, spill_path: Path) -> DocumentBuffer:
+        """Document, which doesn't fit in the budget, is written to file in thread, so event loop isn't blocked"""
+        document_size = len(file_content)
+        if not self._reserve(document_size):
+            await asyncio.to_thread(spill_path.write_bytes, file_content)
+            return DocumentBuffer.from_path(spill_path)
+
+        return self._track(DocumentBuffer(file_content=file_content), document_size)
+
+    async def create_buffer_from_stream(self, object_stream: ObjectStream, spill_path: Path) -> DocumentBuffer:
+        """Document, which doesn't fit in the budget, is written to file by chunks without reading it in memory"""
+        if not self._reserve(object_stream.size):
+            async with aiofiles.open(spill_path, mode="wb") as spill_file:
+                async for spilled_chunk in object_stream.chunks:
+                    await spill_file.write(spilled_chunk)
+            return DocumentBuffer.from_path(spill_path)
+
+        file_content = b"".join([chunk async for chunk in object_stream.chunks])
+        return self._track(DocumentBuffer(file_content=file_content), object_stream.size)
+
+    def _track(self, document_buffer: DocumentBuffer, document_size: int) -> DocumentBuffer:
+        weakref.finalize(document_buffer, self._release, document_size)
+        return document_buffer
+
+    def _reserve(self, document_size: int) -> bool:
+        if document_size > self.spill_threshold_in_bytes:
+            return False
+
+        with self._lock:
+            if self._used_size_in_bytes + document_size > self.max_size_in_bytes:
+                return False
+
+            self._used_size_in_bytes += document_size
+            return True
+
+    def _release(self, document_size: int) -> None:
+        with self._lock:
+            self._used_size_in_bytes -= document_size
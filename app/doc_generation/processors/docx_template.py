@@ -1,43 +1,43 @@
-import copy
+import functools
 from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
 from typing import Any
 
-from docx.shared import Mm
-from docxtpl import DocxTemplate, InlineImage
+from docxtpl import DocxTemplate
 
-from app.api_client.gotenberg_api_client import GotenbergApiClient
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
 from app.doc_generation.exception import (
     IncorrectProcessorState,
     InvalidTemplateException,
     MissingVariablesInTemplateException,
 )
 from app.doc_generation.processors.abstract_template import AbstractDocumentProcessor
+from app.doc_generation.processors.renderers import ImageContent, RenderTask, render_docx_document
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ImageItem:
     file_etag: str
     width: int
     height: int
     variable_name: str
-    file_content: BytesIO
+    file_content: bytes
 
 
 class DocxDocumentProcessor(AbstractDocumentProcessor):
     def __init__(
         self,
-        api_client: GotenbergApiClient,
+        conversion_backend: AbstractConversionBackend,
         sub_dir: Path,
-        template_file: BytesIO,
+        template_file: bytes,
         template_path: str,
         template_variables: dict[str, Any],
-        watermark_file: BytesIO | None = None,
+        watermark_file: bytes | None = None,
         images: list[ImageItem] | None = None,
     ):
         super().__init__(
-            api_client=api_client,
+            conversion_backend=conversion_backend,
             sub_dir=sub_dir,
             template_file=template_file,
             template_path=template_path,
@@ -47,7 +47,7 @@ class DocxDocumentProcessor(AbstractDocumentProcessor):
         self.images = images
 
     def validate(self) -> None:
-        doc = DocxTemplate(self.template_file)
+        doc = DocxTemplate(BytesIO(self.template_file))
 
         try:
             template_variables_from_doc = doc.get_undeclared_template_variables()
@@ -62,40 +62,29 @@ class DocxDocumentProcessor(AbstractDocumentProcessor):
         if set_difference:
             raise MissingVariablesInTemplateException(", ".join(set_difference), f"Template - {self.template_path}")
 
-    async def render_document(self) -> bool:
-        self._rendered_document = BytesIO()
-
-        doc = DocxTemplate(self.template_file)
-        variables = copy.deepcopy(self.template_variables)
-
-        if self.images:
-            images_variables = {
-                image.variable_name: (
-                    InlineImage(
-                        doc,
-                        image_descriptor=image.file_content,
-                        width=Mm(image.width),
-                        height=Mm(image.height),
-                    )
-                )
-                for image in self.images
-            }
-            variables |= images_variables
-
-        doc.render(variables, autoescape=True)
-        doc.save(self._rendered_document)
-
-        self._rendered_document.seek(0)
-
-        return True
+    def build_render_task(self) -> RenderTask:
+        images = [
+            ImageContent(
+                variable_name=image.variable_name,
+                file_content=image.file_content,
+                width=image.width,
+                height=image.height,
+            )
+            for image in self.images
+        ] if self.images else None
+
+        return functools.partial(
+            render_docx_document,
+            self.template_file,
+            self.template_variables,
+            images,
+        )
 
-    async def convert_document(self) -> bool:
+    async def convert_document(self) -> bytes | None:
         if self._rendered_document is None:
             raise IncorrectProcessorState("_rendered_document")
 
-        self._converted_document = await self.api_client.convert_docx_to_pdf(
-            self._rendered_document,
+        return await self.conversion_backend.convert_docx_to_pdf(
+            self._rendered_document.read_bytes(),
             self.template_path,
         )
-
-        return True
@@ -1,32 +1,68 @@
-from io import BytesIO
+import asyncio
+import functools
+import re
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, Template, meta, select_autoescape
+from jinja2 import Environment, meta, select_autoescape
 
-from app.api_client.gotenberg_api_client import GotenbergApiClient
+from app.config import settings
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
 from app.doc_generation.exception import (
     IncorrectProcessorState,
     InvalidTemplateException,
     MissingVariablesInTemplateException,
 )
 from app.doc_generation.processors.abstract_template import AbstractDocumentProcessor
+from app.doc_generation.processors.document_buffer import DocumentBuffer
+from app.doc_generation.processors.pdf_merger import PdfMerger
+from app.doc_generation.processors.pipeline import gather_or_cancel
+from app.doc_generation.processors.renderers import RenderTask, render_html_document
+
+BODY_START_PATTERN = re.compile("<body[^>]*>", re.IGNORECASE)
+BODY_END_PATTERN = re.compile(r"</body\s*>", re.IGNORECASE)
+
+# Chromium substitutes these classes in header/footer templates with numbers of the current chunk,
+# so documents with page numbering can't be split
+PAGE_NUMBERING_PATTERN = re.compile(rb"\b(pageNumber|totalPages)\b")
+
+
+def split_html_into_chunks(html_document: str, chunk_marker: str) -> list[str]:
+    """
+    Split body of html document at chunk markers. Every chunk is a standalone html document,
+    which keeps everything outside of body (styles, scripts) of the original one.
+    """
+
+    body_start = BODY_START_PATTERN.search(html_document)
+    body_end = BODY_END_PATTERN.search(html_document, body_start.end()) if body_start else None
+    if body_start is None or body_end is None:
+        return [html_document]
+
+    prefix = html_document[:body_start.end()]
+    suffix = html_document[body_end.start():]
+    body_parts = html_document[body_start.end():body_end.start()].split(chunk_marker)
+
+    return [
+        f"{prefix}{body_part}{suffix}"
+        for body_part in body_parts
+        if body_part.strip()
+    ]
 
 
 class HtmlDocumentProcessor(AbstractDocumentProcessor):
     def __init__(
         self,
-        api_client: GotenbergApiClient,
+        conversion_backend: AbstractConversionBackend,
         sub_dir: Path,
-        template_file: BytesIO,
+        template_file: bytes,
         template_path: str,
         template_variables: dict[str, Any],
-        watermark_file: BytesIO | None = None,
-        header_file: BytesIO | None = None,
-        footer_file: BytesIO | None = None,
+        watermark_file: bytes | None = None,
+        header_file: bytes | None = None,
+        footer_file: bytes | None = None,
     ):
         super().__init__(
-            api_client=api_client,
+            conversion_backend=conversion_backend,
             sub_dir=sub_dir,
             template_file=template_file,
             template_path=template_path,
@@ -38,7 +74,7 @@ class HtmlDocumentProcessor(AbstractDocumentProcessor):
         self._environment = Environment(autoescape=select_autoescape(["html"]))
 
     def validate(self) -> None:
-        file_content = str(self.template_file.getvalue())
+        file_content = str(self.template_file)
         parsed_content = self._environment.parse(file_content)
         try:
             template_variables = meta.find_undeclared_variables(parsed_content)
@@ -49,22 +85,56 @@ class HtmlDocumentProcessor(AbstractDocumentProcessor):
         if set_difference:
             raise MissingVariablesInTemplateException(", ".join(set_difference))
 
-    async def render_document(self) -> bool:
-        template = Template(self.template_file.getvalue().decode("utf-8"))
-        output = template.render(**self.template_variables)
-
-        self._rendered_document = BytesIO(bytes(output, "utf-8"))
-
-        return True
+    def build_render_task(self) -> RenderTask:
+        return functools.partial(render_html_document, self.template_file, self.template_variables)
 
-    async def convert_document(self) -> bool:
+    async def convert_document(self) -> bytes | None:
         if self._rendered_document is None:
             raise IncorrectProcessorState("_rendered_document")
 
-        self._converted_document = await self.api_client.convert_html_to_pdf(
-            self._rendered_document,
+        rendered_document = self._rendered_document.read_bytes()
+        chunks = self._split_rendered_document(rendered_document)
+        if len(chunks) > 1:
+            return await self._convert_chunks(chunks)
+
+        return await self.conversion_backend.convert_html_to_pdf(
+            rendered_document,
             self.header_file,
             self.footer_file,
         )
 
-        return True
+    def _split_rendered_document(self, rendered_document: bytes) -> list[str]:
+        if not settings.doc_gen.html_chunking_enabled:
+            return []
+
+        chunk_marker = settings.doc_gen.html_chunk_marker
+        if chunk_marker.encode() not in rendered_document:
+            return []
+
+        for page_file in (self.header_file, self.footer_file):
+            if page_file is not None and PAGE_NUMBERING_PATTERN.search(page_file):
+                self._logger.info(f"{self.template_path} isn't split, because header/footer contains page numbers")
+                return []
+
+        return split_html_into_chunks(rendered_document.decode("utf-8"), chunk_marker)
+
+    async def _convert_chunks(self, chunks: list[str]) -> bytes:
+        semaphore = asyncio.Semaphore(settings.doc_gen.html_max_concurrent_chunks)
+        merger = PdfMerger(len(chunks), self.sub_dir)
+
+        async def convert_chunk(chunk_number: int, chunk: str) -> None:
+            async with semaphore:
+                converted_chunk = await self.conversion_backend.convert_html_to_pdf(
+                    chunk.encode("utf-8"),
+                    self.header_file,
+                    self.footer_file,
+                )
+            await merger.add(chunk_number, DocumentBuffer(file_content=converted_chunk))
+
+        await gather_or_cancel(*[
+            convert_chunk(chunk_number, chunk)
+            for chunk_number, chunk in enumerate(chunks)
+        ])
+
+        converted_document = await merger.merge()
+        return converted_document.read_bytes()
@@ -0,0 +1,86 @@
+import asyncio
+from pathlib import Path
+
+import pypdftk
+
+from app.doc_generation.exception import IncorrectProcessorState
+from app.doc_generation.processors.document_buffer import DocumentBuffer
+from app.doc_generation.processors.pdf_utils import build_tmp_full_path
+
+
+class PdfMerger:
+    """
+    Ordered incremental merge of pdf documents which are produced concurrently.
+    As soon as the next documents in order are ready, they are appended to the merged file by pdftk in thread,
+    so merging overlaps with documents still in flight, event loop isn't blocked and merged document
+    isn't kept in memory of the worker. Documents, which are added while append is running,
+    are appended by the next step of the same append.
+    """
+
+    def __init__(self, documents_count: int, sub_dir: Path):
+        self.documents_count = documents_count
+        self.sub_dir = sub_dir
+
+        self._pending_documents: dict[int, DocumentBuffer] = {}
+        self._appended_count = 0
+        self._merged_path: Path | None = None
+        self._is_merged_path_owned = False
+        self._append_lock = asyncio.Lock()
+
+    @property
+    def appended_count(self) -> int:
+        return self._appended_count
+
+    async def add(self, document_number: int, document: DocumentBuffer) -> None:
+        self._pending_documents[document_number] = document
+        if self._append_lock.locked():
+            return
+
+        await self._append_ready_documents()
+
+    async def merge(self) -> DocumentBuffer:
+        # documents are left pending when append of their adder was cancelled
+        await self._append_ready_documents()
+        if self._merged_path is None or self._appended_count != self.documents_count:
+            raise IncorrectProcessorState(f"merged documents {self._appended_count}/{self.documents_count}")
+
+        return DocumentBuffer.from_path(self._merged_path)
+
+    async def _append_ready_documents(self) -> None:
+        async with self._append_lock:
+            ready_documents = self._pop_ready_documents()
+            while ready_documents:
+                await asyncio.to_thread(self._append_documents, ready_documents)
+                self._appended_count += len(ready_documents)
+                ready_documents = self._pop_ready_documents()
+
+    def _pop_ready_documents(self) -> list[DocumentBuffer]:
+        ready_documents: list[DocumentBuffer] = []
+        next_number = self._appended_count
+        while next_number in self._pending_documents:
+            ready_documents.append(self._pending_documents.pop(next_number))
+            next_number += 1
+
+        return ready_documents
+
+    def _append_documents(self, documents: list[DocumentBuffer]) -> None:
+        # spilled documents are already in files, in-memory documents are written once
+        document_paths = [
+            document.write_to(build_tmp_full_path(self.sub_dir, "document"))
+            for document in documents
+        ]
+        previous_path = self._merged_path
+        merged_paths = document_paths if previous_path is None else [previous_path, *document_paths]
+        if len(merged_paths) == 1:
+            # the first document is the merged one until the next documents are appended
+            self._merged_path = merged_paths[0]
+            return
+
+        merged_path = build_tmp_full_path(self.sub_dir, "merged")
+        pypdftk.concat(merged_paths, merged_path)
+        if previous_path is not None and self._is_merged_path_owned:
+            # previous merged file is replaced by the new one, so workspace quota isn't spent on every step
+            previous_path.unlink(missing_ok=True)
+
+        self._merged_path = merged_path
+        self._is_merged_path_owned = True
@@ -1,47 +1,67 @@
+import asyncio
 import functools
 import hashlib
+import os
 import uuid
-from io import BytesIO
 from pathlib import Path
+from typing import IO
 
 import pypdftk
 
-from app.config import settings
+from app.doc_generation.processors.document_buffer import DocumentBuffer
+
+DOCUMENT_HASH_SIZE = 32
+DOCUMENT_READ_CHUNK_SIZE = 1048576  # 1 MiB
 
 
 def build_tmp_full_path(sub_dir: Path, file_prefix: str) -> Path:
     return sub_dir / Path(f"{file_prefix}_{uuid.uuid4()}.pdf")
 
 
-@functools.lru_cache()
-def write_watermark(file_content: bytes):
+def write_watermark(file_content: bytes, sub_dir: Path) -> Path:
+    """Watermark is written once per workspace and is removed with it"""
+
     watermark_hash = hashlib.md5(file_content, usedforsecurity=False).hexdigest()
 
-    watermark_path = settings.doc_gen.tmp_dir_path / Path(f"watermark_{watermark_hash}.pdf")
+    watermark_path = sub_dir / Path(f"watermark_{watermark_hash}.pdf")
     if watermark_path.exists():
         return watermark_path
 
-    with open(watermark_path, mode="wb") as tmp_file:
-        tmp_file.write(file_content)
+    # documents of the request are processed concurrently, so watermark is published by atomic rename
+    tmp_watermark_path = build_tmp_full_path(sub_dir, "watermark")
+    tmp_watermark_path.write_bytes(file_content)
+    os.replace(tmp_watermark_path, watermark_path)
 
     return watermark_path
 
 
-async def merge_pdf_documents(
-    documents: list[tuple[BytesIO, Path | None]],
-    sub_dir: Path
-) -> BytesIO:
-    document_paths: list[Path] = []
-    for document, document_path in documents:
-        if document_path is None:
-            document_path = build_tmp_full_path(sub_dir, "document_with_watermark")  # noqa: WPS440
+def generate_document_hash(document: IO[bytes]) -> str:
+    """Document is hashed by chunks, so spilled document isn't loaded in memory. Stream is rewound after hashing"""
+
+    document_hash = hashlib.blake2b(digest_size=DOCUMENT_HASH_SIZE)
+    for document_chunk in iter(functools.partial(document.read, DOCUMENT_READ_CHUNK_SIZE), b""):
+        document_hash.update(document_chunk)
+
+    document.seek(0)
+    return document_hash.hexdigest()
+
+
+async def apply_watermark_to_document(
+    document: DocumentBuffer,
+    watermark_content: bytes,
+    sub_dir: Path,
+) -> DocumentBuffer:
+    """Spilled document is stamped in place of its file, in-memory one is written once. File I/O is done in thread"""
 
-        with open(document_path, mode="wb") as document_tmp_file:
-            document_tmp_file.write(document.read())
-        document_paths.append(document_path)
+    document_with_watermark_path = await asyncio.to_thread(_stamp_document, document, watermark_content, sub_dir)
+    return DocumentBuffer.from_path(document_with_watermark_path)
 
-    merged_path = build_tmp_full_path(sub_dir, "merged")
-    pypdftk.concat(document_paths, merged_path)
 
-    with open(merged_path, mode="rb") as merged_tmp_file:
-        return BytesIO(merged_tmp_file.read())
+def _stamp_document(document: DocumentBuffer, watermark_content: bytes, sub_dir: Path) -> Path:
+    document_with_watermark_path = build_tmp_full_path(sub_dir, "document_with_watermark")
+    pypdftk.stamp(
+        document.write_to(build_tmp_full_path(sub_dir, "document")),
+        write_watermark(watermark_content, sub_dir),
+        document_with_watermark_path,
+    )
+    return document_with_watermark_path
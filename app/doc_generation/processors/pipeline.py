@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import Executor
+from types import TracebackType
+from typing import Awaitable, TypeVar
+
+from app.doc_generation.backends.abstract_backend import AbstractConversionBackend
+from app.doc_generation.index_writer import DocumentIndexWriter
+from app.doc_generation.processors.document_buffer import MemoryBudget
+from app.doc_generation.processors.renderers import RenderTask
+
+AwaitableResult = TypeVar("AwaitableResult")
+
+
+async def gather_or_cancel(*awaitables: Awaitable[AwaitableResult]) -> list[AwaitableResult]:
+    """
+    Same as `asyncio.gather`, but the rest of awaitables are cancelled and awaited when one of them fails,
+    so nothing is left writing to workspace, which is removed on the failure.
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except (Exception, asyncio.CancelledError):
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class PipelineStage:
+    """
+    Stage of document generation with its own worker budget. Documents, which don't fit in the budget,
+    wait for a free slot, so one stage can't overrun the next one (e.g. Gotenberg) or starve the event loop.
+    """
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> None:
+        await self._semaphore.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._semaphore.release()
+
+
+class GenerationPipeline:
+    """
+    Document generation is split in stages: render (CPU), convert (network), post-process (pdftk subprocesses),
+    upload (network) and writing to Documents index (network, can be done in background).
+    Budgets (including memory budget of intermediate documents) are shared by all requests of the application instance.
+    """
+
+    def __init__(
+        self,
+        conversion_backend: AbstractConversionBackend,
+        memory_budget: MemoryBudget,
+        index_writer: DocumentIndexWriter,
+        render_concurrency: int,
+        convert_concurrency: int,
+        post_process_concurrency: int,
+        upload_concurrency: int,
+        render_executor: Executor | None = None,
+    ):
+        self.conversion_backend = conversion_backend
+        self.memory_budget = memory_budget
+        self.index_writer = index_writer
+        self.render_executor = render_executor
+
+        self.render = PipelineStage("render", render_concurrency)
+        self.convert = PipelineStage("convert", convert_concurrency)
+        self.post_process = PipelineStage("post_process", post_process_concurrency)
+        self.upload = PipelineStage("upload", upload_concurrency)
+
+    async def run_render_task(self, render_task: RenderTask) -> bytes | None:
+        """Render task is run in default thread pool or in `render_executor` (process pool) if it's configured"""
+
+        if self.render_executor is None:
+            return await asyncio.to_thread(render_task)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.render_executor, render_task)
@@ -0,0 +1,133 @@
+"""
+Render functions of document processors. Functions are pure (bytes and variables in, rendered bytes out),
+so they can be executed in worker threads as well as in worker processes.
+"""
+import copy
+import functools
+import html
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+import pypdftk
+from docx.shared import Mm
+from docxtpl import DocxTemplate, InlineImage
+from jinja2 import Template
+from pypdf import PdfReader
+
+from app.doc_generation.processors.pdf_utils import build_tmp_full_path
+
+# rendered document or None when there is nothing to render
+RenderTask = Callable[[], Optional[bytes]]
+
+COMPILED_TEMPLATES_CACHE_SIZE = 64
+
+
+class ImageContent(NamedTuple):
+    variable_name: str
+    file_content: bytes
+    width: int
+    height: int
+
+
+@functools.lru_cache(maxsize=COMPILED_TEMPLATES_CACHE_SIZE)
+def compile_html_template(template_content: bytes) -> Template:
+    return Template(template_content.decode("utf-8"))
+
+
+def render_html_document(template_content: bytes, template_variables: dict[str, Any]) -> bytes:
+    template = compile_html_template(template_content)
+    return template.render(**template_variables).encode("utf-8")
+
+
+def render_docx_document(
+    template_content: bytes,
+    template_variables: dict[str, Any],
+    images: list[ImageContent] | None = None,
+) -> bytes:
+    doc = DocxTemplate(BytesIO(template_content))
+    variables = copy.deepcopy(template_variables)
+
+    if images:
+        images_variables = {
+            image.variable_name: (
+                InlineImage(
+                    doc,
+                    image_descriptor=BytesIO(image.file_content),
+                    width=Mm(image.width),
+                    height=Mm(image.height),
+                )
+            )
+            for image in images
+        }
+        variables |= images_variables
+
+    doc.render(variables, autoescape=True)
+
+    rendered_document = BytesIO()
+    doc.save(rendered_document)
+
+    return rendered_document.getvalue()
+
+
+def fill_pdf_form(template_content: bytes, template_variables: dict[str, Any], sub_dir: str) -> bytes | None:
+    pdf_fields = PdfReader(BytesIO(template_content)).get_fields()
+    if not pdf_fields:
+        return None
+
+    form_path = build_tmp_full_path(Path(sub_dir), "form")
+    form_path.write_bytes(template_content)
+
+    escaped_variables = {
+        tmpl_key: html.escape(tmpl_value) if isinstance(tmpl_value, str) else tmpl_value
+        for tmpl_key, tmpl_value in patch_checkbox_variables(template_variables).items()
+    }
+
+    rendered_document_path = build_tmp_full_path(Path(sub_dir), "rendered_document")
+    pypdftk.fill_form(form_path, datas=escaped_variables, out_file=rendered_document_path, flatten=True)
+
+    return rendered_document_path.read_bytes()
+
+
+def patch_checkbox_variables(template_variables: dict[str, Any]) -> dict[str, Any]:
+    """
+    This function is temporary fix for checkboxes
+    https://github.com/CoverWhale/prime-doc-mgmt-k8s/issues/186
+    Core app sends real checkbox value with `entity_type_` prefix (original field name) and `_x` suffix
+    """
+
+    patched_variables = dict(template_variables)
+    for field_name, field_value in template_variables.items():
+        if not field_name.endswith("_x"):
+            continue
+        origin_field_name = field_name[:-2]
+        if origin_field_name not in template_variables:
+            continue
+        patched_variables[origin_field_name] = field_value
+
+    return patched_variables
+
+
+def warm_up_render_worker() -> None:
+    """Initializer of render worker process: heavy modules are imported and Jinja environment is warmed up"""
+
+    render_html_document(b"{{ value }}", {"value": ""})
+
+
+def create_render_process_pool(pool_size: int | None) -> ProcessPoolExecutor:
+    max_workers = pool_size or os.cpu_count() or 1
+
+    # "spawn" start method is used, because forking of the process with running event loop and threads isn't safe
+    process_pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_up_render_worker,
+    )
+
+    # workers are started lazily, so they're started and warmed up before the first request
+    wait([process_pool.submit(warm_up_render_worker) for _ in range(max_workers)])
+
+    return process_pool
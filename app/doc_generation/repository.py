@@ -1,5 +1,8 @@
+import time
 from typing import Type
 
+from botocore.exceptions import ClientError
+
 from app.base.repository import DynamoDBBaseRepository
 from app.doc_generation.models.document import (
     DocumentDeleteItem,
@@ -26,6 +29,8 @@ class DocumentRepository(
         'bucket' - name of bucket where template is exists
         'etags' - list of etags of templates
         'result' - path to result document
+
+    Lease items (e.g. of background reconciler) are stored in the same table, they aren't parsed as documents.
     """
 
     @property
@@ -47,3 +52,29 @@ class DocumentRepository(
     @property
     def update_model(self) -> Type[DocumentUpdateItem]:
         return DocumentUpdateItem
+
+    async def acquire_lease(self, lease_id: str, duration_in_seconds: float) -> bool:
+        """
+        Lease is taken by conditional put, when it doesn't exist or is expired,
+        so only one worker of all pods gets it. Expired lease is removed by TTL of the table.
+        """
+        now = time.time()
+        expiration_time = now + duration_in_seconds
+        try:
+            await self._dynamodb_client.put_item(
+                TableName=self._table_name,
+                Item={
+                    "id": {"S": lease_id},
+                    "lease_expiration_time": {"N": str(expiration_time)},
+                    "expiration_time": {"N": str(int(expiration_time))},
+                },
+                ConditionExpression="attribute_not_exists(#n_id) OR #n_lease_expiration_time < :v_now",
+                ExpressionAttributeNames={"#n_id": "id", "#n_lease_expiration_time": "lease_expiration_time"},
+                ExpressionAttributeValues={":v_now": {"N": str(now)}},
+            )
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+
+        return True
@@ -1,2 +1,4 @@
 from app.doc_generation.services.convertor import FileConvertorService
+from app.doc_generation.services.reconciler import DocumentIndexReconciler
 from app.doc_generation.services.registry import FileRegistryService
+from app.doc_generation.services.workspace import WorkspaceManager
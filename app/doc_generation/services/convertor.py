@@ -1,22 +1,21 @@
 import asyncio
 import logging
-import os
-import shutil
 import time
 from dataclasses import dataclass
-from io import BytesIO
 from operator import attrgetter
 from pathlib import Path
-from typing import Sequence, cast
+from typing import IO, Callable, Sequence, cast
 from uuid import uuid4
 
-from app.api_client.gotenberg_api_client import GotenbergApiClient
+from app.config import settings
 from app.doc_generation.enum import TemplateTypeEnum
 from app.doc_generation.exception import (
     FolderAccessForbiddenException,
     UnsupportedTemplateExtensionException,
 )
 from app.doc_generation.models import (
+    DocumentDeleteItem,
+    DocumentItemModel,
     DocumentPutItem,
     DocumentSearchItem,
     TemplateModel,
@@ -27,22 +26,30 @@ from app.doc_generation.processors import (
     DocxDocumentProcessor,
     HtmlDocumentProcessor,
     PdfDocumentProcessor,
+    PdfMerger,
+    gather_or_cancel,
 )
+from app.doc_generation.processors.document_buffer import DocumentBuffer
 from app.doc_generation.processors.docx_template import ImageItem
-from app.doc_generation.processors.pdf_utils import merge_pdf_documents
+from app.doc_generation.processors.pdf_utils import (
+    apply_watermark_to_document,
+    build_tmp_full_path,
+    generate_document_hash,
+)
+from app.doc_generation.processors.pipeline import GenerationPipeline
 from app.doc_generation.repository import DocumentRepository
 from app.doc_generation.schema import DocGenMergeRequest, DocGenMultipleItem, DocGenSingleRequest
 from app.doc_generation.services.registry import FileRegistryService
+from app.doc_generation.services.workspace import WorkspaceManager
 from app.file_storage.service import FileStorageService
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DocGenMultipleResultItem:
     input_template_path: str
     document_path: str
     order_number: int
-    document_content: BytesIO | None
-    document_content_path: Path | None
+    document_content: DocumentBuffer | None
 
 
 class FileConvertorService:
@@ -51,31 +58,30 @@ class FileConvertorService:
 
     def __init__(
         self,
-        api_client: GotenbergApiClient,
+        pipeline: GenerationPipeline,
         file_storage: FileStorageService,
         file_registry: FileRegistryService,
         document_repository: DocumentRepository,
         main_bucket_name: str,
         app_version: str,
         expiration_date_in_seconds: int,
-        tmp_dir_path: Path,
+        workspace_manager: WorkspaceManager,
     ) -> None:
-        self.api_client = api_client
+        self.pipeline = pipeline
         self.file_storage = file_storage
         self.file_registry = file_registry
         self.document_repository = document_repository
         self.main_bucket_name = main_bucket_name
         self.app_version = app_version
         self.expiration_date_in_seconds = expiration_date_in_seconds
-        self.tmp_dir_path = tmp_dir_path
+        self.workspace_manager = workspace_manager
 
         self._logger = logging.getLogger(self.__class__.__name__)
 
     async def generate_documents(self, input_request: list[DocGenSingleRequest]) -> list[DocGenMultipleItem]:
-        sub_dir = self._make_sub_dir()
-        document_items = await self._generate_documents(input_request, sub_dir)
+        async with self.workspace_manager.workspace() as sub_dir:
+            document_items = await self._generate_documents(input_request, sub_dir)
 
-        shutil.rmtree(sub_dir)
         return [
             DocGenMultipleItem(
                 input_template_path=doc_item.input_template_path,
@@ -85,59 +91,72 @@ class FileConvertorService:
         ]
 
     async def generate_documents_and_merge_it(self, input_request: list[DocGenSingleRequest]) -> str:
-        sub_dir = self._make_sub_dir()
-        document_items = await self._generate_documents(input_request, sub_dir)
-
-        result_document = await merge_pdf_documents(
-            [
-                (doc_item.document_content, doc_item.document_content_path)
-                for doc_item in document_items
-                if doc_item.document_content
-            ],
-            sub_dir,
-        )
+        async with self.workspace_manager.workspace() as sub_dir:
+            document_items = await self._generate_documents(input_request, sub_dir)
+
+            documents = [doc_item.document_content for doc_item in document_items if doc_item.document_content]
+            merger = PdfMerger(len(documents), sub_dir)
+            # documents are added together, so they are appended by one step instead of one by one
+            await gather_or_cancel(*[
+                merger.add(document_number, document)
+                for document_number, document in enumerate(documents)
+            ])
 
-        shutil.rmtree(sub_dir)
-        return str(await self._save_document(result_document))
+            document_path = await self._save_document_buffer(await merger.merge())
+
+        return str(document_path)
 
     async def generate_and_merge_documents(self, input_request: DocGenMergeRequest) -> str:
-        sub_dir = self._make_sub_dir()
         template_models = await self._create_template_models(input_request.template_models)
 
         etags = [template_model.file_etag for template_model in template_models]
-        hashed_image_models = None
-        for template_model in template_models:
-            if template_model.images:
+        watermark_etag = template_models[0].watermark_etag if template_models else None
+        image_models = next(
+            (template_model.images for template_model in template_models if template_model.images),
+            None,
+        )
+
+        def generate_hash(is_legacy: bool = False) -> str:
+            hashed_image_models = None
+            if image_models:
                 hashed_image_models = [
-                    image_model.hashed_image_model
-                    for image_model in template_model.images
+                    image_model.generate_legacy_hash() if is_legacy else image_model.hashed_image_model
+                    for image_model in image_models
                 ]
-                break
 
-        hashed_templates = generate_hash_from_templates(
+            return generate_hash_from_templates(
+                etags,
+                input_request.bucket_name,
+                input_request.template_variables,
+                watermark_etag,
+                hashed_image_models,
+                is_legacy=is_legacy,
+            )
+
+        hashed_templates = generate_hash()
+        founded_document = await self._get_result_document(
             etags,
             input_request.bucket_name,
-            input_request.template_variables,
-            template_models[0].watermark_etag if template_models else None,
-            hashed_image_models,
+            hashed_templates,
+            lambda: generate_hash(is_legacy=True),
         )
+        if founded_document:
+            return founded_document.result_file
+
+        # all components share the same watermark, so merged document is stamped once instead of every component
+        async with self.workspace_manager.workspace() as sub_dir:
+            merged_document = await self._process_and_merge_documents(
+                template_models,
+                sub_dir,
+                is_watermark_applied=watermark_etag is None,
+            )
+            if watermark_etag:
+                watermark_file_content = await self.file_registry.get_file_content(watermark_etag)
+                merged_document = await apply_watermark_to_document(merged_document, watermark_file_content, sub_dir)
 
-        founded_document_path = await self._get_result_file_path(etags, input_request.bucket_name, hashed_templates)
-        if founded_document_path:
-            return founded_document_path
-
-        finished_processors = await self._create_processors(template_models, sub_dir)
-
-        result_document = await merge_pdf_documents(
-            [
-                (processor.document_content, processor.document_content_path)
-                for processor in finished_processors
-            ],
-            sub_dir,
-        )
+            document_path = str(await self._save_document_buffer(merged_document))
 
-        document_path = str(await self._save_document(result_document))
-        await self.document_repository.put_item(
+        await self.pipeline.index_writer.put_item(
             DocumentPutItem(
                 etags=etags,
                 bucket=input_request.bucket_name,
@@ -148,7 +167,6 @@ class FileConvertorService:
             )
         )
 
-        shutil.rmtree(sub_dir)
         return document_path
 
     async def _generate_documents(
@@ -158,80 +176,59 @@ class FileConvertorService:
     ) -> list[DocGenMultipleResultItem]:
         template_models = await self._create_template_models(input_request)
 
-        for index_number, tmpl_model in enumerate(template_models):
-            tmpl_model.order = index_number
-
-        founded_document_paths = cast(
-            list[str],
-            await asyncio.gather(*[
-                self._get_result_file_path(
-                    [template_model.file_etag],
-                    template_model.bucket,
-                    template_model.hashed_template,
-                )
-                for template_model in template_models
-            ])
-        )
-
-        document_items: list[DocGenMultipleResultItem] = []
-        models_for_generating: list[TemplateModel] = []
-
-        for template_index, document_path in enumerate(founded_document_paths):
-            model = template_models[template_index]
-            if document_path is None:
-                models_for_generating.append(model)
-                continue
-
-            document_items.append(
-                DocGenMultipleResultItem(
-                    input_template_path=str(model.template_path),
-                    document_path=str(document_path),
-                    order_number=int(model.order),
-                    document_content=None,
-                    document_content_path=None,
-                )
+        founded_documents = await asyncio.gather(*[
+            self._get_result_document(
+                [template_model.file_etag],
+                template_model.bucket,
+                template_model.hashed_template,
+                template_model.generate_legacy_hash,
+                is_downloaded=True,
             )
-
-        file_contents = await asyncio.gather(*[
-            self.file_storage.download_file(self.main_bucket_name, doc_item.document_path)
-            for doc_item in document_items
+            for template_model in template_models
         ])
-        for file_content, doc_item in zip(file_contents, document_items):
-            doc_item.document_content = file_content
+
+        cached_documents = [
+            (template_model, document)
+            for template_model, document in zip(template_models, founded_documents)
+            if document is not None
+        ]
+        document_items, stale_models = await self._download_cached_documents(cached_documents, sub_dir)
+        models_for_generating = [
+            template_model
+            for template_model, document in zip(template_models, founded_documents)
+            if document is None
+        ] + stale_models
 
         if not models_for_generating:
             return document_items
 
-        finished_processors = await self._create_processors(template_models, sub_dir)
-        document_paths = await asyncio.gather(*[
-            self._save_document(processor.document_content)
+        finished_processors = await self._create_processors(models_for_generating, sub_dir)
+        document_paths = await gather_or_cancel(*[
+            self._save_document_buffer(processor.document_buffer)
             for processor in finished_processors
         ])
 
-        putting_item_tasks = []
+        put_item_models = []
         for template, doc_path, processor in zip(models_for_generating, document_paths, finished_processors):
             document_items.append(
                 DocGenMultipleResultItem(
                     input_template_path=str(template.template_path),
                     document_path=str(doc_path),
                     order_number=int(template.order),
-                    document_content=processor.document_content,
-                    document_content_path=processor.document_content_path
+                    document_content=processor.document_buffer,
                 )
             )
-            putting_item_tasks.append(
-                self.document_repository.put_item(
-                    DocumentPutItem(
-                        etags=[template.file_etag],
-                        bucket=template.bucket,
-                        hashed_request=template.hashed_template,
-                        result_file=str(doc_path),
-                        app_version=self.app_version,
-                        expiration_time=(int(time.time()) + int(self.expiration_date_in_seconds / 2)),
-                    )
+            put_item_models.append(
+                DocumentPutItem(
+                    etags=[template.file_etag],
+                    bucket=template.bucket,
+                    hashed_request=template.hashed_template,
+                    result_file=str(doc_path),
+                    app_version=self.app_version,
+                    expiration_time=(int(time.time()) + int(self.expiration_date_in_seconds / 2)),
                 )
             )
-        await asyncio.gather(*putting_item_tasks)
+        await self.pipeline.index_writer.put_items(put_item_models)
         document_items.sort(key=attrgetter("order_number"))
 
         return document_items
@@ -241,13 +238,18 @@ class FileConvertorService:
             self._logger.info(f"Template #{number_template} {template.json()}")
 
         register_models_tasks = [
-            self.file_registry.register_template_model(single_request)
-            for single_request in input_request
+            self.file_registry.register_template_model(single_request, order)
+            for order, single_request in enumerate(input_request)
         ]
         template_models = await asyncio.gather(*register_models_tasks)
         return cast(list[TemplateModel], template_models)
 
-    async def _create_processor(self, template_model: TemplateModel, sub_dir: Path) -> AbstractDocumentProcessor:
+    async def _create_processor(
+        self,
+        template_model: TemplateModel,
+        sub_dir: Path,
+        is_watermark_applied: bool = True,
+    ) -> AbstractDocumentProcessor:
         is_relative_to_templates_folder = Path(template_model.template_path).is_relative_to(self.templates_path)
         if template_model.bucket == self.main_bucket_name and not is_relative_to_templates_folder:
             raise FolderAccessForbiddenException(template_model.template_path)
@@ -255,13 +257,13 @@ class FileConvertorService:
         template_file_content = await self.file_registry.get_file_content(template_model.file_etag)
         watermark_file_content = (
             await self.file_registry.get_file_content(template_model.watermark_etag)
-            if template_model.watermark_etag else None
+            if template_model.watermark_etag and is_watermark_applied else None
         )
 
         if template_model.template_path_suffix == TemplateTypeEnum.docx.value:
             images = await self._get_images(template_model)
             return DocxDocumentProcessor(
-                api_client=self.api_client,
+                conversion_backend=self.pipeline.conversion_backend,
                 sub_dir=sub_dir,
                 template_file=template_file_content,
                 template_path=template_model.template_path,
@@ -271,7 +273,7 @@ class FileConvertorService:
             )
         elif template_model.template_path_suffix == TemplateTypeEnum.pdf.value:
             return PdfDocumentProcessor(
-                api_client=self.api_client,
+                conversion_backend=self.pipeline.conversion_backend,
                 sub_dir=sub_dir,
                 template_file=template_file_content,
                 template_path=template_model.template_path,
@@ -282,7 +284,7 @@ class FileConvertorService:
             file_contents = await self._get_headers_and_footers(template_model)
 
             return HtmlDocumentProcessor(
-                api_client=self.api_client,
+                conversion_backend=self.pipeline.conversion_backend,
                 sub_dir=sub_dir,
                 template_file=template_file_content,
                 template_path=template_model.template_path,
@@ -331,54 +333,152 @@ class FileConvertorService:
             for file_content, image_model in zip(file_contents, template_model.images)
         ]
 
-    async def _get_result_file_path(
+    async def _get_result_document(
         self,
         etags: list[str],
         bucket_name: str,
         hashed_request: str,
-    ) -> str | None:
-        document = await self.document_repository.search_item(
-            DocumentSearchItem(
-                etags=etags,
-                bucket=bucket_name,
-                hashed_request=hashed_request,
-                app_version=self.app_version,
-            )
+        generate_legacy_hash: Callable[[], str] | None = None,
+        is_downloaded: bool = False,
+    ) -> DocumentItemModel | None:
+        """
+        Key of found document, which is returned to the client without downloading, is always checked in storage.
+        Downloaded documents are checked by the download itself, when the index is trusted.
+        """
+        legacy_hashed_request = None
+        if generate_legacy_hash and settings.doc_gen.legacy_request_hash_lookup_enabled:
+            # documents, which were saved before hash format change, are valid until their expiration
+            legacy_hashed_request = generate_legacy_hash()
+
+        search_item = DocumentSearchItem(
+            etags=etags,
+            bucket=bucket_name,
+            hashed_request=hashed_request,
+            app_version=self.app_version,
+            legacy_hashed_request=legacy_hashed_request,
         )
+        document = await self.document_repository.search_item(search_item)
 
-        if document and await self.file_storage.is_object_exists(document.bucket, document.result_file):
-            return document.result_file
+        if document is None or (is_downloaded and settings.doc_gen.trust_document_index):
+            # trusted index is verified by background reconciler and missing object is regenerated after download
+            return document
+
+        if await self.file_storage.is_object_exists(document.bucket, document.result_file):
+            return document
 
         return None
 
-    async def _save_document(self, document: BytesIO) -> Path:
+    async def _download_cached_documents(
+        self,
+        cached_documents: list[tuple[TemplateModel, DocumentItemModel]],
+        sub_dir: Path,
+    ) -> tuple[list[DocGenMultipleResultItem], list[TemplateModel]]:
+        """Download found documents. Models of documents, which don't exist anymore, are returned for generating"""
+
+        async def download_document(result_file: str) -> DocumentBuffer | None:
+            object_stream = await self.file_storage.download_stream(self.main_bucket_name, result_file)
+            if object_stream is None:
+                return None
+
+            # big documents are streamed to the spill file instead of being read in memory
+            return await self.pipeline.memory_budget.create_buffer_from_stream(
+                object_stream,
+                build_tmp_full_path(sub_dir, "document"),
+            )
+
+        document_buffers = await gather_or_cancel(*[
+            download_document(document.result_file)
+            for _, document in cached_documents
+        ])
+
+        document_items: list[DocGenMultipleResultItem] = []
+        stale_models: list[TemplateModel] = []
+        for (template_model, document), document_buffer in zip(cached_documents, document_buffers):
+            if document_buffer is None:
+                # trusted index can point to object which is deleted out-of-band, so row is evicted
+                self._logger.warning(f"Document {document.result_file} isn't found, it'll be generated again")
+                if document.item_id:
+                    await self.document_repository.delete_item(DocumentDeleteItem(item_id=document.item_id))
+                stale_models.append(template_model)
+                continue
+
+            document_items.append(
+                DocGenMultipleResultItem(
+                    input_template_path=str(template_model.template_path),
+                    document_path=document.result_file,
+                    order_number=int(template_model.order),
+                    document_content=document_buffer,
+                )
+            )
+
+        return document_items, stale_models
+
+    async def _save_document(self, document: IO[bytes]) -> Path:
         random_name = str(uuid4())
         file_path = self.documents_path / f"{random_name}.pdf"
-        await self.file_storage.upload_file(self.main_bucket_name, str(file_path), document)
+        if settings.doc_gen.content_addressed_storage_enabled:
+            # identical documents are stored once, so key is derived from content and existing object isn't uploaded
+            document_hash = await asyncio.to_thread(generate_document_hash, document)
+            file_path = self.documents_path / f"{document_hash}.pdf"
+            if await self.file_storage.is_object_exists(self.main_bucket_name, str(file_path)):
+                return file_path
+
+        async with self.pipeline.upload:
+            await self.file_storage.upload_file(self.main_bucket_name, str(file_path), document)
         return file_path
 
+    async def _save_document_buffer(self, document_buffer: DocumentBuffer) -> Path:
+        # spilled document is uploaded via mmap, so it isn't loaded in memory
+        with document_buffer.open() as document:
+            return await self._save_document(document)
+
     async def _create_processors(
         self,
         template_models: Sequence[TemplateModel],
         sub_dir: Path,
+    ) -> list[AbstractDocumentProcessor]:
+        processors = await self._create_valid_processors(template_models, sub_dir)
+
+        document_tasks = [
+            valid_processor.process_document(self.pipeline)
+            for valid_processor in processors
+        ]
+        finished_processors = await gather_or_cancel(*document_tasks)
+        return cast(list[AbstractDocumentProcessor], finished_processors)
+
+    async def _process_and_merge_documents(
+        self,
+        template_models: Sequence[TemplateModel],
+        sub_dir: Path,
+        is_watermark_applied: bool = True,
+    ) -> DocumentBuffer:
+        processors = await self._create_valid_processors(template_models, sub_dir, is_watermark_applied)
+        merger = PdfMerger(len(processors), sub_dir)
+
+        async def process_document(document_number: int, processor: AbstractDocumentProcessor) -> None:
+            await processor.process_document(self.pipeline)
+            await merger.add(document_number, processor.document_buffer)
+
+        await gather_or_cancel(*[
+            process_document(document_number, processor)
+            for document_number, processor in enumerate(processors)
+        ])
+
+        return await merger.merge()
+
+    async def _create_valid_processors(
+        self,
+        template_models: Sequence[TemplateModel],
+        sub_dir: Path,
+        is_watermark_applied: bool = True,
     ) -> list[AbstractDocumentProcessor]:
         create_processor_tasks = [
-            self._create_processor(template_model, sub_dir)
+            self._create_processor(template_model, sub_dir, is_watermark_applied)
             for template_model in template_models
         ]
 
-        processors = cast(list[AbstractDocumentProcessor], await asyncio.gather(*create_processor_tasks))
+        processors = cast(list[AbstractDocumentProcessor], await gather_or_cancel(*create_processor_tasks))
         for processor in processors:
             processor.validate()
 
-        document_tasks = [
-            valid_processor.process_document()
-            for valid_processor in processors
-        ]
-        finished_processors = await asyncio.gather(*document_tasks)
-        return cast(list[AbstractDocumentProcessor], finished_processors)
-
-    def _make_sub_dir(self) -> Path:
-        sub_dir = self.tmp_dir_path / str(uuid4())
-        os.mkdir(sub_dir)
-        return sub_dir
+        return processors
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from contextlib import suppress
+
+from app.doc_generation.models.document import DocumentDeleteItem, DocumentItemModel
+from app.doc_generation.repository import DocumentRepository
+from app.file_storage.service import FileStorageService
+
+
+class DocumentIndexReconciler:
+    """
+    Background verification of Documents index. Rows, which point to objects deleted out-of-band, are evicted,
+    so the request path can trust the index instead of checking object existence on every cache hit.
+    Reconciliation is run by one worker per interval, which holds the lease item in Documents table.
+    """
+
+    index_fields = ["id", "bucket", "result"]
+    lease_id = "document-index-reconciler-lease"
+    max_concurrent_requests = 16
+
+    def __init__(
+        self,
+        document_repository: DocumentRepository,
+        file_storage: FileStorageService,
+        bucket_name: str,
+        documents_prefix: str,
+        interval_in_seconds: float,
+    ):
+        self.document_repository = document_repository
+        self.file_storage = file_storage
+        self.bucket_name = bucket_name
+        self.documents_prefix = documents_prefix
+        self.interval_in_seconds = interval_in_seconds
+
+        self._reconciler_task: asyncio.Task | None = None
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def start(self) -> None:
+        if self._reconciler_task is None:
+            self._reconciler_task = asyncio.create_task(self._run_reconciler())
+
+    async def close(self) -> None:
+        if self._reconciler_task is None:
+            return
+
+        self._reconciler_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._reconciler_task
+
+        self._reconciler_task = None
+
+    async def reconcile(self) -> int:
+        # only object keys are kept in memory, the index is scanned and evicted page by page against them
+        object_keys = {
+            object_key
+            async for object_key in self.file_storage.iterate_object_keys(self.bucket_name, self.documents_prefix)
+        }
+        evicted_counts = [
+            await self._evict_stale_documents(documents_page, object_keys)
+            async for documents_page in self.document_repository.iterate_item_pages(self.index_fields)
+        ]
+
+        return sum(evicted_counts)
+
+    async def _evict_stale_documents(self, documents: list[DocumentItemModel], object_keys: set[str]) -> int:
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def evict_if_stale(document: DocumentItemModel) -> bool:
+            async with semaphore:
+                # object could be stored after it was listed, so it's checked again before the row is evicted
+                if await self.file_storage.is_object_exists(self.bucket_name, document.result_file):
+                    return False
+
+                await self.document_repository.delete_item(DocumentDeleteItem(item_id=document.item_id))
+                return True
+
+        unlisted_documents = [
+            document
+            for document in documents
+            if document.item_id is not None and document.result_file not in object_keys
+        ]
+        evicted_flags = await asyncio.gather(*[evict_if_stale(document) for document in unlisted_documents])
+
+        return sum(evicted_flags)
+
+    async def _run_reconciler(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_in_seconds)
+
+            try:
+                evicted_count = await self._reconcile_by_lease_holder()
+            except Exception as exc:
+                # trusted index relies on the reconciler, so it mustn't be stopped by any failure
+                self._logger.error(f"Documents index reconciliation failed: {exc!r}")
+                continue
+
+            if evicted_count:
+                self._logger.info(f"{evicted_count} stale rows are evicted from Documents index")
+
+    async def _reconcile_by_lease_holder(self) -> int:
+        # every worker of every pod runs the reconciler, but only the lease holder reconciles per interval
+        if not await self.document_repository.acquire_lease(self.lease_id, self.interval_in_seconds):
+            return 0
+
+        return await self.reconcile()
@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from io import BytesIO
+from typing import cast
 
 from aiocache import Cache
 
@@ -22,7 +22,7 @@ class FileRegistryService:
         self._cache = Cache(Cache.MEMORY)
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    async def register_template_model(self, request_model: DocGenSingleRequest) -> TemplateModel:
+    async def register_template_model(self, request_model: DocGenSingleRequest, order: int = -1) -> TemplateModel:
         bucket = request_model.bucket_name
 
         file_etag, header_etag, footer_etag, watermark_etag = await asyncio.gather(
@@ -38,7 +38,7 @@ class FileRegistryService:
                 self._register_file(bucket, image_model.image_path)
                 for image_model in request_model.images
             ])
-            image_models = [
+            image_models = tuple(
                 ImageTemplateModel(
                     file_etag=etag,
                     width=image.width,
@@ -46,26 +46,30 @@ class FileRegistryService:
                     variable_name=image.variable_name,
                 )
                 for etag, image in zip(images_etags, request_model.images)
-            ]
+            )
 
         return TemplateModel(
             variables=request_model.template_variables,
             template_path=request_model.template_path,
             bucket=bucket,
-            file_etag=file_etag,
+            order=order,
+            # template path is required, so template always has etag
+            file_etag=cast(str, file_etag),
             header_etag=header_etag,
             footer_etag=footer_etag,
             watermark_etag=watermark_etag,
             images=image_models
         )
 
-    async def get_file_content(self, key: str) -> BytesIO:
+    async def get_file_content(self, key: str) -> bytes:
+        """Cached content is immutable bytes, so it's shared by all processors without copying"""
+
         file_content = await self._cache.get(key)
 
         if file_content is None:
             raise FileContentDoesntExistInRegistryException()
 
-        return BytesIO(file_content)
+        return file_content
 
     async def _register_file(
         self,
@@ -84,11 +88,12 @@ class FileRegistryService:
             await self._cache.expire(etag, self.storage_key_cache_timeout)
             return etag
 
-        s3_obj = await self.file_storage.get_object(bucket, key)
-        if not s3_obj:
+        object_stream = await self.file_storage.download_stream(bucket, key)
+        if object_stream is None:
             raise FileDoesntExistException(key)
 
-        body = await s3_obj["Body"].read()
-        await self._cache.set(etag, body, self.storage_key_cache_timeout)
+        # ranges of big merge components are downloaded concurrently
+        file_content = b"".join([chunk async for chunk in object_stream.chunks])
+        await self._cache.set(etag, file_content, self.storage_key_cache_timeout)
 
         return etag
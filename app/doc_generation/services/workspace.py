@@ -0,0 +1,189 @@
+import asyncio
+import fcntl
+import logging
+import os
+import shutil
+import time
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import IO, AsyncIterator
+from uuid import uuid4
+
+from app.doc_generation.exception import WorkspaceQuotaExceededException
+
+OWNER_DIR_PREFIX = "worker-"
+OWNER_LOCK_FILE_NAME = ".lock"
+
+
+class WorkspaceManager:
+    """
+    Scoped temporary workspaces (sub dirs) of document generation. Workspace is removed on exit
+    even if generation has failed. Workers of the pod share tmp dir, so every worker keeps its workspaces
+    in its own dir, which is owned by holding lock on a file in it.
+    New workspace waits while disk usage of the whole tmp dir exceeds `quota_in_bytes`, so disk usage of the pod
+    is bounded. Janitor removes dirs of dead workers and orphans (e.g. left by older versions),
+    which are older than `orphan_max_age_in_seconds`, so the age has to exceed the longest generation.
+    """
+
+    quota_poll_interval = 0.5
+
+    def __init__(
+        self,
+        root_path: Path,
+        tmpfs_path: Path | None,
+        quota_in_bytes: int,
+        quota_wait_timeout: float,
+        orphan_max_age_in_seconds: int,
+        janitor_interval_in_seconds: float,
+    ):
+        # tmpfs keeps intermediate files in RAM and avoids disk I/O, but it's counted in memory limit of the pod
+        self.base_path = tmpfs_path or root_path
+        self.quota_in_bytes = quota_in_bytes
+        self.quota_wait_timeout = quota_wait_timeout
+        self.orphan_max_age_in_seconds = orphan_max_age_in_seconds
+        self.janitor_interval_in_seconds = janitor_interval_in_seconds
+
+        self._active_workspaces: set[Path] = set()
+        self._janitor_task: asyncio.Task | None = None
+        self._owner_path = self.base_path / f"{OWNER_DIR_PREFIX}{uuid4()}"
+        self._owner_lock: IO[bytes] | None = None
+
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def start(self) -> None:
+        if self._janitor_task is None:
+            self._janitor_task = asyncio.create_task(self._run_janitor())
+
+    async def close(self) -> None:
+        if self._janitor_task is not None:
+            self._janitor_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._janitor_task
+
+            self._janitor_task = None
+
+        if self._owner_lock is not None:
+            await asyncio.to_thread(shutil.rmtree, self._owner_path, ignore_errors=True)
+            self._owner_lock.close()
+            self._owner_lock = None
+
+    @asynccontextmanager
+    async def workspace(self) -> AsyncIterator[Path]:
+        await self._wait_for_quota()
+
+        workspace_path = self._get_owner_path() / str(uuid4())
+        workspace_path.mkdir()
+        self._active_workspaces.add(workspace_path)
+        try:
+            yield workspace_path
+        finally:
+            self._active_workspaces.discard(workspace_path)
+            await asyncio.to_thread(shutil.rmtree, workspace_path, ignore_errors=True)
+
+    async def get_used_size(self) -> int:
+        """Disk usage is calculated for the whole tmp dir, so workspaces of all workers are counted"""
+        return await asyncio.to_thread(self._calculate_size, self.base_path)
+
+    async def remove_orphans(self) -> int:
+        return await asyncio.to_thread(self._remove_orphans, frozenset(self._active_workspaces))
+
+    async def _wait_for_quota(self) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.quota_wait_timeout
+
+        # the only workspace is always allowed, so huge request can't block generation forever
+        while self._active_workspaces and await self.get_used_size() >= self.quota_in_bytes:
+            if loop.time() >= deadline:
+                raise WorkspaceQuotaExceededException(self.quota_in_bytes)
+
+            await asyncio.sleep(self.quota_poll_interval)
+
+    async def _run_janitor(self) -> None:
+        while True:
+            await asyncio.sleep(self.janitor_interval_in_seconds)
+
+            try:
+                removed_count = await self.remove_orphans()
+            except Exception as exc:
+                # janitor mustn't stop on any failure, the next run retries removal
+                self._logger.error(f"Can't remove orphaned workspaces: {exc!r}")
+                continue
+
+            if removed_count:
+                self._logger.info(f"{removed_count} orphaned workspaces are removed")
+
+    def _get_owner_path(self) -> Path:
+        """Owner dir is created on the first workspace, lock is held until the manager is closed"""
+        if self._owner_lock is None:
+            self._owner_path.mkdir(parents=True)
+            owner_lock = open(self._owner_path / OWNER_LOCK_FILE_NAME, mode="wb")  # noqa: WPS515
+            fcntl.flock(owner_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self._owner_lock = owner_lock
+
+        return self._owner_path
+
+    def _remove_orphans(self, active_workspaces: frozenset[Path]) -> int:
+        if not self.base_path.exists():
+            return 0
+
+        expiration_time = time.time() - self.orphan_max_age_in_seconds
+        removed_count = 0
+        for entry in os.scandir(self.base_path):
+            if Path(entry.path) == self._owner_path:
+                removed_count += self._remove_expired_workspaces(active_workspaces, expiration_time)
+            elif self._is_orphan(entry, expiration_time):
+                _remove_entry(entry)
+                removed_count += 1
+
+        return removed_count
+
+    def _remove_expired_workspaces(self, active_workspaces: frozenset[Path], expiration_time: float) -> int:
+        removed_count = 0
+        for entry in os.scandir(self._owner_path):
+            if entry.name == OWNER_LOCK_FILE_NAME or Path(entry.path) in active_workspaces:
+                continue
+
+            # workspace can be created after active workspaces are copied, so only expired ones are removed
+            if entry.stat(follow_symlinks=False).st_mtime <= expiration_time:
+                _remove_entry(entry)
+                removed_count += 1
+
+        return removed_count
+
+    @classmethod
+    def _is_orphan(cls, entry: os.DirEntry, expiration_time: float) -> bool:
+        is_expired = entry.stat(follow_symlinks=False).st_mtime <= expiration_time
+        if not entry.name.startswith(OWNER_DIR_PREFIX):
+            return is_expired
+
+        try:
+            owner_lock = open(Path(entry.path) / OWNER_LOCK_FILE_NAME, mode="rb")  # noqa: WPS515
+        except FileNotFoundError:
+            # worker could be killed before the lock file was created
+            return is_expired
+
+        # lock is released by OS when worker is killed, so dir of dead worker is removed regardless of age
+        with owner_lock:
+            try:
+                fcntl.flock(owner_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+
+        return True
+
+    @classmethod
+    def _calculate_size(cls, base_path: Path) -> int:
+        used_size = 0
+        for dir_path, _, file_names in os.walk(base_path):
+            for file_name in file_names:
+                with suppress(FileNotFoundError):
+                    used_size += os.path.getsize(os.path.join(dir_path, file_name))
+
+        return used_size
+
+
+def _remove_entry(entry: os.DirEntry) -> None:
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path, ignore_errors=True)
+    else:
+        Path(entry.path).unlink(missing_ok=True)
@@ -1,19 +1,23 @@
 import asyncio
-from io import BytesIO
-from typing import Callable
+from typing import AsyncIterator, Callable
 
-import aiofiles
 import docusign_esign
 from docusign_esign.client.api_response import RESTClientObject
 
 from app.config import settings
-from app.esign.exception import DynamicDocuSignException
+from app.esign.exception import DocuSignExecutorSaturatedException, DynamicDocuSignException
+from app.esign.executor import DocuSignExecutor
+from app.file_storage.stream import iterate_in_thread
 from app.new_relic import wrapp_web_transaction
 
+# default size of urllib3 connection pool
+DEFAULT_POOL_MAX_SIZE = 4
+
 
 class DocuSignClient:  # noqa: WPS214
     expires_in = 8 * 60 * 60
     scopes = ["signature", "impersonation"]
+    document_chunk_size_in_bytes = 1024 * 1024
 
     def __init__(self):
         api_client = docusign_esign.ApiClient(host=settings.docu_sign.host)
@@ -32,9 +36,14 @@ class DocuSignClient:  # noqa: WPS214
         self._client = api_client
         self._account_id = settings.docu_sign.account_id
         self._envelopes_api = docusign_esign.EnvelopesApi(self._client)
+        # one thread per connection of the pool, more threads would only wait for connections
+        self._executor = DocuSignExecutor(
+            max_workers=settings.docu_sign.pool_max_size or DEFAULT_POOL_MAX_SIZE,
+            max_queue_size=settings.docu_sign.executor_max_queue_size,
+        )
 
     async def refresh_access_token(self) -> None:
-        await asyncio.to_thread(
+        await self._executor.run(
             self._client.request_jwt_user_token,
             client_id=settings.docu_sign.client_id,
             user_id=settings.docu_sign.impersonated_user_id,
@@ -80,18 +89,30 @@ class DocuSignClient:  # noqa: WPS214
             include=include,
         )
 
-    async def get_document_by_id(self, document_id: str, envelope_id: str) -> BytesIO:
-        # get_document return path to temp file in a memory
-        document = await self._do_request(
+    async def stream_document_by_id(self, document_id: str, envelope_id: str) -> AsyncIterator[bytes]:
+        """
+        Document response is read by chunks, so it can be piped to storage without keeping it in memory.
+        SDK isn't asked to deserialize it, because it writes the whole document to temp file.
+        """
+        document_response = await self._do_request(
             self._envelopes_api.get_document,
             account_id=self._account_id,
             document_id=document_id,
             envelope_id=envelope_id,
+            _preload_content=False,
         )
-        async with aiofiles.open(document, mode="rb") as pdf_file:
-            read_file = await pdf_file.read()
+        document_chunks = document_response.stream(self.document_chunk_size_in_bytes)
+        try:
+            # worker is held for the whole download, so saturated executor can't reject it after the first chunk
+            async with self._executor.reserve_worker() as run_in_worker:
+                async for document_chunk in iterate_in_thread(document_chunks, run_in_worker):
+                    yield document_chunk
+        except (Exception, asyncio.CancelledError, GeneratorExit):
+            # not fully read connection can't be reused
+            document_response.close()
+            raise
 
-        return BytesIO(read_file)
+        document_response.release_conn()
 
     async def get_recipients(self, envelope_id: str) -> docusign_esign.Recipients:
         return await self._do_request(
@@ -118,7 +139,7 @@ class DocuSignClient:  # noqa: WPS214
     async def is_healthy(self) -> bool:
         try:
             await self.refresh_access_token()
-        except docusign_esign.ApiException:
+        except (docusign_esign.ApiException, DocuSignExecutorSaturatedException):
             return False
 
         return True
@@ -127,11 +148,11 @@ class DocuSignClient:  # noqa: WPS214
         wrapped_method = wrapp_web_transaction(method)
 
         try:
-            return await asyncio.to_thread(wrapped_method, **kwargs)
+            return await self._executor.run(wrapped_method, **kwargs)
         except docusign_esign.ApiException as exc:
             docusign_exc = DynamicDocuSignException(exc, **kwargs)
             if not docusign_exc.is_auth_exception:
                 raise docusign_exc
 
             await self.refresh_access_token()
-            return await asyncio.to_thread(wrapped_method, **kwargs)
+            return await self._executor.run(wrapped_method, **kwargs)
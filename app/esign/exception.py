@@ -45,6 +45,16 @@ class InvalidAuthenticationCreds(BaseHTTPException):
         super().__init__(headers={"WWW-Authenticate": "Bearer"}, addition_message=additional_message)
 
 
+class DocuSignExecutorSaturatedException(BaseHTTPException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    message = "Too many DocuSign requests are waiting for execution, try again later"
+
+    is_expected = False
+
+    def __init__(self, queue_depth: int):
+        super().__init__(addition_message=f"Waiting requests: {queue_depth}")
+
+
 class RecipientsUpdateInvalidStateException(BaseHTTPException):
     status_code = status.HTTP_400_BAD_REQUEST
     message = (
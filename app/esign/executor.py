@@ -0,0 +1,78 @@
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar, cast
+
+from app.esign.exception import DocuSignExecutorSaturatedException
+from app.new_relic import record_custom_metric
+
+QUEUE_DEPTH_METRIC = "ESign/DocuSignExecutor/QueueDepth"
+WAIT_TIME_METRIC = "ESign/DocuSignExecutor/WaitTime"
+
+CallResult = TypeVar("CallResult")
+RunInWorker = Callable[..., Awaitable[Any]]
+
+
+class DocuSignExecutor:
+    """
+    Dedicated thread pool for blocking DocuSign SDK calls, so bursts of them (e.g. document downloads
+    of webhooks) don't starve other work, which is offloaded to the default executor.
+    Calls wait for a free worker in order. When `max_queue_size` calls are already waiting,
+    new ones are rejected instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="docusign")
+        self._workers = asyncio.Semaphore(max_workers)
+        self._queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue_depth
+
+    async def run(self, function: Callable[..., CallResult], *args, **kwargs) -> CallResult:
+        async with self._acquire_worker():
+            return await self._run_in_thread(function, *args, **kwargs)
+
+    @asynccontextmanager
+    async def reserve_worker(self) -> AsyncIterator[RunInWorker]:
+        """
+        Worker is acquired once for a series of calls (e.g. reads of chunks of one document),
+        so the series can't be rejected midway when the executor is saturated.
+        """
+        async with self._acquire_worker():
+            yield self._run_in_thread
+
+    async def _run_in_thread(self, function: Callable[..., CallResult], *args, **kwargs) -> CallResult:
+        loop = asyncio.get_running_loop()
+        # context variables are passed to the thread as asyncio.to_thread does
+        context = contextvars.copy_context()
+        function_call = functools.partial(context.run, function, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, cast(Callable[[], CallResult], function_call))
+
+    @asynccontextmanager
+    async def _acquire_worker(self) -> AsyncIterator[None]:
+        if self._workers.locked() and self._queue_depth >= self.max_queue_size:
+            raise DocuSignExecutorSaturatedException(self._queue_depth)
+
+        queued_at = time.monotonic()
+        self._queue_depth += 1
+        try:
+            await self._workers.acquire()
+        except asyncio.CancelledError:
+            self._queue_depth -= 1
+            raise
+
+        self._queue_depth -= 1
+        record_custom_metric(QUEUE_DEPTH_METRIC, self._queue_depth)
+        record_custom_metric(WAIT_TIME_METRIC, time.monotonic() - queued_at)
+        try:
+            yield
+        finally:
+            self._workers.release()
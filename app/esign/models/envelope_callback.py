@@ -1,12 +1,9 @@
 from datetime import datetime
-from typing import Type, TypeVar
 
-from dateutil import parser
 from pydantic import Field
 from types_aiobotocore_dynamodb.type_defs import (
     DeleteItemInputRequestTypeDef,
     GetItemInputRequestTypeDef,
-    PutItemInputRequestTypeDef,
     ScanInputRequestTypeDef,
     UpdateItemInputRequestTypeDef,
 )
@@ -20,8 +17,6 @@ from app.base.models import (
     UpdateItemBaseModel,
 )
 
-EnvelopeCallbackItemModelType = TypeVar("EnvelopeCallbackItemModelType", bound="EnvelopeCallbackItemModel")
-
 
 class EnvelopeCallbackItemModel(ItemBaseModel):
     envelope_id: str
@@ -29,33 +24,6 @@ class EnvelopeCallbackItemModel(ItemBaseModel):
     created_at: datetime
     expiration_time: int | None
 
-    @classmethod
-    def from_record(
-        cls: Type[EnvelopeCallbackItemModelType],
-        object_item: dict
-    ) -> EnvelopeCallbackItemModelType | None:
-        for field in cls.__fields__.keys():
-            if field == "expiration_time":
-                continue
-
-            if not object_item.get(field):
-                return None
-
-        envelope_id = object_item["envelope_id"][DynamoDBColumnTypes.string.value]
-        callback_url = object_item["callback_url"][DynamoDBColumnTypes.string.value]
-        expiration_time = (
-            int(object_item["expiration_time"][DynamoDBColumnTypes.number.value])
-            if "expiration_time" in object_item else None
-        )
-        created_at = parser.parse(object_item["created_at"][DynamoDBColumnTypes.string.value])
-
-        return cls(
-            envelope_id=envelope_id,
-            callback_url=callback_url,
-            expiration_time=expiration_time,
-            created_at=created_at,
-        )
-
 
 class EnvelopeCallbackPutItem(PutItemBaseModel):
     envelope_id: str
@@ -64,34 +32,6 @@ class EnvelopeCallbackPutItem(PutItemBaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime | None = None
 
-    def to_put_item_object(self, table_name: str) -> PutItemInputRequestTypeDef:
-        put_item = {
-            "envelope_id": {
-                DynamoDBColumnTypes.string.value: self.envelope_id
-            },
-            "callback_url": {
-                DynamoDBColumnTypes.string.value: self.callback_url
-            },
-            "created_at": {
-                DynamoDBColumnTypes.string.value: self.created_at.strftime(DatetimeFormats.utc_string_format)
-            },
-            "updated_at": {
-                DynamoDBColumnTypes.string.value: ""
-            }
-        }
-
-        if self.expiration_time:
-            put_item.update({
-                "expiration_time": {
-                    DynamoDBColumnTypes.number.value: str(self.expiration_time)
-                }
-            })
-
-        return {
-            "TableName": table_name,
-            "Item": put_item,  # type: ignore
-        }
-
 
 class EnvelopeCallbackSearchItem(SearchItemBaseModel):
     envelope_id: str
@@ -0,0 +1,157 @@
+from contextlib import aclosing
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import docusign_esign
+from httpx import AsyncClient, Limits, Request, Response
+
+from app.api_client.base_api_client import HTTPMethod, enhance_query_params
+from app.config import settings
+from app.esign.client import DocuSignClient
+from app.esign.exception import DynamicDocuSignException
+from app.new_relic import wrapp_web_transaction
+
+
+async def init_docusign_http_client() -> AsyncIterator[AsyncClient]:
+    """HTTP client keeps connections to DocuSign, so it's a resource of the container, which is closed on shutdown"""
+    host = settings.docu_sign.host
+    account_id = settings.docu_sign.account_id
+    pool_size = settings.docu_sign.pool_max_size
+    http_client = AsyncClient(
+        base_url=f"{host}/v2.1/accounts/{account_id}",
+        limits=Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        timeout=settings.docu_sign.max_timeout,
+    )
+
+    yield http_client
+
+    await http_client.aclose()
+
+
+class NativeDocuSignClient(DocuSignClient):
+    """
+    DocuSign client, which sends envelope requests by async HTTP client with keep-alive connections
+    instead of running synchronous SDK in threads. SDK is still used for JWT authorization and
+    (de)serialization of its models, so the interface is the same and SDK client stays as a fallback.
+    """
+
+    def __init__(self, http_client: AsyncClient):
+        super().__init__()
+        self._http_client = http_client
+
+    async def create_envelope(
+        self,
+        envelope_definition: docusign_esign.EnvelopeDefinition,
+    ) -> docusign_esign.EnvelopeSummary:
+        response = await self._send(HTTPMethod.post, "/envelopes", body=envelope_definition)
+        return self._deserialize(response, "EnvelopeSummary")
+
+    async def update_envelope(
+        self,
+        envelope_id: str,
+        envelope_definition: docusign_esign.Envelope,
+        resend_envelope: str = "true",
+    ) -> docusign_esign.EnvelopeUpdateSummary:
+        response = await self._send(
+            HTTPMethod.put,
+            f"/envelopes/{envelope_id}",
+            envelope_id=envelope_id,
+            body=envelope_definition,
+            query_params={"resend_envelope": resend_envelope},
+        )
+        return self._deserialize(response, "EnvelopeUpdateSummary")
+
+    async def get_envelope(
+        self,
+        envelope_id: str,
+        include: str | None = "recipients,tabs",
+    ) -> docusign_esign.EnvelopeDefinition:
+        response = await self._send(
+            HTTPMethod.get,
+            f"/envelopes/{envelope_id}",
+            envelope_id=envelope_id,
+            query_params={"include": include},
+        )
+        return self._deserialize(response, "Envelope")
+
+    async def stream_document_by_id(self, document_id: str, envelope_id: str) -> AsyncIterator[bytes]:
+        response = await self._send(
+            HTTPMethod.get,
+            f"/envelopes/{envelope_id}/documents/{document_id}",
+            envelope_id=envelope_id,
+            is_stream=True,
+        )
+        async with aclosing(response):
+            async for document_chunk in response.aiter_bytes(self.document_chunk_size_in_bytes):
+                yield document_chunk
+
+    async def get_recipients(self, envelope_id: str) -> docusign_esign.Recipients:
+        response = await self._send(HTTPMethod.get, f"/envelopes/{envelope_id}/recipients", envelope_id=envelope_id)
+        return self._deserialize(response, "Recipients")
+
+    async def update_recipients(self, envelope_id: str, recipients: docusign_esign.Recipients):
+        response = await self._send(
+            HTTPMethod.put,
+            f"/envelopes/{envelope_id}/recipients",
+            envelope_id=envelope_id,
+            body=recipients,
+        )
+        return self._deserialize(response, "RecipientsUpdateSummary")
+
+    async def list_documents(self, envelope_id: str):
+        response = await self._send(HTTPMethod.get, f"/envelopes/{envelope_id}/documents", envelope_id=envelope_id)
+        return self._deserialize(response, "EnvelopeDocumentsResult")
+
+    async def _send(
+        self,
+        method: HTTPMethod,
+        endpoint: str,
+        envelope_id: str | None = None,
+        body: Any = None,
+        query_params: dict | None = None,
+        is_stream: bool = False,
+    ) -> Response:
+        json_body = None if body is None else self._client.sanitize_for_serialization(body)
+        request_kwargs = {
+            "method": method.value,
+            "url": endpoint,
+            "params": enhance_query_params(query_params or {}),
+            "json": json_body,
+        }
+
+        send_request = wrapp_web_transaction(self._http_client.send)
+
+        response = await send_request(self._build_request(request_kwargs), stream=is_stream)
+        if response.is_success:
+            return response
+
+        docusign_exc = await self._build_exception(response, envelope_id)
+        if not docusign_exc.is_auth_exception:
+            raise docusign_exc
+
+        await self.refresh_access_token()
+        response = await send_request(self._build_request(request_kwargs), stream=is_stream)
+        if response.is_success:
+            return response
+
+        raise await self._build_exception(response, envelope_id)
+
+    def _build_request(self, request_kwargs: dict) -> Request:
+        # token is set to default headers of SDK client, when it's requested or refreshed
+        authorization_headers = {"Authorization": self._client.default_headers["Authorization"]}
+        return self._http_client.build_request(headers=authorization_headers, **request_kwargs)
+
+    async def _build_exception(self, response: Response, envelope_id: str | None) -> DynamicDocuSignException:
+        await response.aread()
+        await response.aclose()
+
+        api_exception = docusign_esign.ApiException(status=response.status_code, reason=response.reason_phrase)
+        api_exception.body = response.content
+        if envelope_id is None:
+            return DynamicDocuSignException(api_exception)
+
+        return DynamicDocuSignException(api_exception, envelope_id=envelope_id)
+
+    def _deserialize(self, response: Response, response_type: str):
+        # SDK deserializes any response with `data` attribute
+        return self._client.deserialize(SimpleNamespace(data=response.text), response_type)
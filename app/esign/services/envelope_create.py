@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import datetime
 import logging
 import uuid
@@ -15,6 +14,7 @@ from app.esign.repositories import EnvelopeCallbackRepository, EnvelopeRepositor
 from app.esign.schema.envelope import DSDocumentRequest, DSEnvelopeIdResponse, DSEnvelopeRequest
 from app.esign.services.builders import build_esign_tabs, build_event_notification
 from app.file_storage.service import FileStorageService
+from app.file_storage.stream import encode_base64
 
 
 class ESignEnvelopeCreateService:
@@ -194,12 +194,12 @@ class ESignEnvelopeCreateService:
         )
 
     async def _get_document_file(self, document_schema: DSDocumentRequest) -> docusign_esign.Document:
-        document_file = await self.storage.download_file(document_schema.bucket_name, document_schema.document_path)
+        object_stream = await self.storage.download_stream(document_schema.bucket_name, document_schema.document_path)
 
-        if not document_file:
+        if not object_stream:
             raise DocumentDoesntExistException(document_schema.document_path)
 
-        encoded_document = base64.b64encode(document_file.read()).decode("ascii")
+        encoded_document = await encode_base64(object_stream.chunks)
 
         return docusign_esign.Document(
             document_id=document_schema.document_id,
@@ -227,12 +227,13 @@ class ESignWebhookService:
         return cast(list[DocumentItem], stored_documents)
 
     async def _store_signed_document(self, envelope_id: str, document: DocumentItem) -> DocumentItem:
-        downloaded_document = await self.ds_client.get_document_by_id(
+        # document is piped from DocuSign response to (multipart) upload chunk by chunk
+        document_chunks = self.ds_client.stream_document_by_id(
             envelope_id=envelope_id, document_id=document.document_id
         )
 
         file_path = str(self.signed_documents_path / envelope_id / f"{document.document_id_guid}.pdf")
-        await self.storage.upload_file(self.main_bucket_name, file_path, downloaded_document)
+        await self.storage.upload_stream(self.main_bucket_name, file_path, document_chunks)
 
         document.document_bucket_name = self.main_bucket_name
         document.document_path = file_path
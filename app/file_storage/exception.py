@@ -37,3 +37,16 @@ class DynamicS3Exception(BaseHTTPException):
             message=json.dumps(s3_error_dict) if s3_error_dict else None,
             field_value=full_path,
         )
+
+
+class ObjectsNotDeletedException(BaseHTTPException):
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    message = "Some objects weren't deleted from the bucket"
+    field_name = "bucketName"
+
+    is_expected = False
+
+    def __init__(self, bucket_name: str, errors: list[dict]):
+        errors_count = len(errors)
+        error_codes = ", ".join(sorted({error.get("Code", "Unknown") for error in errors}))
+        super().__init__(field_value=bucket_name, addition_message=f"Failed: {errors_count}, errors: {error_codes}")
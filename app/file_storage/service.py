@@ -1,9 +1,18 @@
+import asyncio
 import logging
+from collections import deque
 from io import BytesIO
+from itertools import count, islice
+from operator import itemgetter
+from pathlib import Path
+from typing import IO, AsyncIterator, cast
 
+import aiofiles
 from botocore.exceptions import ClientError
 from types_aiobotocore_s3 import S3Client
 from types_aiobotocore_s3.type_defs import (
+    CompletedMultipartUploadTypeDef,
+    CompletedPartTypeDef,
     DeleteTypeDef,
     GetObjectOutputTypeDef,
     HeadObjectOutputTypeDef,
@@ -11,44 +20,117 @@ from types_aiobotocore_s3.type_defs import (
     ObjectIdentifierTypeDef,
 )
 
-from app.file_storage.exception import DynamicS3Exception, NoSuchBucketException
+from app.file_storage.exception import (
+    DynamicS3Exception,
+    NoSuchBucketException,
+    ObjectsNotDeletedException,
+)
+from app.file_storage.stream import AsyncByteReader, ObjectStream, UploadSource
 
 
 class FileStorageService:  # noqa: WPS214
     storage_key_cache_timeout = 300  # 5 min * 60 sec
+    # S3 limit of keys in listing page and in delete_objects request
+    list_page_size = 1000
+    max_concurrent_deletes = 8
 
-    def __init__(self, s3_client: S3Client):
+    def __init__(
+        self,
+        s3_client: S3Client,
+        multipart_threshold_in_bytes: int,
+        multipart_chunk_size_in_bytes: int,
+        multipart_max_concurrency: int,
+        download_part_size_in_bytes: int,
+        download_max_concurrency: int,
+    ):
         self._client = s3_client
+        self.multipart_threshold_in_bytes = multipart_threshold_in_bytes
+        self.multipart_chunk_size_in_bytes = multipart_chunk_size_in_bytes
+        self.multipart_max_concurrency = multipart_max_concurrency
+        self.download_part_size_in_bytes = download_part_size_in_bytes
+        self.download_max_concurrency = download_max_concurrency
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    async def get_object(self, bucket: str, key: str) -> GetObjectOutputTypeDef | None:
+    async def get_object(
+        self,
+        bucket: str,
+        key: str,
+        byte_range: str | None = None,
+    ) -> GetObjectOutputTypeDef | None:
         try:
-            return await self._client.get_object(Bucket=bucket, Key=key)
+            return await self._request_object(bucket, key, byte_range)
         except ClientError as exc:
             if exc.response["Error"]["Code"] == "NoSuchKey":
                 return None
             if exc.response["Error"]["Code"] == "NoSuchBucket":
                 raise NoSuchBucketException(bucket)
+            if exc.response["Error"]["Code"] == "InvalidRange":
+                # empty object can't be requested by range
+                return await self.get_object(bucket, key)
             raise DynamicS3Exception(s3_exception=exc, bucket=bucket, key=key)
 
     async def delete_object(self, bucket: str, key: str) -> None:
         await self._client.delete_object(Bucket=bucket, Key=key)
 
     async def download_file(self, bucket: str, key: str) -> BytesIO | None:
-        try:
-            s3_obj = await self.get_object(bucket, key)
-        except ClientError as exc:
-            raise DynamicS3Exception(s3_exception=exc, bucket=bucket, key=key)
+        object_stream = await self.download_stream(bucket, key)
+        if object_stream is None:
+            return None
+
+        file_io = BytesIO()
+        async for chunk in object_stream.chunks:
+            file_io.write(chunk)
 
-        if not s3_obj:
+        file_io.seek(0)
+        return file_io
+
+    async def download_to_path(self, bucket: str, key: str, file_path: Path) -> bool:
+        """Stream object to the file, return False when object doesn't exist"""
+        object_stream = await self.download_stream(bucket, key)
+        if object_stream is None:
+            return False
+
+        async with aiofiles.open(file_path, mode="wb") as target_file:
+            async for chunk in object_stream.chunks:
+                await target_file.write(chunk)
+
+        return True
+
+    async def download_stream(self, bucket: str, key: str) -> ObjectStream | None:
+        """
+        Stream object by byte ranges. The first range gives size of the object, the next ones are downloaded
+        concurrently ahead of the consumer, so memory is limited by ranges in flight.
+        """
+        first_range = await self.get_object(bucket, key, self._build_range(0))
+        if first_range is None:
             return None
 
-        body = await s3_obj["Body"].read()
-        return BytesIO(body)
+        # range response contains size of the whole object as "bytes 0-99/1234"
+        content_range = first_range.get("ContentRange")
+        object_size = first_range["ContentLength"]
+        if content_range:
+            object_size = int(content_range.rsplit("/", 1)[-1])
+        return ObjectStream(
+            size=object_size,
+            chunks=self._iterate_ranges(bucket, key, first_range, object_size),
+        )
+
+    async def upload_file(self, bucket: str, key: str, file_io: IO[bytes]) -> None:
+        await self.upload_stream(bucket, key, file_io)
 
-    async def upload_file(self, bucket: str, key: str, file_io: BytesIO) -> None:
+    async def upload_stream(self, bucket: str, key: str, source: UploadSource) -> None:
+        """
+        Upload file object or async stream of chunks without reading the whole object in memory.
+        Objects smaller than multipart threshold are uploaded by one request,
+        bigger ones are uploaded by parts in parallel.
+        """
+        reader = AsyncByteReader(source)
+        head = await reader.peek(self.multipart_threshold_in_bytes)
         try:
-            await self._client.upload_fileobj(Fileobj=file_io, Bucket=bucket, Key=key)
+            if len(head) < self.multipart_threshold_in_bytes:
+                await self._client.put_object(Bucket=bucket, Key=key, Body=BytesIO(head))
+            else:
+                await self._upload_multipart(bucket, key, reader)
         except ClientError as exc:
             raise DynamicS3Exception(s3_exception=exc, bucket=bucket, key=key)
 
@@ -59,20 +141,25 @@ class FileStorageService:  # noqa: WPS214
             raise DynamicS3Exception(s3_exception=exc, bucket=bucket)
 
     async def clear_bucket(self, bucket: str) -> None:
-        objects_response = await self.get_list_objects(bucket)
+        await self.purge_prefix(bucket)
 
-        file_objs = objects_response.get("Contents")
-        if not file_objs:
-            return
+    async def purge_prefix(self, bucket: str, prefix: str = "") -> int:
+        """
+        Delete all objects under the prefix and return number of deleted objects.
+        Every listed page is deleted by one request, while the next pages are being listed.
+        """
+        deleted_count = 0
+        delete_tasks: set[asyncio.Task[int]] = set()
+        async for object_keys in self.iterate_object_key_pages(bucket, prefix):
+            # listing waits for finished deletion, so not deleted pages don't pile up in memory
+            if len(delete_tasks) >= self.max_concurrent_deletes:
+                finished_tasks, delete_tasks = await asyncio.wait(delete_tasks, return_when=asyncio.FIRST_COMPLETED)
+                deleted_count += sum(finished_task.result() for finished_task in finished_tasks)
 
-        keys: list[ObjectIdentifierTypeDef] = []
-        for file_obj in file_objs:
-            keys.append(ObjectIdentifierTypeDef(Key=file_obj["Key"]))
+            delete_tasks.add(asyncio.create_task(self._delete_objects(bucket, object_keys)))
 
-        try:
-            await self._client.delete_objects(Bucket=bucket, Delete=DeleteTypeDef(Objects=keys, Quiet=True))
-        except ClientError as del_exc:
-            raise DynamicS3Exception(s3_exception=del_exc, bucket=bucket)
+        deleted_counts = await asyncio.gather(*delete_tasks)
+        return deleted_count + sum(deleted_counts)
 
     async def delete_bucket(self, bucket: str) -> None:
         try:
@@ -108,8 +195,183 @@ class FileStorageService:  # noqa: WPS214
                 return None
             raise DynamicS3Exception(s3_exception=exc, bucket=bucket, key=key)
 
-    async def get_list_objects(self, bucket: str) -> ListObjectsV2OutputTypeDef:
+    async def iterate_object_keys(self, bucket: str, prefix: str = "") -> AsyncIterator[str]:
+        async for object_keys in self.iterate_object_key_pages(bucket, prefix):
+            for object_key in object_keys:
+                yield object_key
+
+    async def iterate_object_key_pages(self, bucket: str, prefix: str = "") -> AsyncIterator[list[str]]:
+        paginator = self._client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(Bucket=bucket, Prefix=prefix, PaginationConfig={"PageSize": self.list_page_size})
+        try:
+            async for objects_page in pages:
+                object_keys = [file_obj["Key"] for file_obj in objects_page.get("Contents", [])]
+                if object_keys:
+                    yield object_keys
+        except ClientError as exc:
+            raise DynamicS3Exception(s3_exception=exc, bucket=bucket)
+
+    async def get_list_objects(self, bucket: str, prefix: str = "") -> ListObjectsV2OutputTypeDef:
+        """Return listing of all objects, pages of listing are merged in one response"""
+        paginator = self._client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(Bucket=bucket, Prefix=prefix, PaginationConfig={"PageSize": self.list_page_size})
         try:
-            return await self._client.list_objects_v2(Bucket=bucket)
+            file_objs = [file_obj async for objects_page in pages for file_obj in objects_page.get("Contents", [])]
         except ClientError as exc:
             raise DynamicS3Exception(s3_exception=exc, bucket=bucket)
+
+        return cast(ListObjectsV2OutputTypeDef, {
+            "Name": bucket,
+            "Prefix": prefix,
+            "IsTruncated": False,
+            "KeyCount": len(file_objs),
+            "Contents": file_objs,
+        })
+
+    async def _delete_objects(self, bucket: str, object_keys: list[str]) -> int:
+        objects_to_delete = [ObjectIdentifierTypeDef(Key=object_key) for object_key in object_keys]
+        try:
+            delete_response = await self._client.delete_objects(
+                Bucket=bucket,
+                Delete=DeleteTypeDef(Objects=objects_to_delete, Quiet=True),
+            )
+        except ClientError as del_exc:
+            raise DynamicS3Exception(s3_exception=del_exc, bucket=bucket)
+
+        # quiet response contains only keys which weren't deleted
+        delete_errors = delete_response.get("Errors", [])
+        if delete_errors:
+            raise ObjectsNotDeletedException(bucket, cast(list[dict], delete_errors))
+
+        return len(object_keys)
+
+    async def _request_object(self, bucket: str, key: str, byte_range: str | None) -> GetObjectOutputTypeDef:
+        if byte_range is None:
+            return await self._client.get_object(Bucket=bucket, Key=key)
+
+        return await self._client.get_object(Bucket=bucket, Key=key, Range=byte_range)
+
+    async def _iterate_ranges(
+        self,
+        bucket: str,
+        key: str,
+        first_range: GetObjectOutputTypeDef,
+        object_size: int,
+    ) -> AsyncIterator[bytes]:
+        # ranges are requested only for the same version of the object as the first one
+        etag = first_range["ETag"]
+        range_starts = iter(range(self.download_part_size_in_bytes, object_size, self.download_part_size_in_bytes))
+        pending_ranges: deque[asyncio.Future[bytes]] = deque([asyncio.ensure_future(first_range["Body"].read())])
+        pending_ranges.extend(
+            asyncio.create_task(self._download_range(bucket, key, range_start, etag))
+            for range_start in islice(range_starts, self.download_max_concurrency)
+        )
+        try:
+            while pending_ranges:
+                range_body = await pending_ranges.popleft()
+                next_range_start = next(range_starts, None)
+                if next_range_start is not None:
+                    pending_ranges.append(
+                        asyncio.create_task(self._download_range(bucket, key, next_range_start, etag)),
+                    )
+                yield range_body
+        except (Exception, asyncio.CancelledError, GeneratorExit):
+            # consumer stopped reading or one of ranges is failed
+            for pending_range in pending_ranges:
+                pending_range.cancel()
+            raise
+
+    async def _download_range(self, bucket: str, key: str, range_start: int, etag: str) -> bytes:
+        try:
+            range_obj = await self._client.get_object(
+                Bucket=bucket,
+                Key=key,
+                Range=self._build_range(range_start),
+                IfMatch=etag,
+            )
+        except ClientError as exc:
+            raise DynamicS3Exception(s3_exception=exc, bucket=bucket, key=key)
+
+        return await range_obj["Body"].read()
+
+    def _build_range(self, range_start: int) -> str:
+        range_end = range_start + self.download_part_size_in_bytes - 1
+        return f"bytes={range_start}-{range_end}"
+
+    async def _upload_multipart(self, bucket: str, key: str, reader: AsyncByteReader) -> None:
+        multipart_upload = await self._client.create_multipart_upload(Bucket=bucket, Key=key)
+        upload_id = multipart_upload["UploadId"]
+        try:
+            completed_parts = await self._upload_parts(bucket, key, upload_id, reader)
+        except (Exception, asyncio.CancelledError):
+            # uploaded parts are stored (and charged) until the upload is aborted
+            await self._client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            raise
+
+        await self._client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload=CompletedMultipartUploadTypeDef(Parts=completed_parts),
+        )
+
+    async def _upload_parts(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        reader: AsyncByteReader,
+    ) -> list[CompletedPartTypeDef]:
+        upload_tasks: set[asyncio.Task[CompletedPartTypeDef]] = set()
+        try:
+            completed_parts = await self._run_part_uploads(upload_tasks, bucket, key, upload_id, reader)
+        except (Exception, asyncio.CancelledError):
+            # parts in flight aren't needed anymore, when one of them is failed
+            for upload_task in upload_tasks:
+                upload_task.cancel()
+            raise
+
+        return sorted(completed_parts, key=itemgetter("PartNumber"))
+
+    async def _run_part_uploads(
+        self,
+        upload_tasks: set[asyncio.Task[CompletedPartTypeDef]],
+        bucket: str,
+        key: str,
+        upload_id: str,
+        reader: AsyncByteReader,
+    ) -> list[CompletedPartTypeDef]:
+        """Next part is read while previous ones are being uploaded, memory is limited by parts in flight"""
+        completed_parts: list[CompletedPartTypeDef] = []
+        for part_number in count(1):
+            part_body = await reader.read(self.multipart_chunk_size_in_bytes)
+            if not part_body:
+                break
+
+            if len(upload_tasks) >= self.multipart_max_concurrency:
+                finished_tasks, _ = await asyncio.wait(upload_tasks, return_when=asyncio.FIRST_COMPLETED)
+                upload_tasks.difference_update(finished_tasks)
+                completed_parts.extend(finished_task.result() for finished_task in finished_tasks)
+
+            upload_task = self._upload_part(bucket, key, upload_id, part_number, part_body)
+            upload_tasks.add(asyncio.create_task(upload_task))
+
+        completed_parts.extend(await asyncio.gather(*upload_tasks))
+        return completed_parts
+
+    async def _upload_part(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        part_body: bytes,
+    ) -> CompletedPartTypeDef:
+        uploaded_part = await self._client.upload_part(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=BytesIO(part_body),
+        )
+        return CompletedPartTypeDef(ETag=uploaded_part["ETag"], PartNumber=part_number)
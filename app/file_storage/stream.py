@@ -0,0 +1,100 @@
+import asyncio
+import base64
+import mmap
+from io import BytesIO
+from typing import IO, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterator, NamedTuple, cast
+
+UploadSource = IO[bytes] | AsyncIterable[bytes]
+# base64 encodes every 3 bytes to 4 chars, so chunks aligned to it are encoded independently
+BASE64_BLOCK_SIZE = 3
+
+
+class ObjectStream(NamedTuple):
+    size: int
+    chunks: AsyncIterator[bytes]
+
+
+async def iterate_in_thread(
+    chunks: Iterator[bytes],
+    run_in_thread: Callable[..., Awaitable[bytes]] = asyncio.to_thread,
+) -> AsyncIterator[bytes]:
+    """Blocking iterator (e.g. body of sync HTTP response) is advanced in thread, so event loop isn't blocked"""
+    while True:
+        chunk = await run_in_thread(_next_chunk, chunks)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def encode_base64(chunks: AsyncIterable[bytes]) -> str:
+    """Encode stream chunk by chunk, so the whole raw content isn't kept in memory together with encoded one"""
+    encoded_parts: list[str] = []
+    remainder = b""
+    async for chunk in chunks:
+        unencoded_bytes = remainder + chunk
+        aligned_size = len(unencoded_bytes) - len(unencoded_bytes) % BASE64_BLOCK_SIZE
+        encoded_parts.append(base64.b64encode(unencoded_bytes[:aligned_size]).decode("ascii"))
+        remainder = unencoded_bytes[aligned_size:]
+
+    encoded_parts.append(base64.b64encode(remainder).decode("ascii"))
+    return "".join(encoded_parts)
+
+
+class AsyncByteReader:
+    """
+    Async file-like reader over file object or async stream of chunks (e.g. body of HTTP response),
+    so any source is uploaded without buffering the whole object.
+    Blocking reads of files are done in thread, in-memory objects are read directly.
+    """
+
+    def __init__(self, source: UploadSource):
+        self._source = source
+        self._chunks: AsyncIterator[bytes] | None = (
+            aiter(source) if isinstance(source, AsyncIterable) else None
+        )
+        self._buffer = bytearray()
+        self._is_exhausted = False
+
+    async def read(self, size: int = -1) -> bytes:
+        await self._fill_buffer(size)
+
+        if size < 0 or size >= len(self._buffer):
+            read_bytes = bytes(self._buffer)
+            self._buffer.clear()
+            return read_bytes
+
+        read_bytes = bytes(self._buffer[:size])
+        self._buffer = self._buffer[size:]
+        return read_bytes
+
+    async def peek(self, size: int) -> bytes:
+        """Return up to `size` bytes without consuming them"""
+        await self._fill_buffer(size)
+        return bytes(self._buffer[:size])
+
+    async def _fill_buffer(self, size: int) -> None:
+        while not self._is_exhausted and (size < 0 or len(self._buffer) < size):
+            missing_size = size - len(self._buffer) if size >= 0 else -1
+            chunk = await self._read_chunk(missing_size)
+            if chunk:
+                self._buffer += chunk
+            else:
+                self._is_exhausted = True
+
+    async def _read_chunk(self, size: int) -> bytes:
+        if self._chunks is not None:
+            return await anext(self._chunks, b"")
+
+        file_source = cast(IO[bytes], self._source)
+        if asyncio.iscoroutinefunction(file_source.read):
+            # async file objects, e.g. aiofiles
+            return await file_source.read(size)  # type: ignore
+
+        if isinstance(file_source, (BytesIO, mmap.mmap)):
+            return file_source.read(size)
+
+        return await asyncio.to_thread(file_source.read, size)
+
+
+def _next_chunk(chunks: Iterator[bytes]) -> bytes:
+    return next(chunks, b"")
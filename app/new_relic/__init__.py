@@ -8,6 +8,7 @@ from app.base.components import BaseEnum
 from app.base.exception import BaseHTTPException
 
 TRANSACTION_PREFIX = "Python"
+CUSTOM_METRIC_PREFIX = "Custom"
 
 
 class TransactionGroupName(BaseEnum):
@@ -64,3 +65,13 @@ def notice_error(exception: Exception) -> None:
         nr_agent.notice_error(expected=True)
     else:
         nr_agent.notice_error()
+
+
+def record_custom_metric(metric_name: str, metric_value: float) -> None:
+    """Metric is recorded for the application, so it can be recorded by background tasks outside of transactions"""
+
+    nr_agent.record_custom_metric(
+        f"{CUSTOM_METRIC_PREFIX}/{metric_name}",
+        metric_value,
+        application=nr_agent.application(),
+    )
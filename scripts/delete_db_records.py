@@ -1,4 +1,11 @@
 import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
 
 import boto3
 from botocore import UNSIGNED
@@ -24,82 +31,190 @@ TABLES_AND_PRIMARY_KEY = (
 ENDPOINT_URL = "http://localhost:4566"
 AWS_REGION = "us-east-1"
 
+DEFAULT_TOTAL_SEGMENTS = 8
+DEFAULT_CHECKPOINT_PATH = "delete_db_records_checkpoint.json"
+# limit of BatchWriteItem request
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_MAX_ATTEMPTS = 8
+BATCH_RETRY_BASE_DELAY = 0.1
+
 
 client = boto3.client(  # noqa: S106
     "dynamodb",
     endpoint_url=ENDPOINT_URL,
     region_name=AWS_REGION,
-    config=Config(signature_version=UNSIGNED),
+    # adaptive mode slows down requests of all threads when table is throttled
+    config=Config(signature_version=UNSIGNED, retries={"max_attempts": 10, "mode": "adaptive"}),
 )
 logger = get_logger()
 filter_expression = " or ".join([f"attribute_not_exists({field})" for field in ABSENT_FIELDS])
 
 
-def get_records(table_name: str):
-    records = []
-    scan_kwargs = {
-        "TableName": table_name,
-        "FilterExpression": filter_expression
-    }
-    done = False
-    start_key = None
-    while not done:
-        if start_key:
-            scan_kwargs["ExclusiveStartKey"] = start_key
+class Checkpoint:
+    """
+    Last evaluated keys of scan segments, which are saved after every processed page.
+    Interrupted run continues every segment from its last processed page.
+    Checkpoint is valid only for the same number of segments.
+    """
+
+    def __init__(self, file_path: Path, total_segments: int, is_enabled: bool):
+        self.file_path = file_path
+        self.total_segments = total_segments
+        self.is_enabled = is_enabled
+
+        self._lock = threading.Lock()
+        self._segments: dict[str, dict] = self._load()
+
+    def get_segment(self, table_name: str, segment: int) -> tuple[dict | None, bool]:
+        """Return start key of the segment and whether the segment is already processed"""
+        segment_state = self._segments.get(f"{table_name}:{segment}", {})
+        return segment_state.get("start_key"), segment_state.get("is_done", False)
+
+    def save_segment(self, table_name: str, segment: int, start_key: dict | None) -> None:
+        if not self.is_enabled:
+            return
+
+        with self._lock:
+            segment_state = {"start_key": start_key, "is_done": start_key is None}
+            self._segments[f"{table_name}:{segment}"] = segment_state
+            checkpoint_state = {"total_segments": self.total_segments, "segments": self._segments}
+            tmp_file_path = self.file_path.with_suffix(".tmp")
+            tmp_file_path.write_text(json.dumps(checkpoint_state))
+            os.replace(tmp_file_path, self.file_path)
+
+    def clear(self) -> None:
+        if self.is_enabled:
+            self.file_path.unlink(missing_ok=True)
+
+    def _load(self) -> dict[str, dict]:
+        if not self.is_enabled or not self.file_path.exists():
+            return {}
+
+        checkpoint_state = json.loads(self.file_path.read_text())
+        if checkpoint_state.get("total_segments") != self.total_segments:
+            logger.warning(f"Checkpoint {self.file_path} is saved for another number of segments, it's ignored")
+            return {}
+
+        logger.info(f"Run is resumed from checkpoint {self.file_path}")
+        return checkpoint_state["segments"]
+
+
+class Progress:
+    def __init__(self, is_dry_run: bool):
+        self.action = "found" if is_dry_run else "deleted"
+
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+
+    def add(self, table_name: str, records_count: int) -> None:
+        with self._lock:
+            self._counts[table_name] = self._counts.get(table_name, 0) + records_count
+            table_count = self._counts[table_name]
+
+        logger.info(f"{table_count} records are {self.action} in {table_name} table")
+
+
+def write_batch(table_name: str, write_requests: list[dict]) -> None:
+    request_items = {table_name: write_requests}
+    for attempt_number in range(BATCH_MAX_ATTEMPTS):
+        if attempt_number:
+            time.sleep(BATCH_RETRY_BASE_DELAY * 2 ** (attempt_number - 1))
 
         try:
-            response = client.scan(**scan_kwargs)
+            response = client.batch_write_item(RequestItems=request_items)
         except ClientError as err:
             error_response = err.response["Error"]["Code"]
             error_message = err.response["Error"]["Message"]
-            logger.error(f"Couldn't scan for {table_name}. Here's why: {error_response}: {error_message}")
+            logger.error(f"Couldn't delete. Here's why: {error_response}: {error_message}")
             raise
 
-        records.extend(response.get("Items", []))
-        start_key = response.get("LastEvaluatedKey", None)
-        done = start_key is None
+        # throttled requests are returned as unprocessed items
+        request_items = response.get("UnprocessedItems") or {}
+        if not request_items:
+            return
 
-    return records
+    unprocessed_count = len(request_items[table_name])
+    raise RuntimeError(f"{unprocessed_count} records from {table_name} table weren't deleted")
 
 
-def delete_records(table_name: str, primary_key: str, records_ids: list[str]):
-    delete_params = {
+def delete_records(table_name: str, records_keys: list[dict]) -> None:
+    for chunk_start in range(0, len(records_keys), BATCH_WRITE_MAX_ITEMS):
+        write_batch(table_name, [
+            {"DeleteRequest": {"Key": record_key}}
+            for record_key in records_keys[chunk_start:chunk_start + BATCH_WRITE_MAX_ITEMS]
+        ])
+
+
+def process_segment(
+    table_name: str,
+    primary_key: str,
+    checkpoint: Checkpoint,
+    progress: Progress,
+    is_dry_run: bool,
+    segment: int,
+) -> int:
+    start_key, done = checkpoint.get_segment(table_name, segment)
+    scan_kwargs: dict = {
         "TableName": table_name,
-        "ConditionExpression": filter_expression,
-        "Key": {}
+        "FilterExpression": filter_expression,
+        "Segment": segment,
+        "TotalSegments": checkpoint.total_segments,
     }
+    if is_dry_run:
+        scan_kwargs["Select"] = "COUNT"
+    else:
+        scan_kwargs["ProjectionExpression"] = "#n_primary_key"
+        scan_kwargs["ExpressionAttributeNames"] = {"#n_primary_key": primary_key}
 
-    for record_id in records_ids:
-        delete_params.update({
-            "Key": {
-                primary_key: {
-                    "S": record_id
-                }
-            }
-        })
+    records_count = 0
+    while not done:
+        if start_key:
+            scan_kwargs["ExclusiveStartKey"] = start_key
 
-        logger.info(f"Deleting id {record_id} from {table_name} table")
         try:
-            client.delete_item(**delete_params)
+            response = client.scan(**scan_kwargs)
         except ClientError as err:
             error_response = err.response["Error"]["Code"]
             error_message = err.response["Error"]["Message"]
-            logger.error(f"Couldn't delete. Here's why: {error_response}: {error_message}")
+            logger.error(f"Couldn't scan for {table_name}. Here's why: {error_response}: {error_message}")
             raise
 
+        if not is_dry_run:
+            records_keys = [{primary_key: record[primary_key]} for record in response.get("Items", [])]
+            delete_records(table_name, records_keys)
 
-def main(env: str) -> None:
+        start_key = response.get("LastEvaluatedKey", None)
+        done = start_key is None
+        checkpoint.save_segment(table_name, segment, start_key)
+
+        records_count += response["Count"]
+        progress.add(table_name, response["Count"])
+
+    return records_count
+
+
+def main(env: str, total_segments: int, is_dry_run: bool, checkpoint_path: Path) -> None:
     prefix_env = "" if env == EnvironmentVariables.local else env
+    # dry run doesn't change tables, so it doesn't need to be resumed
+    checkpoint = Checkpoint(checkpoint_path, total_segments, is_enabled=not is_dry_run)
+    progress = Progress(is_dry_run)
 
-    for table_name, table_primary_key in TABLES_AND_PRIMARY_KEY:
-        enhanced_table_name = f"{prefix_env}{table_name}"
-        records = get_records(enhanced_table_name)
-        if not records:
-            logger.info(f"Records from {table_name} has not founded")
-            continue
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        for table_name, table_primary_key in TABLES_AND_PRIMARY_KEY:
+            enhanced_table_name = f"{prefix_env}{table_name}"
+            process_table_segment = partial(
+                process_segment,
+                enhanced_table_name,
+                table_primary_key,
+                checkpoint,
+                progress,
+                is_dry_run,
+            )
+            records_count = sum(executor.map(process_table_segment, range(total_segments)))
+            if not records_count:
+                logger.info(f"Records from {enhanced_table_name} has not founded")
 
-        records_ids = [record[table_primary_key]["S"] for record in records]
-        delete_records(table_name, table_primary_key, records_ids)
+    checkpoint.clear()
 
 
 if __name__ == "__main__":
@@ -121,8 +236,24 @@ if __name__ == "__main__":
         const=EnvironmentVariables.local,
         nargs="?"
     )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=DEFAULT_TOTAL_SEGMENTS,
+        help="Number of segments of parallel scan, every segment is processed in its own thread",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count records which would be deleted",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=Path(DEFAULT_CHECKPOINT_PATH),
+        help="File with progress of interrupted run, it's removed when all tables are processed",
+    )
 
     args = parser.parse_args()
-    env = args.env
 
-    main(env)
+    main(args.env, args.segments, args.dry_run, args.checkpoint)
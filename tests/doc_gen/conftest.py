@@ -1,9 +1,29 @@
+import sys
+from pathlib import Path
+from typing import AsyncIterator, Callable
+from unittest.mock import AsyncMock, Mock, PropertyMock
+
+import pytest
 import pytest_asyncio
 
 from app.container import Container
-from app.doc_generation.services import FileRegistryService
+from app.doc_generation.backends import (
+    AbstractConversionBackend,
+    ConversionCache,
+    LibreOfficeConversionBackend,
+    LibreOfficeProcessPool,
+)
+from app.doc_generation.services import FileRegistryService, WorkspaceManager
 from app.doc_generation.services.convertor import FileConvertorService
 from app.file_storage.service import FileStorageService
+from tests.doc_gen.constants import LOCAL_CONVERSION_RESULT, REMOTE_CONVERSION_RESULT
+
+WORKSPACE_QUOTA_IN_BYTES = 1024
+WORKSPACE_QUOTA_WAIT_TIMEOUT = 0.1
+WORKSPACE_ORPHAN_MAX_AGE_IN_SECONDS = 60
+CONVERSION_CACHE_MAX_LOCAL_SIZE_IN_BYTES = 1024
+CONVERSION_CACHE_TTL_IN_SECONDS = 3600
+FAKE_UNOSERVER_MODE = 0o755
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -19,3 +39,114 @@ async def convertor_service(app_container: Container) -> FileConvertorService:
 @pytest_asyncio.fixture(scope="session")
 async def register_service(app_container: Container) -> FileRegistryService:
     return await app_container.registry_service()  # type: ignore
+
+
+@pytest_asyncio.fixture
+async def workspace_manager_factory(tmp_path: Path) -> AsyncIterator[Callable[..., WorkspaceManager]]:
+    """Workspace managers share tmp dir as workers of the pod do, they are closed after the test"""
+    workspace_managers: list[WorkspaceManager] = []
+
+    def build_workspace_manager(quota_in_bytes: int = WORKSPACE_QUOTA_IN_BYTES) -> WorkspaceManager:
+        workspace_manager = WorkspaceManager(
+            root_path=tmp_path,
+            tmpfs_path=None,
+            quota_in_bytes=quota_in_bytes,
+            quota_wait_timeout=WORKSPACE_QUOTA_WAIT_TIMEOUT,
+            orphan_max_age_in_seconds=WORKSPACE_ORPHAN_MAX_AGE_IN_SECONDS,
+            janitor_interval_in_seconds=WORKSPACE_ORPHAN_MAX_AGE_IN_SECONDS,
+        )
+        workspace_managers.append(workspace_manager)
+        return workspace_manager
+
+    yield build_workspace_manager
+
+    for workspace_manager in workspace_managers:
+        await workspace_manager.close()
+
+
+@pytest.fixture
+def file_storage_mock() -> AsyncMock:
+    file_storage = AsyncMock(spec=FileStorageService)
+    file_storage.download_file.return_value = None
+    return file_storage
+
+
+@pytest_asyncio.fixture
+async def conversion_cache_factory(
+    file_storage_mock: AsyncMock,
+    main_bucket_name: str,
+) -> AsyncIterator[Callable[..., ConversionCache]]:
+    """Conversion caches store documents by mocked storage, their purge tasks are awaited after the test"""
+    conversion_caches: list[ConversionCache] = []
+
+    def build_conversion_cache(
+        max_local_size_in_bytes: int = CONVERSION_CACHE_MAX_LOCAL_SIZE_IN_BYTES,
+    ) -> ConversionCache:
+        conversion_cache = ConversionCache(
+            file_storage=file_storage_mock,
+            bucket_name=main_bucket_name,
+            is_enabled=True,
+            key_prefix="conversion-cache",
+            max_local_size_in_bytes=max_local_size_in_bytes,
+            ttl_in_seconds=CONVERSION_CACHE_TTL_IN_SECONDS,
+            conversion_backend="remote",
+            converter_version="gotenberg-7.7.0",
+        )
+        conversion_caches.append(conversion_cache)
+        return conversion_cache
+
+    yield build_conversion_cache
+
+    for conversion_cache in conversion_caches:
+        await conversion_cache.close()
+
+
+@pytest.fixture
+def process_pool_factory() -> Callable[..., LibreOfficeProcessPool]:
+    def build_process_pool(unoserver_path: str = "unoserver") -> LibreOfficeProcessPool:
+        return LibreOfficeProcessPool(
+            pool_size=2,
+            max_conversions_per_process=1,
+            unoserver_path=unoserver_path,
+            unoconvert_path="unoconvert",
+            start_timeout=1,
+            conversion_timeout=1,
+        )
+
+    return build_process_pool
+
+
+@pytest.fixture
+def fake_unoserver_factory(tmp_path: Path) -> Callable[..., str]:
+    """Fake unoserver listens on the given port (or only waits), so processes are started without LibreOffice"""
+
+    def build_fake_unoserver(is_listening: bool = True) -> str:
+        unoserver_path = tmp_path / f"unoserver_{is_listening}"
+        unoserver_path.write_text(
+            f"#!{sys.executable}\n"
+            + "import socket, sys, time\n"
+            + f"if {is_listening}:\n"
+            + "    port = int(sys.argv[sys.argv.index('--port') + 1])\n"
+            + "    server = socket.create_server(('127.0.0.1', port))\n"
+            + "time.sleep(60)\n",
+        )
+        unoserver_path.chmod(FAKE_UNOSERVER_MODE)
+        return str(unoserver_path)
+
+    return build_fake_unoserver
+
+
+@pytest.fixture
+def local_backend_mock() -> Mock:
+    local_backend = Mock(spec=LibreOfficeConversionBackend)
+    type(local_backend).has_capacity = PropertyMock(return_value=True)
+    local_backend.convert_docx_to_pdf = AsyncMock(return_value=LOCAL_CONVERSION_RESULT)
+    return local_backend
+
+
+@pytest.fixture
+def remote_backend_mock() -> Mock:
+    remote_backend = Mock(spec=AbstractConversionBackend)
+    remote_backend.convert_docx_to_pdf = AsyncMock(return_value=REMOTE_CONVERSION_RESULT)
+    remote_backend.convert_html_to_pdf = AsyncMock(return_value=REMOTE_CONVERSION_RESULT)
+    return remote_backend
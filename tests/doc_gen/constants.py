@@ -0,0 +1,2 @@
+LOCAL_CONVERSION_RESULT = b"local"
+REMOTE_CONVERSION_RESULT = b"remote"
@@ -0,0 +1,41 @@
+import uuid
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.config import settings
+from app.doc_generation.processors.document_buffer import DocumentBuffer
+from app.doc_generation.services.convertor import FileConvertorService
+from app.file_storage.service import FileStorageService
+
+
+@pytest.mark.asyncio
+async def test_should_store_identical_in_memory_and_spilled_documents_once(
+    mocker: MockerFixture,
+    convertor_service: FileConvertorService,
+    storage_service: FileStorageService,
+    main_bucket_name: str,
+    tmp_path: Path,
+):
+    mocker.patch.object(settings.doc_gen, "content_addressed_storage_enabled", new=True)
+    upload_file = mocker.spy(convertor_service.file_storage, "upload_file")
+    document_content = f"pdf {uuid.uuid4()}".encode()
+    another_document_content = f"another pdf {uuid.uuid4()}".encode()
+    spilled_document_path = tmp_path / "spilled.pdf"
+    spilled_document_path.write_bytes(document_content)
+
+    first_path = await convertor_service._save_document_buffer(DocumentBuffer(document_content))  # noqa: WPS437
+    second_path = await convertor_service._save_document_buffer(  # noqa: WPS437
+        DocumentBuffer.from_path(spilled_document_path),
+    )
+    another_path = await convertor_service._save_document_buffer(  # noqa: WPS437
+        DocumentBuffer(another_document_content),
+    )
+
+    stored_document = await storage_service.download_file(main_bucket_name, str(first_path))
+    assert first_path == second_path
+    assert another_path != first_path
+    assert first_path.parent == Path("documents")
+    assert stored_document is not None and stored_document.getvalue() == document_content
+    assert upload_file.await_count == 2
@@ -0,0 +1,186 @@
+import asyncio
+from pathlib import Path
+from typing import Callable
+from unittest.mock import Mock, PropertyMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.doc_generation.backends import (
+    CachedConversionBackend,
+    ConversionCache,
+    HybridConversionBackend,
+    LibreOfficeConversionBackend,
+    LibreOfficeProcessPool,
+)
+from app.doc_generation.backends.libreoffice_backend import UnoServerProcess
+from app.doc_generation.exception import LocalConversionException
+from tests.doc_gen.constants import LOCAL_CONVERSION_RESULT, REMOTE_CONVERSION_RESULT
+
+
+@pytest.mark.asyncio
+async def test_should_convert_docx_locally_when_pool_has_capacity(local_backend_mock: Mock, remote_backend_mock: Mock):
+    backend = HybridConversionBackend(local_backend_mock, remote_backend_mock, spill_to_remote=True)
+
+    converted_document = await backend.convert_docx_to_pdf(b"docx", "file.docx")
+
+    assert converted_document == LOCAL_CONVERSION_RESULT
+    remote_backend_mock.convert_docx_to_pdf.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_spill_docx_to_remote_when_pool_is_busy(local_backend_mock: Mock, remote_backend_mock: Mock):
+    type(local_backend_mock).has_capacity = PropertyMock(return_value=False)
+    backend = HybridConversionBackend(local_backend_mock, remote_backend_mock, spill_to_remote=True)
+
+    converted_document = await backend.convert_docx_to_pdf(b"docx", "file.docx")
+
+    assert converted_document == REMOTE_CONVERSION_RESULT
+    local_backend_mock.convert_docx_to_pdf.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_spill_docx_to_remote_when_local_conversion_failed(
+    local_backend_mock: Mock,
+    remote_backend_mock: Mock,
+):
+    local_backend_mock.convert_docx_to_pdf.side_effect = LocalConversionException("soffice crashed")
+    backend = HybridConversionBackend(local_backend_mock, remote_backend_mock, spill_to_remote=True)
+
+    converted_document = await backend.convert_docx_to_pdf(b"docx", "file.docx")
+
+    assert converted_document == REMOTE_CONVERSION_RESULT
+
+
+@pytest.mark.asyncio
+async def test_should_raise_error_when_local_conversion_failed_without_spill(
+    local_backend_mock: Mock,
+    remote_backend_mock: Mock,
+):
+    local_backend_mock.convert_docx_to_pdf.side_effect = LocalConversionException("soffice crashed")
+    backend = HybridConversionBackend(local_backend_mock, remote_backend_mock, spill_to_remote=False)
+
+    with pytest.raises(LocalConversionException):
+        await backend.convert_docx_to_pdf(b"docx", "file.docx")
+
+    remote_backend_mock.convert_docx_to_pdf.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_always_convert_html_remotely(local_backend_mock: Mock, remote_backend_mock: Mock):
+    backend = HybridConversionBackend(local_backend_mock, remote_backend_mock, spill_to_remote=False)
+
+    converted_document = await backend.convert_html_to_pdf(b"<html></html>")
+
+    assert converted_document == REMOTE_CONVERSION_RESULT
+
+
+@pytest.mark.asyncio
+async def test_should_convert_identical_rendered_documents_only_once(
+    conversion_cache_factory: Callable[..., ConversionCache],
+    remote_backend_mock: Mock,
+):
+    backend = CachedConversionBackend(remote_backend_mock, conversion_cache_factory())
+
+    first_document = await backend.convert_html_to_pdf(b"<html></html>", footer_file=b"footer")
+    second_document = await backend.convert_html_to_pdf(b"<html></html>", footer_file=b"footer")
+    await backend.convert_html_to_pdf(b"<html></html>", footer_file=b"another footer")
+
+    assert first_document == second_document == REMOTE_CONVERSION_RESULT
+    assert remote_backend_mock.convert_html_to_pdf.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_should_stop_started_processes_and_start_again_when_pool_start_failed(
+    mocker: MockerFixture,
+    process_pool_factory: Callable[..., LibreOfficeProcessPool],
+):
+    failed_profiles = {"1"}
+    stopped_profiles: list[str] = []
+
+    async def start_process(process: UnoServerProcess) -> None:
+        if process.profile_dir.name in failed_profiles:
+            raise LocalConversionException("soffice crashed")
+
+    async def stop_process(process: UnoServerProcess) -> None:
+        stopped_profiles.append(process.profile_dir.name)
+
+    mocker.patch.object(UnoServerProcess, "start", autospec=True, side_effect=start_process)
+    mocker.patch.object(UnoServerProcess, "stop", autospec=True, side_effect=stop_process)
+    process_pool = process_pool_factory()
+
+    with pytest.raises(LocalConversionException):
+        await process_pool.start()
+
+    failed_profiles.clear()
+    async with process_pool.acquire() as process:
+        assert process.profile_dir.name == "0"
+
+    assert sorted(stopped_profiles) == ["0", "1"]
+
+
+@pytest.mark.asyncio
+async def test_should_start_pools_of_several_workers_on_different_ports(
+    process_pool_factory: Callable[..., LibreOfficeProcessPool],
+    fake_unoserver_factory: Callable[..., str],
+):
+    unoserver_path = fake_unoserver_factory()
+    worker_pools = [process_pool_factory(unoserver_path=unoserver_path) for _ in range(2)]
+
+    start_results = await asyncio.gather(
+        *[worker_pool.start() for worker_pool in worker_pools],
+        return_exceptions=True,
+    )
+    started_processes = [
+        process for worker_pool in worker_pools for process in worker_pool._processes  # noqa: WPS437
+    ]
+    await asyncio.gather(*[worker_pool.close() for worker_pool in worker_pools])
+
+    assert start_results == [None, None]
+    used_ports = {port for process in started_processes for port in (process.port, process.uno_port)}
+    assert len(used_ports) == len(started_processes) * 2
+
+
+@pytest.mark.asyncio
+async def test_should_not_report_process_ready_when_port_is_listened_by_another_process(
+    mocker: MockerFixture,
+    fake_unoserver_factory: Callable[..., str],
+    tmp_path: Path,
+):
+    def close_connection(_: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.close()
+
+    another_server = await asyncio.start_server(close_connection, "127.0.0.1", 0)
+    another_port = another_server.sockets[0].getsockname()[1]
+    mocker.patch(
+        "app.doc_generation.backends.libreoffice_backend._pick_free_ports",
+        return_value=[another_port, another_port + 1],
+    )
+    process = UnoServerProcess(
+        profile_dir=tmp_path / "profile",
+        unoserver_path=fake_unoserver_factory(is_listening=False),
+        unoconvert_path="unoconvert",
+        start_timeout=1,
+    )
+
+    with pytest.raises(LocalConversionException, match="listened by another process"):
+        await process.start()
+
+    another_server.close()
+    await another_server.wait_closed()
+    assert not process.is_running
+
+
+@pytest.mark.asyncio
+async def test_should_spill_docx_to_remote_when_unoserver_is_not_installed(
+    process_pool_factory: Callable[..., LibreOfficeProcessPool],
+    remote_backend_mock: Mock,
+):
+    local_backend = LibreOfficeConversionBackend(process_pool_factory(unoserver_path="/not-installed/unoserver"))
+    backend = HybridConversionBackend(local_backend, remote_backend_mock, spill_to_remote=True)
+
+    converted_document = await backend.convert_docx_to_pdf(b"docx", "file.docx")
+
+    assert converted_document == REMOTE_CONVERSION_RESULT
+    # failed pool isn't started again by every document
+    assert not local_backend.has_capacity
@@ -0,0 +1,125 @@
+import asyncio
+import time
+import zipfile
+from io import BytesIO
+from typing import AsyncIterator, Callable
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.doc_generation.backends import ConversionCache
+
+
+def build_docx(date_time: tuple[int, int, int, int, int, int]) -> bytes:
+    docx_buffer = BytesIO()
+    with zipfile.ZipFile(docx_buffer, "w", compression=zipfile.ZIP_DEFLATED) as docx_file:
+        docx_file.writestr(zipfile.ZipInfo("word/document.xml", date_time=date_time), "<w:document/>")
+
+    return docx_buffer.getvalue()
+
+
+def get_storage_key(conversion_cache: ConversionCache, key: str) -> str:
+    generation = int(time.time() // conversion_cache.ttl_in_seconds)
+    return f"{conversion_cache.key_prefix}/{generation}/{key}.pdf"
+
+
+def test_should_build_different_keys_for_different_headers(conversion_cache_factory: Callable[..., ConversionCache]):
+    conversion_cache = conversion_cache_factory()
+    first_key = conversion_cache.build_key("html", b"<html></html>", b"header1", None)
+    second_key = conversion_cache.build_key("html", b"<html></html>", b"header2", None)
+
+    assert first_key != second_key
+    assert first_key == conversion_cache.build_key("html", b"<html></html>", b"header1", None)
+
+
+def test_should_build_docx_key_by_content_of_files_and_converter(
+    conversion_cache_factory: Callable[..., ConversionCache],
+):
+    conversion_cache = conversion_cache_factory()
+    first_docx = build_docx((2020, 1, 1, 0, 0, 0))
+    second_docx = build_docx((2021, 1, 1, 0, 0, 0))
+    docx_key = conversion_cache.build_docx_key(first_docx)
+
+    conversion_cache.key_namespace = "local:7.5"
+
+    assert first_docx != second_docx
+    assert docx_key != conversion_cache.build_docx_key(first_docx)
+    conversion_cache.key_namespace = "remote:gotenberg-7.7.0"
+    assert docx_key == conversion_cache.build_docx_key(second_docx)
+
+
+@pytest.mark.asyncio
+async def test_should_return_document_from_local_tier_without_storage_request(
+    conversion_cache_factory: Callable[..., ConversionCache],
+    file_storage_mock: AsyncMock,
+):
+    conversion_cache = conversion_cache_factory()
+
+    await conversion_cache.set("key", b"pdf")
+    cached_document = await conversion_cache.get("key")
+
+    assert cached_document is not None
+    assert cached_document == b"pdf"
+    file_storage_mock.upload_file.assert_awaited_once()
+    file_storage_mock.download_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_evict_least_recently_used_document_and_fall_back_to_storage(
+    conversion_cache_factory: Callable[..., ConversionCache],
+    file_storage_mock: AsyncMock,
+    main_bucket_name: str,
+):
+    conversion_cache = conversion_cache_factory(max_local_size_in_bytes=6)
+
+    await conversion_cache.set("first", b"111")
+    await conversion_cache.set("second", b"222")
+    await conversion_cache.get("first")
+    await conversion_cache.set("third", b"333")
+
+    file_storage_mock.download_file.return_value = BytesIO(b"222")
+    evicted_document = await conversion_cache.get("second")
+
+    assert evicted_document is not None
+    assert evicted_document == b"222"
+    evicted_key = get_storage_key(conversion_cache, "second")
+    file_storage_mock.download_file.assert_awaited_once_with(main_bucket_name, evicted_key)
+
+
+@pytest.mark.asyncio
+async def test_should_not_use_cache_when_disabled(
+    conversion_cache_factory: Callable[..., ConversionCache],
+    file_storage_mock: AsyncMock,
+):
+    conversion_cache = conversion_cache_factory()
+    conversion_cache.is_enabled = False
+
+    await conversion_cache.set("key", b"pdf")
+
+    assert await conversion_cache.get("key") is None
+    file_storage_mock.upload_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_purge_expired_generations_once_per_generation(
+    conversion_cache_factory: Callable[..., ConversionCache],
+    file_storage_mock: AsyncMock,
+    main_bucket_name: str,
+):
+    conversion_cache = conversion_cache_factory()
+    current_key = get_storage_key(conversion_cache, "current")
+    key_prefix = conversion_cache.key_prefix
+    expired_key = f"{key_prefix}/1/expired.pdf"
+
+    async def iterate_object_keys(*_) -> AsyncIterator[str]:
+        for object_key in (expired_key, current_key):
+            yield object_key
+
+    file_storage_mock.iterate_object_keys = MagicMock(side_effect=iterate_object_keys)
+    await conversion_cache.set("current", b"pdf")
+    await asyncio.sleep(0)
+    await conversion_cache.set("another", b"pdf")
+    await conversion_cache.close()
+
+    file_storage_mock.iterate_object_keys.assert_called_once_with(main_bucket_name, f"{key_prefix}/")
+    file_storage_mock.purge_prefix.assert_awaited_once_with(main_bucket_name, f"{key_prefix}/1/")
@@ -0,0 +1,53 @@
+import asyncio
+import gc
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.doc_generation.processors.document_buffer import MemoryBudget
+
+DOCUMENT_CONTENT = b"%PDF-1.4 document"
+
+
+@pytest.mark.asyncio
+async def test_should_keep_document_in_memory_while_it_fits_in_budget(tmp_path: Path):
+    memory_budget = MemoryBudget(max_size_in_bytes=1024, spill_threshold_in_bytes=1024)
+
+    document_buffer = await memory_budget.create_buffer(DOCUMENT_CONTENT, tmp_path / "document.pdf")
+
+    assert not document_buffer.is_spilled
+    assert memory_budget.used_size_in_bytes == len(DOCUMENT_CONTENT)
+    assert not (tmp_path / "document.pdf").exists()
+
+    del document_buffer  # noqa: WPS420
+    gc.collect()
+
+    assert memory_budget.used_size_in_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_should_spill_document_and_read_it_via_mmap_when_budget_is_exhausted(tmp_path: Path):
+    memory_budget = MemoryBudget(max_size_in_bytes=len(DOCUMENT_CONTENT), spill_threshold_in_bytes=1024)
+
+    in_memory_buffer = await memory_budget.create_buffer(DOCUMENT_CONTENT, tmp_path / "first.pdf")
+    spilled_buffer = await memory_budget.create_buffer(DOCUMENT_CONTENT, tmp_path / "second.pdf")
+
+    assert not in_memory_buffer.is_spilled
+    assert spilled_buffer.is_spilled
+    assert spilled_buffer.size == len(DOCUMENT_CONTENT)
+    with spilled_buffer.open() as document:
+        assert document.read() == DOCUMENT_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_should_spill_document_bigger_than_threshold_in_thread(tmp_path: Path, mocker: MockerFixture):
+    to_thread = mocker.spy(asyncio, "to_thread")
+    memory_budget = MemoryBudget(max_size_in_bytes=1024, spill_threshold_in_bytes=len(DOCUMENT_CONTENT) - 1)
+
+    document_buffer = await memory_budget.create_buffer(DOCUMENT_CONTENT, tmp_path / "document.pdf")
+
+    assert document_buffer.is_spilled
+    assert document_buffer.read_bytes() == DOCUMENT_CONTENT
+    assert memory_budget.used_size_in_bytes == 0
+    to_thread.assert_awaited_once()
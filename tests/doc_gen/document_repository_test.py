@@ -0,0 +1,60 @@
+import time
+import uuid
+
+import pytest
+
+from app.container import Container
+from app.doc_generation.models.document import DocumentPutItem, DocumentSearchItem
+
+ETAG = "legacy-etag"
+APP_VERSION = "legacy-version"
+EXPIRATION_IN_SECONDS = 60
+
+
+@pytest.mark.asyncio
+async def test_should_find_document_by_current_or_legacy_hash_in_one_scan(
+    app_container: Container,
+    main_bucket_name: str,
+):
+    repository = await app_container.document_repository()  # type: ignore
+    await repository.put_item(
+        DocumentPutItem(
+            etags=[ETAG],
+            bucket=main_bucket_name,
+            hashed_request="legacy-hash",
+            result_file="documents/legacy.pdf",
+            app_version=APP_VERSION,
+            expiration_time=int(time.time()) + EXPIRATION_IN_SECONDS,
+        ),
+    )
+    search_item = DocumentSearchItem(
+        etags=[ETAG],
+        bucket=main_bucket_name,
+        hashed_request="current-hash",
+        app_version=APP_VERSION,
+    )
+
+    found_without_legacy = await repository.search_item(search_item)
+    found_with_legacy = await repository.search_item(
+        search_item.copy(update={"legacy_hashed_request": "legacy-hash"}),
+    )
+
+    assert found_without_legacy is None
+    assert found_with_legacy is not None
+    assert found_with_legacy.result_file == "documents/legacy.pdf"
+
+
+@pytest.mark.asyncio
+async def test_should_grant_lease_to_one_holder_until_it_is_expired(app_container: Container):
+    repository = await app_container.document_repository()  # type: ignore
+    lease_id = f"lease-{uuid.uuid4()}"
+    expired_lease_id = f"expired-lease-{uuid.uuid4()}"
+
+    is_first_acquired = await repository.acquire_lease(lease_id, EXPIRATION_IN_SECONDS)
+    is_second_acquired = await repository.acquire_lease(lease_id, EXPIRATION_IN_SECONDS)
+    await repository.acquire_lease(expired_lease_id, -EXPIRATION_IN_SECONDS)
+    is_expired_acquired = await repository.acquire_lease(expired_lease_id, EXPIRATION_IN_SECONDS)
+
+    assert is_first_acquired
+    assert not is_second_acquired
+    assert is_expired_acquired
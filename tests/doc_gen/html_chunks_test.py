@@ -0,0 +1,21 @@
+from app.doc_generation.processors.html_template import split_html_into_chunks
+
+CHUNK_MARKER = "<!-- doc-gen:chunk-break -->"
+
+
+def test_should_split_body_and_keep_head_in_every_chunk():
+    head = "<html><head><style>p {color: red}</style></head><body class='report'>"
+    html_document = f"{head}<p>first</p>{CHUNK_MARKER}<p>second</p>{CHUNK_MARKER}</body></html>"
+
+    chunks = split_html_into_chunks(html_document, CHUNK_MARKER)
+
+    assert chunks == [
+        f"{head}<p>first</p></body></html>",
+        f"{head}<p>second</p></body></html>",
+    ]
+
+
+def test_should_not_split_document_without_body():
+    html_document = f"<p>first</p>{CHUNK_MARKER}<p>second</p>"
+
+    assert split_html_into_chunks(html_document, CHUNK_MARKER) == [html_document]
@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from botocore.exceptions import EndpointConnectionError
+
+from app.base.exception import BatchItemsNotProcessedException
+from app.doc_generation.index_writer import DocumentIndexWriter
+from app.doc_generation.models import DocumentPutItem
+from app.doc_generation.repository import DocumentRepository
+
+ITEMS_COUNT = 5
+
+
+def build_put_item(result_file: str) -> DocumentPutItem:
+    return DocumentPutItem(
+        etags=["etag"],
+        bucket="bucket",
+        hashed_request="hash",
+        result_file=result_file,
+        app_version="1.0",
+        expiration_time=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_write_queued_items_in_batches_and_flush_them_on_close():
+    document_repository = Mock(spec=DocumentRepository, batch_put_items=AsyncMock())
+    index_writer = DocumentIndexWriter(document_repository, is_enabled=True, batch_size=2, max_queue_size=10)
+    index_writer.start()
+
+    for item_number in range(ITEMS_COUNT):
+        await index_writer.put_item(build_put_item(f"documents/{item_number}.pdf"))
+    await index_writer.close()
+
+    written_items_count = sum(
+        len(call_args.args[0]) for call_args in document_repository.batch_put_items.await_args_list
+    )
+    assert index_writer.queue_depth == 0
+    assert written_items_count == ITEMS_COUNT
+
+
+@pytest.mark.asyncio
+async def test_should_count_failed_puts_without_stopping_writer():
+    document_repository = Mock(
+        spec=DocumentRepository,
+        batch_put_items=AsyncMock(side_effect=[BatchItemsNotProcessedException("Documents", 1), None]),
+    )
+    index_writer = DocumentIndexWriter(document_repository, is_enabled=True, batch_size=1, max_queue_size=10)
+    index_writer.start()
+
+    await index_writer.put_item(build_put_item("documents/first.pdf"))
+    await index_writer.put_item(build_put_item("documents/second.pdf"))
+    await index_writer.flush()
+    await index_writer.close()
+
+    assert index_writer.failed_puts_count == 1
+    assert document_repository.batch_put_items.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_should_keep_writing_after_connection_error_when_queue_is_full():
+    document_repository = Mock(
+        spec=DocumentRepository,
+        batch_put_items=AsyncMock(side_effect=[EndpointConnectionError(endpoint_url="http://dynamodb"), None, None]),
+    )
+    index_writer = DocumentIndexWriter(document_repository, is_enabled=True, batch_size=1, max_queue_size=1)
+    index_writer.start()
+
+    for item_number in range(3):
+        put_item_model = build_put_item(f"documents/{item_number}.pdf")
+        await asyncio.wait_for(index_writer.put_item(put_item_model), timeout=1)
+    await asyncio.wait_for(index_writer.close(), timeout=1)
+
+    assert index_writer.failed_puts_count == 1
+    assert document_repository.batch_put_items.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_should_write_item_immediately_when_write_behind_is_disabled():
+    document_repository = Mock(spec=DocumentRepository, batch_put_items=AsyncMock())
+    index_writer = DocumentIndexWriter(document_repository, is_enabled=False, batch_size=1, max_queue_size=10)
+    index_writer.start()
+
+    await index_writer.put_item(build_put_item("documents/first.pdf"))
+
+    document_repository.batch_put_items.assert_awaited_once()
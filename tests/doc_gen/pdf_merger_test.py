@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.doc_generation.exception import IncorrectProcessorState
+from app.doc_generation.processors import PdfMerger
+from app.doc_generation.processors.document_buffer import DocumentBuffer
+
+DOCUMENT_CONTENTS = (b"first", b"second", b"third", b"fourth")
+
+
+@pytest.fixture
+def concatenated_contents(mocker: MockerFixture) -> list[list[bytes]]:
+    """pdftk is replaced by concatenation, which records contents of merged files and checks the thread"""
+    concat_calls: list[list[bytes]] = []
+
+    def concat(document_paths: list[Path], merged_path: Path) -> None:
+        assert threading.current_thread() is not threading.main_thread()
+        concat_calls.append([Path(document_path).read_bytes() for document_path in document_paths])
+        merge_step = len(concat_calls)
+        merged_path.write_bytes(f"merged-{merge_step}".encode())
+
+    mocker.patch("pypdftk.concat", side_effect=concat)
+    return concat_calls
+
+
+@pytest.mark.asyncio
+async def test_should_append_documents_in_order_as_soon_as_previous_ones_are_added(
+    tmp_path: Path,
+    concatenated_contents: list[list[bytes]],
+):
+    spilled_path = tmp_path / "spilled.pdf"
+    spilled_path.write_bytes(DOCUMENT_CONTENTS[3])
+    merger = PdfMerger(documents_count=4, sub_dir=tmp_path)
+
+    await merger.add(0, DocumentBuffer(file_content=DOCUMENT_CONTENTS[0]))
+    await merger.add(1, DocumentBuffer(file_content=DOCUMENT_CONTENTS[1]))
+    await merger.add(3, DocumentBuffer.from_path(spilled_path))
+    appended_before_gap_is_filled = merger.appended_count
+    await merger.add(2, DocumentBuffer(file_content=DOCUMENT_CONTENTS[2]))
+    merged_document = await merger.merge()
+
+    assert appended_before_gap_is_filled == 2
+    second_step_contents = [b"merged-1", *DOCUMENT_CONTENTS[2:]]
+    assert concatenated_contents == [list(DOCUMENT_CONTENTS[:2]), second_step_contents]
+    assert merged_document.is_spilled
+    assert merged_document.read_bytes() == b"merged-2"
+    assert [merged_path.read_bytes() for merged_path in tmp_path.glob("merged_*")] == [b"merged-2"]
+
+
+@pytest.mark.asyncio
+async def test_should_append_documents_added_during_running_append_by_one_step(
+    tmp_path: Path,
+    concatenated_contents: list[list[bytes]],
+):
+    merger = PdfMerger(documents_count=3, sub_dir=tmp_path)
+
+    await asyncio.gather(*[
+        merger.add(document_number, DocumentBuffer(file_content=document_content))
+        for document_number, document_content in enumerate(DOCUMENT_CONTENTS[:3])
+    ])
+    merged_document = await merger.merge()
+
+    assert concatenated_contents == [list(DOCUMENT_CONTENTS[:3])]
+    assert merged_document.read_bytes() == b"merged-1"
+
+
+@pytest.mark.asyncio
+async def test_should_raise_error_when_not_all_documents_are_added(tmp_path: Path):
+    merger = PdfMerger(documents_count=2, sub_dir=tmp_path)
+    await merger.add(1, DocumentBuffer(file_content=b"document"))
+
+    with pytest.raises(IncorrectProcessorState):
+        await merger.merge()
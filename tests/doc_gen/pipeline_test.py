@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from app.doc_generation.processors.pipeline import PipelineStage
+
+DOCUMENTS_COUNT = 6
+PROCESSING_TIME = 0.01
+
+
+@pytest.mark.asyncio
+async def test_should_not_run_more_documents_than_stage_concurrency():
+    stage = PipelineStage("convert", concurrency=2)
+    in_progress_documents: set[int] = set()
+    in_progress_counts: list[int] = []
+
+    async def process_document(document_number: int) -> None:
+        async with stage:
+            in_progress_documents.add(document_number)
+            in_progress_counts.append(len(in_progress_documents))
+            await asyncio.sleep(PROCESSING_TIME)
+            in_progress_documents.remove(document_number)
+
+    await asyncio.gather(*[process_document(document_number) for document_number in range(DOCUMENTS_COUNT)])
+
+    assert max(in_progress_counts) == stage.concurrency
@@ -0,0 +1,83 @@
+import asyncio
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.doc_generation.models import DocumentDeleteItem, DocumentItemModel
+from app.doc_generation.repository import DocumentRepository
+from app.doc_generation.services import DocumentIndexReconciler
+
+EXISTING_DOCUMENT = "documents/existing.pdf"
+DELETED_DOCUMENT = "documents/deleted.pdf"
+STORED_AFTER_LISTING_DOCUMENT = "documents/stored-after-listing.pdf"
+RECONCILE_INTERVAL_IN_SECONDS = 0.01
+
+
+async def iterate_pages(*pages: list[DocumentItemModel]) -> AsyncIterator[list[DocumentItemModel]]:
+    for page in pages:
+        yield page
+
+
+async def iterate_object_keys(*object_keys: str) -> AsyncIterator[str]:
+    for object_key in object_keys:
+        yield object_key
+
+
+def build_reconciler(
+    document_repository: Mock,
+    file_storage_mock: AsyncMock,
+    main_bucket_name: str,
+) -> DocumentIndexReconciler:
+    return DocumentIndexReconciler(
+        document_repository=document_repository,
+        file_storage=file_storage_mock,
+        bucket_name=main_bucket_name,
+        documents_prefix="documents",
+        interval_in_seconds=RECONCILE_INTERVAL_IN_SECONDS,
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_evict_page_by_page_only_rows_which_point_to_deleted_objects(
+    file_storage_mock: AsyncMock,
+    main_bucket_name: str,
+):
+    document_repository = Mock(spec=DocumentRepository, delete_item=AsyncMock())
+    document_repository.iterate_item_pages.return_value = iterate_pages(
+        [
+            DocumentItemModel(bucket=main_bucket_name, result_file=EXISTING_DOCUMENT, item_id="1"),
+            DocumentItemModel(bucket=main_bucket_name, result_file=DELETED_DOCUMENT, item_id="2"),
+        ],
+        [
+            DocumentItemModel(bucket=main_bucket_name, result_file=DELETED_DOCUMENT, item_id="3"),
+            DocumentItemModel(bucket=main_bucket_name, result_file=STORED_AFTER_LISTING_DOCUMENT, item_id="4"),
+        ],
+    )
+    file_storage_mock.iterate_object_keys.return_value = iterate_object_keys(EXISTING_DOCUMENT)
+    file_storage_mock.is_object_exists.side_effect = lambda _, object_key: object_key == STORED_AFTER_LISTING_DOCUMENT
+
+    evicted_count = await build_reconciler(document_repository, file_storage_mock, main_bucket_name).reconcile()
+
+    assert evicted_count == 2
+    file_storage_mock.iterate_object_keys.assert_called_once_with(main_bucket_name, "documents")
+    assert file_storage_mock.is_object_exists.await_count == 3
+    deleted_items = [delete_call.args[0] for delete_call in document_repository.delete_item.await_args_list]
+    assert deleted_items == [DocumentDeleteItem(item_id="2"), DocumentDeleteItem(item_id="3")]
+
+
+@pytest.mark.asyncio
+async def test_should_not_reconcile_when_lease_is_held_by_another_worker(
+    file_storage_mock: AsyncMock,
+    main_bucket_name: str,
+):
+    document_repository = Mock(spec=DocumentRepository, acquire_lease=AsyncMock(return_value=False))
+    reconciler = build_reconciler(document_repository, file_storage_mock, main_bucket_name)
+
+    reconciler.start()
+    await asyncio.sleep(RECONCILE_INTERVAL_IN_SECONDS * 5)
+    await reconciler.close()
+
+    document_repository.acquire_lease.assert_awaited_with(reconciler.lease_id, reconciler.interval_in_seconds)
+    document_repository.iterate_item_pages.assert_not_called()
+    file_storage_mock.iterate_object_keys.assert_not_called()
@@ -0,0 +1,38 @@
+import asyncio
+import functools
+from io import BytesIO
+
+import pytest
+from docxtpl import DocxTemplate
+
+from app.doc_generation.processors.renderers import (
+    create_render_process_pool,
+    render_docx_document,
+    render_html_document,
+)
+from tests.constants import DATA_CONTAINER_PATH, TEMPLATE1_DOCX
+
+
+@pytest.mark.asyncio
+async def test_should_render_documents_in_process_pool():
+    docx_template = (DATA_CONTAINER_PATH / TEMPLATE1_DOCX).read_bytes()
+    docx_variables = dict.fromkeys(
+        DocxTemplate(BytesIO(docx_template)).get_undeclared_template_variables(),
+        "value",
+    )
+
+    loop = asyncio.get_running_loop()
+    with create_render_process_pool(pool_size=1) as process_pool:
+        rendered_html, rendered_docx = await asyncio.gather(
+            loop.run_in_executor(
+                process_pool,
+                functools.partial(render_html_document, b"<p>{{ name }}</p>", {"name": "Lorem"}),
+            ),
+            loop.run_in_executor(
+                process_pool,
+                functools.partial(render_docx_document, docx_template, docx_variables),
+            ),
+        )
+
+    assert rendered_html == b"<p>Lorem</p>"
+    assert rendered_docx.startswith(b"PK")
@@ -0,0 +1,47 @@
+import dataclasses
+
+from app.doc_generation.models import TemplateModel, generate_hash_from_templates
+from app.doc_generation.models.template import ImageTemplateModel
+
+# hashes of the same template, which were generated before, have to be still valid to find stored documents
+STORED_TEMPLATE_HASH = "v2:ff8c1e45855c7ebdef654182ee8e1b32"
+STORED_TEMPLATE_LEGACY_HASH = "08388dad9a0cc3b746d3552402e0ecf7"
+STORED_IMAGE_HASH = "v2:5483690135c7d7d2e813a7a8d444bfbe"
+
+
+def build_template_model(order: int = -1) -> TemplateModel:
+    return TemplateModel(
+        file_etag="etag",
+        variables={"name": "Name", "amount": 1},
+        bucket="bucket",
+        template_path="templates/template.docx",
+        order=order,
+        header_etag="h",
+        images=(ImageTemplateModel(file_etag="i", width=1, height=2, variable_name="logo"),),
+    )
+
+
+def test_should_not_include_template_order_in_hash():
+    template_model = build_template_model()
+    reordered_template_model = dataclasses.replace(template_model, order=1)
+
+    assert template_model.hashed_template.startswith("v2:")
+    assert reordered_template_model.hashed_template == template_model.hashed_template
+
+
+def test_should_generate_the_same_hashes_as_stored_documents_have():
+    template_model = build_template_model(order=3)
+
+    assert template_model.hashed_template == STORED_TEMPLATE_HASH
+    assert template_model.generate_legacy_hash() == STORED_TEMPLATE_LEGACY_HASH
+    assert template_model.images is not None
+    assert template_model.images[0].hashed_image_model == STORED_IMAGE_HASH
+
+
+def test_should_generate_different_merge_hashes_for_different_variables():
+    first_hash = generate_hash_from_templates(["etag"], "bucket", {"name": "first"})
+    second_hash = generate_hash_from_templates(["etag"], "bucket", {"name": "second"})
+    legacy_hash = generate_hash_from_templates(["etag"], "bucket", {"name": "first"}, is_legacy=True)
+
+    assert first_hash != second_hash
+    assert not legacy_hash.startswith("v2:")
@@ -0,0 +1,31 @@
+import threading
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.doc_generation.processors.document_buffer import DocumentBuffer
+from app.doc_generation.processors.pdf_utils import apply_watermark_to_document
+
+
+@pytest.mark.asyncio
+async def test_should_stamp_spilled_document_by_its_file_in_thread(tmp_path: Path, mocker: MockerFixture):
+    stamped_paths: list[Path] = []
+
+    def stamp(document_path: Path, watermark_path: Path, output_path: Path) -> None:
+        assert threading.current_thread() is not threading.main_thread()
+        stamped_paths.append(document_path)
+        output_path.write_bytes(document_path.read_bytes() + watermark_path.read_bytes())
+
+    mocker.patch("pypdftk.stamp", side_effect=stamp)
+    spilled_path = tmp_path / "merged.pdf"
+    spilled_path.write_bytes(b"document")
+
+    stamped_document = await apply_watermark_to_document(
+        DocumentBuffer.from_path(spilled_path),
+        b"+watermark",
+        tmp_path,
+    )
+
+    assert stamped_paths == [spilled_path]
+    assert stamped_document.read_bytes() == b"document+watermark"
@@ -0,0 +1,115 @@
+import asyncio
+import fcntl
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from app.doc_generation.exception import WorkspaceQuotaExceededException
+from app.doc_generation.processors import gather_or_cancel
+from app.doc_generation.services import WorkspaceManager
+
+WorkspaceManagerFactory = Callable[..., WorkspaceManager]
+
+
+@pytest.mark.asyncio
+async def test_should_remove_workspace_and_owner_dir(
+    tmp_path: Path,
+    workspace_manager_factory: WorkspaceManagerFactory,
+):
+    workspace_manager = workspace_manager_factory()
+    workspace_paths: list[Path] = []
+
+    with pytest.raises(RuntimeError):
+        async with workspace_manager.workspace() as workspace_path:
+            workspace_paths.append(workspace_path)
+            (workspace_path / "document.pdf").write_bytes(b"pdf")
+            raise RuntimeError("generation failed")
+
+    assert not workspace_paths[0].exists()
+    await workspace_manager.close()
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_should_raise_error_when_quota_is_exceeded_by_workspaces_of_all_workers(
+    workspace_manager_factory: WorkspaceManagerFactory,
+):
+    workspace_manager = workspace_manager_factory(quota_in_bytes=2)
+    another_worker_manager = workspace_manager_factory(quota_in_bytes=2)
+
+    async with another_worker_manager.workspace() as another_workspace_path:
+        (another_workspace_path / "document.pdf").write_bytes(b"pdf")
+
+        async with workspace_manager.workspace():
+            with pytest.raises(WorkspaceQuotaExceededException):
+                async with workspace_manager.workspace():
+                    pytest.fail("workspace mustn't be created over quota")
+
+
+@pytest.mark.asyncio
+async def test_should_remove_only_old_orphans_and_dirs_of_dead_workers(
+    tmp_path: Path,
+    workspace_manager_factory: WorkspaceManagerFactory,
+):
+    workspace_manager = workspace_manager_factory()
+    alive_worker_manager = workspace_manager_factory()
+    orphan_path = tmp_path / "orphan"
+    orphan_path.mkdir()
+    old_time = time.time() - workspace_manager.orphan_max_age_in_seconds * 2
+    os.utime(orphan_path, (old_time, old_time))
+    (tmp_path / "watermark_hash.pdf").write_bytes(b"pdf")
+    dead_worker_path = tmp_path / "worker-dead"
+    dead_worker_path.mkdir()
+    (dead_worker_path / ".lock").touch()
+
+    async with alive_worker_manager.workspace() as alive_workspace_path:
+        async with workspace_manager.workspace() as workspace_path:
+            os.utime(workspace_path, (old_time, old_time))
+            removed_count = await workspace_manager.remove_orphans()
+
+            assert workspace_path.exists() and alive_workspace_path.exists()
+
+    assert removed_count == 2
+    assert not orphan_path.exists()
+    assert not dead_worker_path.exists()
+    assert (tmp_path / "watermark_hash.pdf").exists()
+
+
+@pytest.mark.asyncio
+async def test_should_hold_lock_of_owner_dir_until_manager_is_closed(
+    workspace_manager_factory: WorkspaceManagerFactory,
+):
+    workspace_manager = workspace_manager_factory()
+    async with workspace_manager.workspace() as workspace_path:
+        lock_path = workspace_path.parent / ".lock"
+
+    with open(lock_path, mode="rb") as owner_lock:
+        with pytest.raises(BlockingIOError):
+            fcntl.flock(owner_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    await workspace_manager.close()
+
+    assert not lock_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_should_cancel_and_await_sibling_tasks_when_one_of_them_failed():
+    cancelled_tasks: list[str] = []
+
+    async def write_document() -> None:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled_tasks.append("write_document")
+            raise
+
+    async def fail_generation() -> None:
+        raise RuntimeError("generation failed")
+
+    with pytest.raises(RuntimeError):
+        await gather_or_cancel(write_document(), fail_generation())
+
+    assert cancelled_tasks == ["write_document"]
@@ -0,0 +1,79 @@
+from typing import Callable
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.base.exception import BatchItemsNotProcessedException
+from app.container import Container
+from app.esign.models.envelope_callback import (
+    EnvelopeCallbackDeleteItem,
+    EnvelopeCallbackPutItem,
+    EnvelopeCallbackSearchItem,
+)
+from app.esign.repositories import EnvelopeCallbackRepository
+
+ITEMS_COUNT = 30
+
+
+def build_put_item(envelope_id: str) -> EnvelopeCallbackPutItem:
+    return EnvelopeCallbackPutItem(
+        envelope_id=envelope_id,
+        callback_url=f"https://callback.example/{envelope_id}",
+        expiration_time=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_put_and_get_items_in_batches_in_order_of_keys(app_container: Container):
+    repository = await app_container.envelope_callback_repository()  # type: ignore
+    envelope_ids = [f"batch-envelope-{item_number}" for item_number in range(ITEMS_COUNT)]
+
+    await repository.batch_put_items([build_put_item(envelope_id) for envelope_id in envelope_ids])
+    searched_ids = list(reversed(envelope_ids)) + ["missing-envelope"]
+    found_items = await repository.batch_get_items(
+        [EnvelopeCallbackSearchItem(envelope_id=envelope_id) for envelope_id in searched_ids]
+    )
+
+    for envelope_id in envelope_ids:
+        await repository.delete_item(EnvelopeCallbackDeleteItem(envelope_id=envelope_id))
+
+    found_ids = [found_item.envelope_id if found_item else None for found_item in found_items]
+    assert found_ids == searched_ids[:-1] + [None]
+
+
+@pytest.mark.asyncio
+async def test_should_retry_unprocessed_items(
+    envelope_callback_repository_factory: Callable[..., EnvelopeCallbackRepository],
+    dynamodb_client_mock: AsyncMock,
+    envelope_callbacks_table_name: str,
+):
+    unprocessed_request = {"PutRequest": {"Item": {"envelope_id": {"S": "second"}}}}
+    dynamodb_client_mock.batch_write_item.side_effect = [
+        {"UnprocessedItems": {envelope_callbacks_table_name: [unprocessed_request]}},
+        {"UnprocessedItems": {}},
+    ]
+    repository = envelope_callback_repository_factory()
+
+    await repository.batch_put_items([build_put_item("first"), build_put_item("second")])
+
+    assert dynamodb_client_mock.batch_write_item.await_count == 2
+    dynamodb_client_mock.batch_write_item.assert_awaited_with(
+        RequestItems={envelope_callbacks_table_name: [unprocessed_request]},
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_raise_exception_when_items_are_still_unprocessed(
+    envelope_callback_repository_factory: Callable[..., EnvelopeCallbackRepository],
+    dynamodb_client_mock: AsyncMock,
+    envelope_callbacks_table_name: str,
+):
+    dynamodb_client_mock.batch_get_item.return_value = {
+        "UnprocessedKeys": {envelope_callbacks_table_name: {"Keys": [{"envelope_id": {"S": "first"}}]}},
+    }
+    repository = envelope_callback_repository_factory()
+
+    with pytest.raises(BatchItemsNotProcessedException):
+        await repository.batch_get_items([EnvelopeCallbackSearchItem(envelope_id="first")])
+
+    assert dynamodb_client_mock.batch_get_item.await_count == repository.batch_max_attempts
@@ -1,14 +1,17 @@
 import uuid
-from typing import AsyncGenerator, Generator
-from unittest.mock import Mock
+from typing import AsyncGenerator, Callable, Generator
+from unittest.mock import AsyncMock, Mock, PropertyMock
 
 import pytest
 import pytest_asyncio
+from httpx import AsyncClient, MockTransport
 from pytest_mock import MockerFixture
 
+from app.config import DocuSignSettings
 from app.container import Container
 from app.esign.enum import EnvelopeStatusEnum
 from app.esign.models.envelope import DocumentItem, EnvelopeDeleteItem, EnvelopePutItem, SignerItem
+from app.esign.native_client import NativeDocuSignClient
 from app.esign.repositories.envelope import EnvelopeRepository
 from app.esign.repositories.envelope_callback import EnvelopeCallbackRepository
 from app.esign.schema.envelope import (
@@ -20,9 +23,12 @@ from app.esign.schema.envelope import (
 from app.esign.schema.tab import DSInitialHereTab
 from app.esign.services import ESignEnvelopeService
 from app.file_storage.service import FileStorageService
+from tests.esign.constants import DOCUSIGN_BASE_URL
 
 ANCHOR_Y_OFFSET = 40
 ANCHOR_X_OFFSET = 20
+ITEM_LOADER_BATCH_WINDOW_IN_SECONDS = 0.01
+ITEM_LOADER_MAX_BATCH_SIZE = 10
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -152,3 +158,52 @@ async def pre_stored_envelopes(app_container: Container):
 
     await repository.delete_item(EnvelopeDeleteItem(envelope_id=envelope_creating.envelope_id))
     await repository.delete_item(EnvelopeDeleteItem(envelope_id=envelope_sent.envelope_id))
+
+
+@pytest.fixture(scope="session")
+def envelope_callbacks_table_name(global_settings: dict) -> str:
+    return global_settings["dynamo_storage"]["envelope_callbacks_table_name"]
+
+
+@pytest.fixture(scope="function")
+def dynamodb_client_mock() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture(scope="function")
+def envelope_callback_repository_factory(
+    dynamodb_client_mock: AsyncMock,
+    envelope_callbacks_table_name: str,
+) -> Callable[..., EnvelopeCallbackRepository]:
+    """Repositories send requests by mocked DynamoDB client and retry unprocessed items without delay"""
+
+    def build_repository(item_loader_enabled: bool = False) -> EnvelopeCallbackRepository:
+        repository = EnvelopeCallbackRepository(
+            dynamodb_client_mock,
+            envelope_callbacks_table_name,
+            item_loader_enabled=item_loader_enabled,
+            item_loader_batch_window_in_seconds=ITEM_LOADER_BATCH_WINDOW_IN_SECONDS,
+            item_loader_max_batch_size=ITEM_LOADER_MAX_BATCH_SIZE,
+        )
+        repository.batch_retry_base_delay = 0
+        return repository
+
+    return build_repository
+
+
+@pytest.fixture(scope="function")
+def native_client_factory(
+    mocker: MockerFixture,
+    mock_docusign_api_client: Generator,
+) -> Callable[..., NativeDocuSignClient]:
+    """Native clients send requests to handler of mocked transport with already requested token"""
+    mocker.patch.object(DocuSignSettings, "private_key", new_callable=PropertyMock, return_value="private-key")
+
+    def build_native_client(handle_request) -> NativeDocuSignClient:
+        native_client = NativeDocuSignClient(
+            http_client=AsyncClient(base_url=DOCUSIGN_BASE_URL, transport=MockTransport(handle_request)),
+        )
+        native_client._client.set_default_header("Authorization", "Bearer token")  # noqa: WPS437
+        return native_client
+
+    return build_native_client
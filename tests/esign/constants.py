@@ -3,6 +3,7 @@ from typing import cast
 
 MULTIPLIER = 12
 EMAIL_SUBJECT = "emailSubject"
+DOCUSIGN_BASE_URL = "https://docusign.test/restapi/v2.1/accounts/account-id"
 
 _REQUEST_WITH_ALL_TABS = MappingProxyType({
     "emailSubject": "Please sign this document",
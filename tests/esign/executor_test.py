@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import status
+
+from app.esign.exception import DocuSignExecutorSaturatedException
+from app.esign.executor import DocuSignExecutor
+
+
+@pytest.mark.asyncio
+async def test_should_queue_calls_over_workers_and_reject_calls_over_queue():
+    executor = DocuSignExecutor(max_workers=1, max_queue_size=1)
+    release_event = threading.Event()
+    thread_names: list[str] = []
+
+    def blocking_call(call_result: str) -> str:
+        thread_names.append(threading.current_thread().name)
+        release_event.wait()
+        return call_result
+
+    running_call = asyncio.create_task(executor.run(blocking_call, "first"))
+    queued_call = asyncio.create_task(executor.run(blocking_call, call_result="second"))
+    await asyncio.sleep(0.1)
+    queue_depth = executor.queue_depth
+
+    try:
+        await executor.run(blocking_call, "rejected")
+    except DocuSignExecutorSaturatedException as exception:
+        assert exception.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    else:
+        raise AssertionError()
+
+    release_event.set()
+    call_results = await asyncio.gather(running_call, queued_call)
+
+    assert queue_depth == 1
+    assert call_results == ["first", "second"]
+    assert all(thread_name.startswith("docusign") for thread_name in thread_names)
+    assert executor.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_should_not_reject_calls_of_reserved_worker_when_queue_is_full():
+    executor = DocuSignExecutor(max_workers=1, max_queue_size=1)
+    call_results: list[int] = []
+
+    async with executor.reserve_worker() as run_in_worker:
+        queued_call = asyncio.create_task(executor.run(len, b"queued"))
+        await asyncio.sleep(0.1)
+
+        for chunk in (b"first", b"second", b"third"):
+            call_results.append(await run_in_worker(len, chunk))
+
+        with pytest.raises(DocuSignExecutorSaturatedException):
+            await executor.run(len, b"rejected")
+
+    assert await queued_call == len(b"queued")
+    assert call_results == [len(b"first"), len(b"second"), len(b"third")]
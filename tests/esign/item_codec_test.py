@@ -0,0 +1,71 @@
+from datetime import timezone
+
+from app.base.codec import parse_datetime
+from app.doc_generation.models import DocumentItemModel, DocumentPutItem
+from app.esign.models.envelope import DocumentItem, EnvelopeItemModel, EnvelopePutItem, SignerItem
+
+TABLE_NAME = "Table"
+
+
+def test_should_decode_encoded_envelope_without_losing_nested_items():
+    envelope_put_item = EnvelopePutItem(
+        envelope_id="envelope",
+        envelope_status="sent",
+        status_changed_date_time="2022-12-07T13:50:35.08Z",
+        expiration_time=None,
+        signers=[SignerItem(email="signer@email.example", recipient_id="1", recipient_id_guid="guid", status="sent")],
+        documents=[
+            DocumentItem(
+                document_id="1",
+                document_id_guid="guid",
+                name="Document name",
+                uri="envelopes/envelope/1",
+                order=1,
+                document_path=None,
+                document_bucket_name=None,
+            ),
+        ],
+    )
+
+    put_item_object = envelope_put_item.to_put_item_object(TABLE_NAME)
+    envelope = EnvelopeItemModel.from_record(dict(put_item_object["Item"]))
+
+    assert "expiration_time" not in put_item_object["Item"]
+    assert envelope is not None
+    assert envelope.status_changed_date_time == envelope_put_item.status_changed_date_time
+    assert envelope.signers == envelope_put_item.signers
+    assert envelope.documents == envelope_put_item.documents
+
+
+def test_should_store_document_in_index_columns():
+    document_put_item = DocumentPutItem(
+        etags=["first", "second"],
+        bucket="bucket",
+        hashed_request="v2:hash",
+        result_file="documents/result.pdf",
+        app_version="1.0",
+        expiration_time=1,
+    )
+
+    put_item_object = document_put_item.to_put_item_object(TABLE_NAME)
+    document = DocumentItemModel.from_record(dict(put_item_object["Item"]))
+
+    assert put_item_object["TableName"] == TABLE_NAME
+    assert put_item_object["Item"]["etags"] == {"S": "first,second"}
+    assert put_item_object["Item"]["data"] == {"B": b"v2:hash"}
+    assert document == DocumentItemModel(
+        bucket="bucket",
+        result_file="documents/result.pdf",
+        item_id=str(document_put_item.item_id),
+    )
+
+
+def test_should_return_none_when_required_column_is_missing():
+    assert DocumentItemModel.from_record({"bucket": {"S": "bucket"}}) is None
+
+
+def test_should_parse_datetime_in_other_format_by_fallback():
+    parsed_datetime = parse_datetime("2022-12-07T13:50:35.000000Z")
+
+    assert parsed_datetime.tzinfo == timezone.utc
+    assert parse_datetime("2022-12-07T13:50:35+00:00") == parsed_datetime
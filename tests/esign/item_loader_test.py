@@ -0,0 +1,60 @@
+import asyncio
+from typing import Callable
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.esign.models.envelope_callback import EnvelopeCallbackSearchItem
+from app.esign.repositories import EnvelopeCallbackRepository
+
+ENVELOPE_IDS = ("first", "second", "third")
+
+
+def build_record(envelope_id: str) -> dict:
+    return {
+        "envelope_id": {"S": envelope_id},
+        "callback_url": {"S": f"https://callback.example/{envelope_id}"},
+        "created_at": {"S": "2022-12-07T13:50:35.08Z"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_should_load_concurrent_lookups_by_one_batch_request(
+    envelope_callback_repository_factory: Callable[..., EnvelopeCallbackRepository],
+    dynamodb_client_mock: AsyncMock,
+    envelope_callbacks_table_name: str,
+):
+    dynamodb_client_mock.batch_get_item.return_value = {
+        "Responses": {
+            envelope_callbacks_table_name: [build_record(envelope_id) for envelope_id in ENVELOPE_IDS[:2]],
+        },
+    }
+    repository = envelope_callback_repository_factory(item_loader_enabled=True)
+
+    found_items = await asyncio.gather(*[
+        repository.get_item(EnvelopeCallbackSearchItem(envelope_id=envelope_id))
+        for envelope_id in ENVELOPE_IDS
+    ])
+
+    found_ids = [found_item.envelope_id if found_item else None for found_item in found_items]
+    assert found_ids == ["first", "second", None]
+    dynamodb_client_mock.batch_get_item.assert_awaited_once()
+    dynamodb_client_mock.get_item.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_coalesce_identical_concurrent_scans(
+    envelope_callback_repository_factory: Callable[..., EnvelopeCallbackRepository],
+    dynamodb_client_mock: AsyncMock,
+):
+    dynamodb_client_mock.scan.return_value = {"Items": [build_record("first")]}
+    repository = envelope_callback_repository_factory(item_loader_enabled=True)
+
+    found_items = await asyncio.gather(*[
+        repository.search_item(EnvelopeCallbackSearchItem(envelope_id="first"))
+        for _ in range(len(ENVELOPE_IDS))
+    ])
+
+    assert found_items[0] is not None
+    assert all(found_item == found_items[0] for found_item in found_items)
+    dynamodb_client_mock.scan.assert_awaited_once()
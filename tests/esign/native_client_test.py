@@ -0,0 +1,67 @@
+import json
+import uuid
+from typing import Callable
+from unittest.mock import AsyncMock
+
+import docusign_esign
+import pytest
+from fastapi import status
+from httpx import Request, Response
+from pytest_mock import MockerFixture
+
+from app.esign.enum import ExcErrorCodeEnum
+from app.esign.exception import DynamicDocuSignException
+from app.esign.native_client import NativeDocuSignClient
+from tests.esign.constants import DOCUSIGN_BASE_URL
+
+
+@pytest.mark.asyncio
+async def test_should_send_sdk_model_as_json_and_return_sdk_model(
+    native_client_factory: Callable[..., NativeDocuSignClient],
+):
+    envelope_id = str(uuid.uuid4())
+    sent_requests: list[Request] = []
+
+    def handle_request(request: Request) -> Response:
+        sent_requests.append(request)
+        return Response(status.HTTP_201_CREATED, json={"envelopeId": envelope_id, "status": "sent"})
+
+    native_client = native_client_factory(handle_request)
+    envelope_summary = await native_client.create_envelope(
+        docusign_esign.EnvelopeDefinition(email_subject="Subject", status="sent"),
+    )
+
+    assert isinstance(envelope_summary, docusign_esign.EnvelopeSummary)
+    assert envelope_summary.envelope_id == envelope_id
+    assert sent_requests[0].url == f"{DOCUSIGN_BASE_URL}/envelopes"
+    assert sent_requests[0].headers["Authorization"] == "Bearer token"
+    assert json.loads(sent_requests[0].content) == {"emailSubject": "Subject", "status": "sent"}
+
+
+@pytest.mark.asyncio
+async def test_should_refresh_token_and_retry_once_when_request_is_unauthorized(
+    mocker: MockerFixture,
+    native_client_factory: Callable[..., NativeDocuSignClient],
+):
+    envelope_id = str(uuid.uuid4())
+    auth_error = {"errorCode": ExcErrorCodeEnum.authentication_failed.value, "message": "Expired token"}
+    responses = [
+        Response(status.HTTP_401_UNAUTHORIZED, json=auth_error),
+        Response(status.HTTP_200_OK, json={"envelopeDocuments": [{"documentId": "1"}]}),
+        Response(status.HTTP_404_NOT_FOUND, json={"errorCode": "ENVELOPE_DOES_NOT_EXIST", "message": "Not found"}),
+    ]
+
+    native_client = native_client_factory(lambda _: responses.pop(0))
+    refresh_access_token = mocker.patch.object(native_client, "refresh_access_token", new_callable=AsyncMock)
+    documents_result = await native_client.list_documents(envelope_id)
+
+    refresh_access_token.assert_awaited_once()
+    assert documents_result.envelope_documents[0].document_id == "1"
+
+    try:
+        await native_client.get_recipients(envelope_id)
+    except DynamicDocuSignException as exception:
+        assert exception.status_code == status.HTTP_404_NOT_FOUND
+        assert exception.field_value == envelope_id
+    else:
+        raise AssertionError()
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from io import BytesIO
+from typing import AsyncIterator
 from unittest.mock import AsyncMock, Mock
 
 import pytest
@@ -120,20 +120,26 @@ async def test_should_return200_and_save_file_without_certificate_when_status_is
     docusign_client_mock = AsyncMock(spec=DocuSignClient)
     docusign_client_mock.list_documents.return_value = envelope_documents_response
 
-    with open(DATA_CONTAINER_PATH / SIGNED_DOCUMENT_PDF, mode="rb") as signed_document_file:
-        docusign_client_mock.get_document_by_id.return_value = BytesIO(signed_document_file.read())
+    signed_document = (DATA_CONTAINER_PATH / SIGNED_DOCUMENT_PDF).read_bytes()
+
+    async def stream_document_by_id(document_id: str, envelope_id: str) -> AsyncIterator[bytes]:
+        for chunk_start in range(0, len(signed_document), 1024):
+            yield signed_document[chunk_start:chunk_start + 1024]
+
+    docusign_client_mock.stream_document_by_id.side_effect = stream_document_by_id
 
     app_container.esign_webhook_service.reset()
     with app_container.docusign_client.override(docusign_client_mock):
         response = await client.post(ESIGN_WEBHOOK_ADDRESS, json=request)
 
     document_path = f"signed-documents/{envelope_id}/{document_id}.pdf"
-    is_document_exist = await storage_service.is_object_exists(main_bucket_name, document_path)
+    stored_document = await storage_service.download_file(main_bucket_name, document_path)
 
     certificate_path = f"signed-documents/{envelope_id}/{certificate_id}.pdf"
     is_certificate_exist = await storage_service.is_object_exists(main_bucket_name, certificate_path)
 
-    assert is_document_exist
+    assert stored_document is not None
+    assert stored_document.read() == signed_document
     assert not is_certificate_exist
     assert response.status_code == status.HTTP_200_OK
 
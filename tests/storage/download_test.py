@@ -0,0 +1,48 @@
+from io import BytesIO
+from typing import cast
+
+import pytest
+
+from app.file_storage.service import FileStorageService
+from tests.constants import DATA_CONTAINER_PATH, GOOGLE_PDF
+
+
+@pytest.mark.asyncio
+async def test_should_download_object_by_concurrent_ranges_in_order(
+    storage_service: FileStorageService,
+    main_bucket_name: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    key = "ranged-download-test.pdf"
+    part_size = 1000
+    file_content = (DATA_CONTAINER_PATH / GOOGLE_PDF).read_bytes()
+    await storage_service.upload_file(main_bucket_name, key, BytesIO(file_content))
+
+    monkeypatch.setattr(storage_service, "download_part_size_in_bytes", part_size)
+    monkeypatch.setattr(storage_service, "download_max_concurrency", 2)
+    object_stream = await storage_service.download_stream(main_bucket_name, key)
+    assert object_stream is not None
+    chunks = [chunk async for chunk in object_stream.chunks]
+    downloaded_file = await storage_service.download_file(main_bucket_name, key)
+
+    await storage_service.delete_object(main_bucket_name, key)
+
+    assert object_stream.size == len(file_content)
+    assert {len(chunk) for chunk in chunks[:-1]} == {part_size}
+    assert b"".join(chunks) == file_content
+    assert cast(BytesIO, downloaded_file).read() == file_content
+
+
+@pytest.mark.asyncio
+async def test_should_download_empty_object(storage_service: FileStorageService, main_bucket_name: str):
+    key = "empty-download-test.bin"
+    await storage_service.upload_file(main_bucket_name, key, BytesIO(b""))
+
+    downloaded_file = await storage_service.download_file(main_bucket_name, key)
+    missing_file = await storage_service.download_stream(main_bucket_name, "missing-download-test.bin")
+
+    await storage_service.delete_object(main_bucket_name, key)
+
+    assert downloaded_file is not None
+    assert downloaded_file.read() == b""
+    assert missing_file is None
@@ -1,6 +1,6 @@
 import json
 from io import BytesIO
-from typing import cast
+from typing import AsyncIterator, cast
 
 import aiofiles
 import pytest
@@ -105,3 +105,66 @@ async def test_should_raise_exc_when_try_to_delete_non_existing_bucket(storage_s
         assert exception.field_value == "non-existing-bucket"
     else:
         raise AssertionError()
+
+
+@pytest.mark.asyncio
+async def test_should_purge_all_pages_of_prefix_only(
+    storage_service: FileStorageService,
+    main_bucket_name: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    prefix = "purge-test/"
+    purged_keys = [f"{prefix}{key_number}.txt" for key_number in range(5)]
+    kept_key = "purge-test-kept.txt"
+    for object_key in (*purged_keys, kept_key):
+        await storage_service.upload_file(main_bucket_name, object_key, BytesIO(b"content"))
+
+    # several pages are listed and deleted instead of one
+    monkeypatch.setattr(storage_service, "list_page_size", 2)
+    monkeypatch.setattr(storage_service, "max_concurrent_deletes", 1)
+    listed_objects = await storage_service.get_list_objects(main_bucket_name, prefix)
+    deleted_count = await storage_service.purge_prefix(main_bucket_name, prefix)
+    remaining_keys = [
+        remaining_key
+        async for remaining_key in storage_service.iterate_object_keys(main_bucket_name, prefix)
+    ]
+    is_kept = await storage_service.is_object_exists(main_bucket_name, kept_key)
+
+    await storage_service.delete_object(main_bucket_name, kept_key)
+
+    assert len(listed_objects["Contents"]) == len(purged_keys)
+    assert deleted_count == len(purged_keys)
+    assert not remaining_keys
+    assert is_kept
+
+
+@pytest.mark.asyncio
+async def test_should_upload_stream_by_parts(
+    storage_service: FileStorageService,
+    main_bucket_name: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    key = "multipart-test.bin"
+    part_size = 5 * 1024 * 1024  # S3 minimum
+    # chunks of the stream don't match parts: 12 MiB are uploaded by parts of 5, 5 and 2 MiB
+    chunk_size = 3 * 1024 * 1024
+    chunks = [bytes([chunk_number]) * chunk_size for chunk_number in range(4)]
+
+    async def iterate_chunks() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    monkeypatch.setattr(storage_service, "multipart_threshold_in_bytes", part_size)
+    monkeypatch.setattr(storage_service, "multipart_chunk_size_in_bytes", part_size)
+    monkeypatch.setattr(storage_service, "multipart_max_concurrency", 2)
+    await storage_service.upload_stream(main_bucket_name, key, iterate_chunks())
+
+    file_obj = await storage_service.get_object(main_bucket_name, key)
+    assert file_obj is not None
+    uploaded_content = await file_obj["Body"].read()
+    parts_count = file_obj["ETag"].strip('"').split("-")[-1]
+
+    await storage_service.delete_object(main_bucket_name, key)
+
+    assert uploaded_content == b"".join(chunks)
+    assert parts_count == "3"
@@ -0,0 +1,31 @@
+import base64
+from typing import AsyncIterator
+
+import pytest
+
+from app.file_storage.stream import AsyncByteReader, encode_base64
+
+
+async def iterate_chunks(chunks: list[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_should_encode_base64_by_chunks_which_are_not_aligned():
+    chunks = [b"a", b"bcde", b"", b"fghijkl", b"mn"]
+
+    encoded_content = await encode_base64(iterate_chunks(chunks))
+
+    assert encoded_content == base64.b64encode(b"".join(chunks)).decode("ascii")
+
+
+@pytest.mark.asyncio
+async def test_should_peek_and_read_stream_by_any_size():
+    reader = AsyncByteReader(iterate_chunks([b"abc", b"defg", b"h"]))
+
+    assert await reader.peek(5) == b"abcde"
+    assert await reader.read(2) == b"ab"
+    assert await reader.read(4) == b"cdef"
+    assert await reader.read() == b"gh"
+    assert await reader.read(1) == b""